@@ -1,21 +1,26 @@
 from settings import *
 from TetrisGame import Tetris, Text
 from leaderboard_manager import get_top_scores, append_solo_score
-
+from telemetry import get_telemetry, FrameStats, machine_info, game_summary
+from autosave import get_autosave, take_snapshot, load_checkpoint, has_checkpoint, MODE_SOLO
+from tracing import traced
+from display import load_tile_images
+from scenes import Scene, get_scene_manager, scene, wait_for_events, menu_needs_redraw
+from frame_memory import start_frame_memory, stop_frame_memory
+from texture_render import open_texture_renderer
+from controls import KeyDispatch
+
+import os
 import sys
-import pathlib
+import time
 import pygame as pg
 
 
-font_cache = {}
-font_warning_shown = False
-
-
 class App:
     def __init__(self, solo_speed: int = 3, player_name: str = "Player"):
-        pg.display.set_caption("Tetris")
-        self.screen = pg.display.set_mode(WIN_RES)
-        self.clock = pg.time.Clock()
+        scene_manager = get_scene_manager()
+        self.screen = scene_manager.show(WIN_RES, "Tetris")
+        self.clock = scene_manager.clock
 
         self.is_solo = True
         self.player_name = player_name
@@ -23,44 +28,74 @@ class App:
 
         self.normal_tick_event = pg.USEREVENT + 0
         self.fast_tick_event = pg.USEREVENT + 1
+        self.autosave_event = pg.USEREVENT + 2
 
         self.animation_trigger = False
         self.fast_animation_trigger = False
 
         self.images = self.load_sprites()
+        self.texture_renderer = open_texture_renderer(os.environ, WIN_RES, "Tetris", self.images)
+        self.autosave = get_autosave()
+        self.checkpoint_cleared = False
 
         self.paused = False
         self.pause_font = pg.font.Font(None, 96)
+        self.pause_overlay = None
+        self.pause_drawn = False
 
         self.tetris = Tetris(self, solo_mode=True, solo_speed=solo_speed)
         self.text = Text(self)
+        self.key_dispatch = KeyDispatch([SOLO_CONTROLS], self.apply_action)
 
         self.set_timer(self.tetris.get_fall_interval_ms())
 
+        self.telemetry = get_telemetry()
+        self.frame_stats = FrameStats()
+        self.telemetry_written = False
+        self.frame_memory, self.gc_schedule = start_frame_memory(os.environ)
+
     def load_sprites(self):
-        sprite_paths = [path for path in pathlib.Path(SPRITE_DIRECTORY_PATH).rglob("*.png") if path.is_file()]
-        if not sprite_paths:
+        tile_images = load_tile_images(TILE_SIZE)
+        if not tile_images:
             print(f"Warning: No .png files found in {SPRITE_DIRECTORY_PATH}")
-            return []
-        loaded_images = [pg.image.load(path).convert_alpha() for path in sprite_paths]
-        scaled_images = [pg.transform.scale(image, (TILE_SIZE, TILE_SIZE)) for image in loaded_images]
-        return scaled_images
+        return tile_images
 
     def set_timer(self, normal_interval_ms: int):
         pg.time.set_timer(self.normal_tick_event, int(normal_interval_ms))
         pg.time.set_timer(self.fast_tick_event, FAST_ANIMATION_TIME_INTERVAL)
+        pg.time.set_timer(self.autosave_event, AUTOSAVE_INTERVAL_MS)
 
     def set_fall_interval_ms(self, normal_interval_ms: int):
         pg.time.set_timer(self.normal_tick_event, int(normal_interval_ms))
 
     def toggle_pause(self):
         self.paused = not self.paused
+        self.pause_drawn = False
         if self.paused:
             self.tetris.speed_up = False
+            self.key_dispatch.release_all()
+            pg.time.set_timer(self.normal_tick_event, 0)
+            pg.time.set_timer(self.fast_tick_event, 0)
+            pg.time.set_timer(self.autosave_event, 0)
+            self.save_checkpoint()
+        else:
+            self.set_timer(self.tetris.get_fall_interval_ms())
+            self.clock.tick()
+
+    def get_events(self):
+        """Blocks while paused so an idle pause screen does not spin the CPU"""
+        if self.paused:
+            return wait_for_events(PAUSE_IDLE_WAIT_MS)
+        return pg.event.get()
+
+    def apply_action(self, board_index, action):
+        if not self.tetris.game_over_flag:
+            self.tetris.handle_action(action)
 
     def update(self):
         if self.paused:
-            self.clock.tick(FPS)
+            if self.gc_schedule:
+                self.gc_schedule.after_frame(self.tetris.pieces_locked, idle=True)
             return
 
         self.tetris.update()
@@ -78,23 +113,89 @@ class App:
             self.score_saved = True
             self.is_solo = False
 
-        self.clock.tick(FPS)
+        if self.tetris.game_over_flag and not self.telemetry_written:
+            self.write_telemetry()
 
-    def draw_pause_overlay(self):
+        if self.tetris.game_over_flag and not self.checkpoint_cleared:
+            self.autosave.clear()
+            self.checkpoint_cleared = True
+
+        frame_ms = self.key_dispatch.wait_for_frame(self.clock, FPS)
+        if not self.tetris.game_over_flag:
+            self.frame_stats.add(frame_ms)
+            self.frame_memory.frame_done()
+        if self.gc_schedule:
+            self.gc_schedule.after_frame(self.tetris.pieces_locked, idle=self.tetris.game_over_flag)
+
+    def write_telemetry(self):
+        self.telemetry_written = True
+        self.stop_frame_memory()
+        if self.telemetry is None:
+            return
+        record = {"kind": "game", "mode": "solo", "speed": self.tetris.manual_speed}
+        record.update(game_summary(self.tetris, self.frame_stats.active_ms))
+        record["frame_times"] = self.frame_stats.percentiles()
+        record["memory"] = self.frame_memory.to_dict([self.tetris])
+        record["renderer"] = self.texture_renderer.backend if self.texture_renderer else RENDERER_SURFACE
+        record["input"] = self.key_dispatch.summary()
+        record["machine"] = machine_info()
+        self.telemetry.write(record)
+
+    def save_checkpoint(self):
+        """Hands a copy of the game to the autosave thread, which does the encoding and file writing"""
+        if self.tetris.game_over_flag:
+            return
+        self.autosave.save(take_snapshot(MODE_SOLO, [self.tetris], self.images, [self.player_name]))
+
+    def restore_checkpoint(self, checkpoint):
+        board = checkpoint.boards[0]
+        self.tetris.manual_speed = board.manual_speed
+        self.tetris.speed_multiplier = SPEED_SCORE_MULTIPLIERS[board.manual_speed]
+        self.tetris.load_checkpoint(board.state, board.cell_images, board.piece_images)
+        self.set_timer(self.tetris.get_fall_interval_ms())
+        self.toggle_pause()
+
+    def stop_frame_memory(self):
+        stop_frame_memory(self.frame_memory, self.gc_schedule)
+        self.gc_schedule = None
+
+    def quit_game(self):
+        self.save_checkpoint()
+        self.autosave.flush()
+        self.stop_frame_memory()
+        pg.quit()
+        sys.exit()
+
+    def make_pause_overlay(self):
         screen_width, screen_height = self.screen.get_size()
         overlay = pg.Surface((screen_width, screen_height), pg.SRCALPHA)
         overlay.fill((0, 0, 0, 140))
-        self.screen.blit(overlay, (0, 0))
 
         paused_text = self.pause_font.render("PAUSED", True, (255, 255, 255))
         paused_rect = paused_text.get_rect(center=(screen_width // 2, screen_height // 2))
-        self.screen.blit(paused_text, paused_rect)
+        overlay.blit(paused_text, paused_rect)
 
         hint_text = pg.font.Font(None, 36).render("Press P to resume", True, (220, 220, 220))
         hint_rect = hint_text.get_rect(center=(screen_width // 2, screen_height // 2 + 70))
-        self.screen.blit(hint_text, hint_rect)
+        overlay.blit(hint_text, hint_rect)
+        return overlay
 
+    def draw_pause_overlay(self):
+        if self.pause_overlay is None:
+            self.pause_overlay = self.make_pause_overlay()
+        self.screen.blit(self.pause_overlay, (0, 0))
+
+    @traced("App.draw")
     def draw(self):
+        if self.paused:
+            if self.pause_drawn:
+                return
+            self.pause_drawn = True
+
+        if self.texture_renderer:
+            self.draw_textures()
+            return
+
         self.screen.fill(color=BACKGROUND_COLOUR)
         self.tetris.draw()
         self.text.draw()
@@ -103,28 +204,47 @@ class App:
             self.draw_pause_overlay()
 
         pg.display.flip()
+        self.key_dispatch.presented()
+
+    def draw_textures(self):
+        renderer = self.texture_renderer
+        renderer.clear(BACKGROUND_COLOUR)
+        self.tetris.draw_textures(renderer)
+        self.text.draw_textures(renderer)
+
+        if self.paused:
+            if self.pause_overlay is None:
+                self.pause_overlay = self.make_pause_overlay()
+            renderer.draw_surface(self.pause_overlay)
 
+        renderer.present()
+        self.key_dispatch.presented()
+
+    @traced("App.check_events")
     def check_events(self):
         self.animation_trigger = False
         self.fast_animation_trigger = False
 
-        for event in pg.event.get():
+        stamp_s = time.perf_counter()
+        for event in self.key_dispatch.take_events(self.get_events()):
             if event.type == pg.QUIT or (event.type == pg.KEYDOWN and event.key == pg.K_ESCAPE):
-                pg.quit()
-                sys.exit()
+                self.quit_game()
 
             if event.type == pg.KEYDOWN and event.key == PAUSE_KEY_SOLO:
                 self.toggle_pause()
                 continue
 
-            if self.paused:
+            if event.type == self.autosave_event:
+                self.save_checkpoint()
                 continue
 
-            if event.type == pg.KEYDOWN and not self.tetris.game_over_flag:
-                self.tetris.control(event.key)
+            if self.paused:
+                if event.type == pg.WINDOWEXPOSED:
+                    self.pause_drawn = False
+                continue
 
-            if event.type == pg.KEYUP and event.key == pg.K_DOWN:
-                self.tetris.speed_up = False
+            if self.key_dispatch.handle(event, stamp_s):
+                continue
 
             if event.type == self.normal_tick_event:
                 self.animation_trigger = True
@@ -139,34 +259,12 @@ class App:
 
 
 def get_font(font_size):
-    global font_cache, font_warning_shown
-
-    if font_size in font_cache:
-        return font_cache[font_size]
-
-    try:
-        font = pg.font.Font(FONT_PATH, font_size)
-        font_cache[font_size] = font
-        return font
-    except FileNotFoundError:
-        if not font_warning_shown:
-            print("Warning: Custom font not found, using default pygame font")
-            font_warning_shown = True
-
-        font = pg.font.Font(None, font_size)
-        font_cache[font_size] = font
-        return font
+    return get_scene_manager().font(font_size)
 
 
 def make_background(width, height, top_colour, bottom_colour):
-    background_surface = pg.Surface((width, height))
-    for y_pos in range(height):
-        blend_ratio = y_pos / height
-        red = int(top_colour[0] * (1 - blend_ratio) + bottom_colour[0] * blend_ratio)
-        green = int(top_colour[1] * (1 - blend_ratio) + bottom_colour[1] * blend_ratio)
-        blue = int(top_colour[2] * (1 - blend_ratio) + bottom_colour[2] * blend_ratio)
-        pg.draw.line(background_surface, (red, green, blue), (0, y_pos), (width, y_pos))
-    return background_surface
+    """Shared gradient surface; callers only blit it"""
+    return get_scene_manager().background(width, height, top_colour, bottom_colour)
 
 
 def draw_button(surface, rect, text, font, is_hovering, base_colour=(70, 130, 180), hover_colour=(100, 160, 210)):
@@ -190,7 +288,9 @@ class Button:
         self.is_hovering = False
 
     def update(self, mouse_position):
+        was_hovering = self.is_hovering
         self.is_hovering = self.rect.collidepoint(mouse_position)
+        return self.is_hovering != was_hovering
 
     def draw(self, surface):
         draw_button(surface, self.rect, self.text, self.font, self.is_hovering, self.base_colour, self.hover_colour)
@@ -240,12 +340,12 @@ class TextInput:
         surface.blit(value_surface, (self.rect.left + 12, self.rect.centery - 13))
 
 
+@scene("2 Player - Enter Names")
 def local_2p_name_entry():
     """Screen to enter player names for 2P local match"""
-    screen = pg.display.set_mode((1280, 720))
-    pg.display.set_caption("2 Player - Enter Names")
+    screen = get_scene_manager().screen
 
-    background = make_background(1280, 720, (20, 25, 40), (35, 20, 50))
+    background = make_background(*MENU_RES, (20, 25, 40), (35, 20, 50))
 
     centre_x = 640
 
@@ -255,37 +355,47 @@ def local_2p_name_entry():
     start_button = Button((centre_x - 110, 480, 220, 60), "START MATCH", get_font(36), (50, 160, 80), (70, 190, 110))
     back_button = Button((centre_x - 110, 560, 220, 60), "BACK", get_font(36), (80, 80, 80), (110, 110, 110))
 
-    clock = pg.time.Clock()
+    clock = get_scene_manager().clock
+
+    buttons = [start_button, back_button]
+    mouse_position = pg.mouse.get_pos()
+    menu_needs_redraw([], buttons, mouse_position)
+    needs_redraw = True
 
     while True:
-        mouse_position = pg.mouse.get_pos()
-        screen.blit(background, (0, 0))
+        if needs_redraw:
+            screen.blit(background, (0, 0))
+
+            title_font = get_font(70)
+            title_surface = title_font.render("2 PLAYER LOCAL", True, (255, 215, 100))
+            title_rect = title_surface.get_rect(center=(centre_x, 100))
+            screen.blit(title_surface, title_rect)
 
-        title_font = get_font(70)
-        title_surface = title_font.render("2 PLAYER LOCAL", True, (255, 215, 100))
-        title_rect = title_surface.get_rect(center=(centre_x, 100))
-        screen.blit(title_surface, title_rect)
+            instruction_font = get_font(26)
+            instruction_surface = instruction_font.render("Enter player names and click START", True, (200, 200, 200))
+            instruction_rect = instruction_surface.get_rect(center=(centre_x, 180))
+            screen.blit(instruction_surface, instruction_rect)
 
-        instruction_font = get_font(26)
-        instruction_surface = instruction_font.render("Enter player names and click START", True, (200, 200, 200))
-        instruction_rect = instruction_surface.get_rect(center=(centre_x, 180))
-        screen.blit(instruction_surface, instruction_rect)
+            controls_font = get_font(22)
+            controls_surface = controls_font.render("Controls: P1=WASD | P2=IJKL", True, (150, 150, 150))
+            controls_rect = controls_surface.get_rect(center=(centre_x, 420))
+            screen.blit(controls_surface, controls_rect)
 
-        controls_font = get_font(22)
-        controls_surface = controls_font.render("Controls: P1=WASD | P2=IJKL", True, (150, 150, 150))
-        controls_rect = controls_surface.get_rect(center=(centre_x, 420))
-        screen.blit(controls_surface, controls_rect)
+            player1_input.draw(screen)
+            player2_input.draw(screen)
 
-        player1_input.draw(screen)
-        player2_input.draw(screen)
+            start_button.draw(screen)
 
-        start_button.update(mouse_position)
-        start_button.draw(screen)
+            back_button.draw(screen)
 
-        back_button.update(mouse_position)
-        back_button.draw(screen)
+            pg.display.flip()
+            clock.tick(60)
 
-        for event in pg.event.get():
+        events = wait_for_events()
+        mouse_position = pg.mouse.get_pos()
+        needs_redraw = menu_needs_redraw(events, buttons, mouse_position)
+
+        for event in events:
             if event.type == pg.QUIT or (event.type == pg.KEYDOWN and event.key == pg.K_ESCAPE):
                 return None
 
@@ -300,16 +410,13 @@ def local_2p_name_entry():
                 if back_button.is_clicked(mouse_position):
                     return None
 
-        pg.display.flip()
-        clock.tick(60)
-
 
+@scene("3 Player - Enter Names")
 def local_3p_name_entry():
     """Screen to enter player names for 3P local match"""
-    screen = pg.display.set_mode((1280, 720))
-    pg.display.set_caption("3 Player - Enter Names")
+    screen = get_scene_manager().screen
 
-    background = make_background(1280, 720, (20, 25, 40), (35, 20, 50))
+    background = make_background(*MENU_RES, (20, 25, 40), (35, 20, 50))
 
     centre_x = 640
 
@@ -320,38 +427,48 @@ def local_3p_name_entry():
     start_button = Button((centre_x - 110, 520, 220, 60), "START MATCH", get_font(36), (50, 160, 80), (70, 190, 110))
     back_button = Button((centre_x - 110, 600, 220, 60), "BACK", get_font(36), (80, 80, 80), (110, 110, 110))
 
-    clock = pg.time.Clock()
+    clock = get_scene_manager().clock
+
+    buttons = [start_button, back_button]
+    mouse_position = pg.mouse.get_pos()
+    menu_needs_redraw([], buttons, mouse_position)
+    needs_redraw = True
 
     while True:
-        mouse_position = pg.mouse.get_pos()
-        screen.blit(background, (0, 0))
+        if needs_redraw:
+            screen.blit(background, (0, 0))
 
-        title_font = get_font(70)
-        title_surface = title_font.render("3 PLAYER LOCAL", True, (255, 215, 100))
-        title_rect = title_surface.get_rect(center=(centre_x, 80))
-        screen.blit(title_surface, title_rect)
+            title_font = get_font(70)
+            title_surface = title_font.render("3 PLAYER LOCAL", True, (255, 215, 100))
+            title_rect = title_surface.get_rect(center=(centre_x, 80))
+            screen.blit(title_surface, title_rect)
 
-        instruction_font = get_font(26)
-        instruction_surface = instruction_font.render("Enter player names and click START", True, (200, 200, 200))
-        instruction_rect = instruction_surface.get_rect(center=(centre_x, 160))
-        screen.blit(instruction_surface, instruction_rect)
+            instruction_font = get_font(26)
+            instruction_surface = instruction_font.render("Enter player names and click START", True, (200, 200, 200))
+            instruction_rect = instruction_surface.get_rect(center=(centre_x, 160))
+            screen.blit(instruction_surface, instruction_rect)
 
-        controls_font = get_font(20)
-        controls_surface = controls_font.render("Controls: P1=WASD | P2=IJKL | P3=Arrows", True, (150, 150, 150))
-        controls_rect = controls_surface.get_rect(center=(centre_x, 470))
-        screen.blit(controls_surface, controls_rect)
+            controls_font = get_font(20)
+            controls_surface = controls_font.render("Controls: P1=WASD | P2=IJKL | P3=Arrows", True, (150, 150, 150))
+            controls_rect = controls_surface.get_rect(center=(centre_x, 470))
+            screen.blit(controls_surface, controls_rect)
 
-        player1_input.draw(screen)
-        player2_input.draw(screen)
-        player3_input.draw(screen)
+            player1_input.draw(screen)
+            player2_input.draw(screen)
+            player3_input.draw(screen)
 
-        start_button.update(mouse_position)
-        start_button.draw(screen)
+            start_button.draw(screen)
 
-        back_button.update(mouse_position)
-        back_button.draw(screen)
+            back_button.draw(screen)
 
-        for event in pg.event.get():
+            pg.display.flip()
+            clock.tick(60)
+
+        events = wait_for_events()
+        mouse_position = pg.mouse.get_pos()
+        needs_redraw = menu_needs_redraw(events, buttons, mouse_position)
+
+        for event in events:
             if event.type == pg.QUIT or (event.type == pg.KEYDOWN and event.key == pg.K_ESCAPE):
                 return None
 
@@ -368,9 +485,6 @@ def local_3p_name_entry():
                 if back_button.is_clicked(mouse_position):
                     return None
 
-        pg.display.flip()
-        clock.tick(60)
-
 
 def local_multiplayer_2p():
     """Launch 2P match with name entry"""
@@ -398,12 +512,12 @@ def local_multiplayer_3p():
         ).run()
 
 
+@scene("Select Speed")
 def speed_selection_menu():
     """Menu to select solo game speed"""
-    screen = pg.display.set_mode((1280, 720))
-    pg.display.set_caption("Select Speed")
+    screen = get_scene_manager().screen
 
-    background = make_background(1280, 720, (20, 20, 40), (40, 20, 60))
+    background = make_background(*MENU_RES, (20, 20, 40), (40, 20, 60))
 
     centre_x = 640
 
@@ -424,30 +538,40 @@ def speed_selection_menu():
 
     back_button = Button((centre_x - 125, 630, 250, 60), "BACK", get_font(36), (80, 80, 80), (110, 110, 110))
 
-    clock = pg.time.Clock()
+    clock = get_scene_manager().clock
+
+    buttons = list(speed_buttons.values()) + [back_button]
+    mouse_position = pg.mouse.get_pos()
+    menu_needs_redraw([], buttons, mouse_position)
+    needs_redraw = True
 
     while True:
-        mouse_position = pg.mouse.get_pos()
-        screen.blit(background, (0, 0))
+        if needs_redraw:
+            screen.blit(background, (0, 0))
+
+            title_font = get_font(70)
+            title_surface = title_font.render("SELECT SPEED", True, (255, 215, 100))
+            title_rect = title_surface.get_rect(center=(centre_x, 80))
+            screen.blit(title_surface, title_rect)
 
-        title_font = get_font(70)
-        title_surface = title_font.render("SELECT SPEED", True, (255, 215, 100))
-        title_rect = title_surface.get_rect(center=(centre_x, 80))
-        screen.blit(title_surface, title_rect)
+            info_font = get_font(24)
+            info_surface = info_font.render("Higher speed = Faster game + Higher score multiplier", True, (200, 200, 200))
+            info_rect = info_surface.get_rect(center=(centre_x, 140))
+            screen.blit(info_surface, info_rect)
 
-        info_font = get_font(24)
-        info_surface = info_font.render("Higher speed = Faster game + Higher score multiplier", True, (200, 200, 200))
-        info_rect = info_surface.get_rect(center=(centre_x, 140))
-        screen.blit(info_surface, info_rect)
+            for button in speed_buttons.values():
+                button.draw(screen)
 
-        for button in speed_buttons.values():
-            button.update(mouse_position)
-            button.draw(screen)
+            back_button.draw(screen)
 
-        back_button.update(mouse_position)
-        back_button.draw(screen)
+            pg.display.flip()
+            clock.tick(60)
+
+        events = wait_for_events()
+        mouse_position = pg.mouse.get_pos()
+        needs_redraw = menu_needs_redraw(events, buttons, mouse_position)
 
-        for event in pg.event.get():
+        for event in events:
             if event.type == pg.QUIT or (event.type == pg.KEYDOWN and event.key == pg.K_ESCAPE):
                 return None
 
@@ -458,16 +582,13 @@ def speed_selection_menu():
                 if back_button.is_clicked(mouse_position):
                     return None
 
-        pg.display.flip()
-        clock.tick(60)
-
 
+@scene("Enter Your Name")
 def name_entry_menu():
     """Enter player name for solo mode"""
-    screen = pg.display.set_mode((1280, 720))
-    pg.display.set_caption("Enter Your Name")
+    screen = get_scene_manager().screen
 
-    background = make_background(1280, 720, (20, 20, 40), (40, 20, 60))
+    background = make_background(*MENU_RES, (20, 20, 40), (40, 20, 60))
 
     centre_x = 640
 
@@ -476,31 +597,41 @@ def name_entry_menu():
     continue_button = Button((centre_x - 125, 450, 250, 70), "CONTINUE", get_font(40), (50, 160, 80), (70, 190, 110))
     back_button = Button((centre_x - 125, 540, 250, 70), "BACK", get_font(40), (80, 80, 80), (110, 110, 110))
 
-    clock = pg.time.Clock()
+    clock = get_scene_manager().clock
+
+    buttons = [continue_button, back_button]
+    mouse_position = pg.mouse.get_pos()
+    menu_needs_redraw([], buttons, mouse_position)
+    needs_redraw = True
 
     while True:
-        mouse_position = pg.mouse.get_pos()
-        screen.blit(background, (0, 0))
+        if needs_redraw:
+            screen.blit(background, (0, 0))
+
+            title_font = get_font(70)
+            title_surface = title_font.render("SOLO MODE", True, (255, 215, 100))
+            title_rect = title_surface.get_rect(center=(centre_x, 140))
+            screen.blit(title_surface, title_rect)
+
+            instruction_font = get_font(28)
+            instruction_surface = instruction_font.render("Enter your name for the leaderboard", True, (200, 200, 200))
+            instruction_rect = instruction_surface.get_rect(center=(centre_x, 220))
+            screen.blit(instruction_surface, instruction_rect)
 
-        title_font = get_font(70)
-        title_surface = title_font.render("SOLO MODE", True, (255, 215, 100))
-        title_rect = title_surface.get_rect(center=(centre_x, 140))
-        screen.blit(title_surface, title_rect)
+            name_input.draw(screen)
 
-        instruction_font = get_font(28)
-        instruction_surface = instruction_font.render("Enter your name for the leaderboard", True, (200, 200, 200))
-        instruction_rect = instruction_surface.get_rect(center=(centre_x, 220))
-        screen.blit(instruction_surface, instruction_rect)
+            continue_button.draw(screen)
 
-        name_input.draw(screen)
+            back_button.draw(screen)
 
-        continue_button.update(mouse_position)
-        continue_button.draw(screen)
+            pg.display.flip()
+            clock.tick(60)
 
-        back_button.update(mouse_position)
-        back_button.draw(screen)
+        events = wait_for_events()
+        mouse_position = pg.mouse.get_pos()
+        needs_redraw = menu_needs_redraw(events, buttons, mouse_position)
 
-        for event in pg.event.get():
+        for event in events:
             if event.type == pg.QUIT or (event.type == pg.KEYDOWN and event.key == pg.K_ESCAPE):
                 return None
 
@@ -512,9 +643,6 @@ def name_entry_menu():
                 if back_button.is_clicked(mouse_position):
                     return None
 
-        pg.display.flip()
-        clock.tick(60)
-
 
 def play_solo():
     """Start solo mode with name and speed selection"""
@@ -527,137 +655,175 @@ def play_solo():
         App(solo_speed=speed_value, player_name=player_name).run()
 
 
+def resume_game():
+    """Rebuilds the solo game or match stored in the autosave file and carries on from it, paused"""
+    checkpoint = load_checkpoint()
+    if checkpoint is None:
+        return
+
+    if checkpoint.mode == MODE_SOLO:
+        game_app = App(solo_speed=checkpoint.boards[0].manual_speed, player_name=checkpoint.strings[0])
+    else:
+        from versus import MatchApp
+        game_app = MatchApp(
+            total_players=len(checkpoint.boards),
+            cpu_opponents=checkpoint.cpu_opponents,
+            cpu_difficulty=checkpoint.strings[0],
+            player_names=checkpoint.strings[1:],
+            # Checkpoints restore into in-process boards only
+            board_processes=False,
+        )
+    game_app.restore_checkpoint(checkpoint)
+    game_app.run()
+
+
+@scene("How to Play")
 def how_to_play_screen():
     """Display how to play instructions"""
-    screen = pg.display.set_mode((1280, 720))
-    pg.display.set_caption("How to Play")
+    screen = get_scene_manager().screen
 
-    background = make_background(1280, 720, (20, 25, 40), (35, 20, 50))
+    background = make_background(*MENU_RES, (20, 25, 40), (35, 20, 50))
     back_button = Button((540, 640, 200, 60), "BACK", get_font(36), (80, 80, 80), (110, 110, 110))
 
-    clock = pg.time.Clock()
+    clock = get_scene_manager().clock
+
+    buttons = [back_button]
+    mouse_position = pg.mouse.get_pos()
+    menu_needs_redraw([], buttons, mouse_position)
+    needs_redraw = True
 
     while True:
+        if needs_redraw:
+            screen.blit(background, (0, 0))
+
+            title_font = get_font(60)
+            title_surface = title_font.render("HOW TO PLAY TETRIS", True, (255, 215, 100))
+            screen.blit(title_surface, (300, 40))
+
+            instruction_font = get_font(24)
+            instructions = [
+                " Move and rotate falling pieces to complete full horizontal lines.",
+                " Completed lines disappear and the above drops down.",
+                " Clear more lines at once for more points!",
+                "",
+                "SCORING (base with no multipliers):",
+                "  SINGLE = 100, DOUBLE = 300, TRIPLE = 700, TETRIS! = 1500",
+                "",
+                "LEVELS:",
+                "  Start at Level 1. Every 10 lines cleared increases level by 1.",
+                "  Higher levels increase fall speed.",
+                "",
+                "SOLO SPEED:",
+                "  Choose Speed 1–5 from the Solo Setup menu.",
+                "  Higher speed increases your score multiplier (up to x3.0).",
+                "",
+                "PIECES:",
+                "I piece O piece T piece S piece Z piece J piece L piece",
+            ]
+
+            y_pos = 140
+            for line in instructions:
+                text_surface = instruction_font.render(line, True, (220, 220, 220))
+                screen.blit(text_surface, (150, y_pos))
+                y_pos += 32
+
+            back_button.draw(screen)
+
+            pg.display.flip()
+            clock.tick(60)
+
+        events = wait_for_events()
         mouse_position = pg.mouse.get_pos()
-        screen.blit(background, (0, 0))
-
-        title_font = get_font(60)
-        title_surface = title_font.render("HOW TO PLAY TETRIS", True, (255, 215, 100))
-        screen.blit(title_surface, (300, 40))
-
-        instruction_font = get_font(24)
-        instructions = [
-            " Move and rotate falling pieces to complete full horizontal lines.",
-            " Completed lines disappear and the above drops down.",
-            " Clear more lines at once for more points!",
-            "",
-            "SCORING (base with no multipliers):",
-            "  SINGLE = 100, DOUBLE = 300, TRIPLE = 700, TETRIS! = 1500",
-            "",
-            "LEVELS:",
-            "  Start at Level 1. Every 10 lines cleared increases level by 1.",
-            "  Higher levels increase fall speed.",
-            "",
-            "SOLO SPEED:",
-            "  Choose Speed 1–5 from the Solo Setup menu.",
-            "  Higher speed increases your score multiplier (up to x3.0).",
-            "",
-            "PIECES:",
-            "I piece O piece T piece S piece Z piece J piece L piece",
-        ]
-
-        y_pos = 140
-        for line in instructions:
-            text_surface = instruction_font.render(line, True, (220, 220, 220))
-            screen.blit(text_surface, (150, y_pos))
-            y_pos += 32
-
-        back_button.update(mouse_position)
-        back_button.draw(screen)
-
-        for event in pg.event.get():
+        needs_redraw = menu_needs_redraw(events, buttons, mouse_position)
+
+        for event in events:
             if event.type == pg.QUIT or (event.type == pg.KEYDOWN and event.key == pg.K_ESCAPE):
                 return
             if event.type == pg.MOUSEBUTTONDOWN and back_button.is_clicked(mouse_position):
                 return
 
-        pg.display.flip()
-        clock.tick(60)
-
 
+@scene("Controls")
 def controls_screen():
     """Display control schemes"""
-    screen = pg.display.set_mode((1280, 720))
-    pg.display.set_caption("Controls")
+    screen = get_scene_manager().screen
 
-    background = make_background(1280, 720, (20, 25, 40), (35, 20, 50))
+    background = make_background(*MENU_RES, (20, 25, 40), (35, 20, 50))
     back_button = Button((540, 640, 200, 60), "BACK", get_font(36), (80, 80, 80), (110, 110, 110))
 
-    clock = pg.time.Clock()
+    clock = get_scene_manager().clock
+
+    buttons = [back_button]
+    mouse_position = pg.mouse.get_pos()
+    menu_needs_redraw([], buttons, mouse_position)
+    needs_redraw = True
 
     while True:
+        if needs_redraw:
+            screen.blit(background, (0, 0))
+
+            title_font = get_font(60)
+            title_surface = title_font.render("CONTROLS", True, (255, 215, 100))
+            screen.blit(title_surface, (480, 40))
+
+            header_font = get_font(32)
+            text_font = get_font(24)
+
+            y_pos = 130
+
+            solo_header_surface = header_font.render("SOLO MODE:", True, (100, 200, 255))
+            screen.blit(solo_header_surface, (150, y_pos))
+            y_pos += 50
+
+            solo_controls = [
+                "Arrow Keys: Move Left/Right/Down",
+                "Up Arrow: Rotate piece",
+                "P: Pause game"
+            ]
+            for control_line in solo_controls:
+                line_surface = text_font.render(control_line, True, (220, 220, 220))
+                screen.blit(line_surface, (150, y_pos))
+                y_pos += 35
+
+            y_pos += 30
+
+            multi_header_surface = header_font.render("MULTIPLAYER:", True, (100, 200, 255))
+            screen.blit(multi_header_surface, (150, y_pos))
+            y_pos += 50
+
+            multi_controls = [
+                "Player 1: W=Rotate, A=Left, S=Down, D=Right",
+                "Player 2: I=Rotate, J=Left, K=Down, L=Right",
+                "Player 3: Arrow Keys (Up=Rotate, others as labelled)",
+                "Press P to pause match"
+            ]
+            for control_line in multi_controls:
+                line_surface = text_font.render(control_line, True, (220, 220, 220))
+                screen.blit(line_surface, (150, y_pos))
+                y_pos += 35
+
+            back_button.draw(screen)
+
+            pg.display.flip()
+            clock.tick(60)
+
+        events = wait_for_events()
         mouse_position = pg.mouse.get_pos()
-        screen.blit(background, (0, 0))
-
-        title_font = get_font(60)
-        title_surface = title_font.render("CONTROLS", True, (255, 215, 100))
-        screen.blit(title_surface, (480, 40))
-
-        header_font = get_font(32)
-        text_font = get_font(24)
-
-        y_pos = 130
-
-        solo_header_surface = header_font.render("SOLO MODE:", True, (100, 200, 255))
-        screen.blit(solo_header_surface, (150, y_pos))
-        y_pos += 50
-
-        solo_controls = [
-            "Arrow Keys: Move Left/Right/Down",
-            "Up Arrow: Rotate piece",
-            "P: Pause game"
-        ]
-        for control_line in solo_controls:
-            line_surface = text_font.render(control_line, True, (220, 220, 220))
-            screen.blit(line_surface, (150, y_pos))
-            y_pos += 35
-
-        y_pos += 30
-
-        multi_header_surface = header_font.render("MULTIPLAYER:", True, (100, 200, 255))
-        screen.blit(multi_header_surface, (150, y_pos))
-        y_pos += 50
-
-        multi_controls = [
-            "Player 1: W=Rotate, A=Left, S=Down, D=Right",
-            "Player 2: I=Rotate, J=Left, K=Down, L=Right",
-            "Player 3: Arrow Keys (Up=Rotate, others as labelled)",
-            "Press P to pause match"
-        ]
-        for control_line in multi_controls:
-            line_surface = text_font.render(control_line, True, (220, 220, 220))
-            screen.blit(line_surface, (150, y_pos))
-            y_pos += 35
-
-        back_button.update(mouse_position)
-        back_button.draw(screen)
-
-        for event in pg.event.get():
+        needs_redraw = menu_needs_redraw(events, buttons, mouse_position)
+
+        for event in events:
             if event.type == pg.QUIT or (event.type == pg.KEYDOWN and event.key == pg.K_ESCAPE):
                 return
             if event.type == pg.MOUSEBUTTONDOWN and back_button.is_clicked(mouse_position):
                 return
 
-        pg.display.flip()
-        clock.tick(60)
-
 
+@scene("Leaderboards")
 def leaderboard_screen():
     """Display top 5 scores from each category"""
-    screen = pg.display.set_mode((1280, 720))
-    pg.display.set_caption("Leaderboards")
+    screen = get_scene_manager().screen
 
-    background = make_background(1280, 720, (20, 25, 40), (35, 20, 50))
+    background = make_background(*MENU_RES, (20, 25, 40), (35, 20, 50))
 
     tab_buttons = {
         'solo': Button((100, 50, 200, 50), "SOLO", get_font(28), (60, 90, 130), (90, 120, 160)),
@@ -669,7 +835,7 @@ def leaderboard_screen():
     back_button = Button((1050, 650, 200, 50), "BACK", get_font(32), (80, 80, 80), (110, 110, 110))
 
     current_tab = 'solo'
-    clock = pg.time.Clock()
+    clock = get_scene_manager().clock
 
     csv_files = {
         'solo': LEADERBOARD_SOLO_CSV,
@@ -685,54 +851,72 @@ def leaderboard_screen():
         'cpu': "TOP 5 - VS CPU"
     }
 
+    scores_by_tab = {}
+    buttons = list(tab_buttons.values()) + [back_button]
+    mouse_position = pg.mouse.get_pos()
+    menu_needs_redraw([], buttons, mouse_position)
+    needs_redraw = True
+
     while True:
+        if needs_redraw:
+            screen.blit(background, (0, 0))
+
+            for tab_name, tab_button in tab_buttons.items():
+                if tab_name == current_tab:
+                    tab_button.base_colour = (60, 180, 80)
+                    tab_button.hover_colour = (80, 210, 110)
+                else:
+                    tab_button.base_colour = (60, 90, 130)
+                    tab_button.hover_colour = (90, 120, 160)
+                tab_button.draw(screen)
+
+            if current_tab not in scores_by_tab:
+                scores_by_tab[current_tab] = get_top_scores(csv_files[current_tab], 5)
+            scores = scores_by_tab[current_tab]
+
+            title_font = get_font(48)
+            title_surface = title_font.render(tab_titles[current_tab], True, (255, 215, 100))
+            screen.blit(title_surface, (350, 130))
+
+            header_font = get_font(32)
+            screen.blit(header_font.render("RANK", True, (200, 200, 200)), (300, 200))
+            screen.blit(header_font.render("NAME", True, (200, 200, 200)), (450, 200))
+            screen.blit(header_font.render("SCORE", True, (200, 200, 200)), (750, 200))
+            screen.blit(header_font.render("GAMES", True, (200, 200, 200)), (900, 200))
+            screen.blit(header_font.render("AVG", True, (200, 200, 200)), (1040, 200))
+
+            entry_font = get_font(28)
+            y_start = 250
+
+            for entry in scores:
+                rank_surface = entry_font.render(f"#{entry['rank']}", True, (255, 255, 255))
+                name_surface = entry_font.render(entry['name'], True, (255, 255, 255))
+                score_surface = entry_font.render(str(entry['score']), True, (255, 255, 100))
+                games_surface = entry_font.render(str(entry['games']), True, (200, 200, 220))
+                average_surface = entry_font.render(str(entry['average']), True, (200, 200, 220))
+
+                y_pos = y_start + (entry['rank'] - 1) * 60
+                screen.blit(rank_surface, (300, y_pos))
+                screen.blit(name_surface, (450, y_pos))
+                screen.blit(score_surface, (750, y_pos))
+                screen.blit(games_surface, (900, y_pos))
+                screen.blit(average_surface, (1040, y_pos))
+
+            if not scores:
+                no_data_font = get_font(36)
+                no_data_surface = no_data_font.render("No scores yet!", True, (150, 150, 150))
+                screen.blit(no_data_surface, (500, 350))
+
+            back_button.draw(screen)
+
+            pg.display.flip()
+            clock.tick(60)
+
+        events = wait_for_events()
         mouse_position = pg.mouse.get_pos()
-        screen.blit(background, (0, 0))
-
-        for tab_name, tab_button in tab_buttons.items():
-            if tab_name == current_tab:
-                tab_button.base_colour = (60, 180, 80)
-                tab_button.hover_colour = (80, 210, 110)
-            else:
-                tab_button.base_colour = (60, 90, 130)
-                tab_button.hover_colour = (90, 120, 160)
-
-            tab_button.update(mouse_position)
-            tab_button.draw(screen)
-
-        scores = get_top_scores(csv_files[current_tab], 5)
-
-        title_font = get_font(48)
-        title_surface = title_font.render(tab_titles[current_tab], True, (255, 215, 100))
-        screen.blit(title_surface, (350, 130))
-
-        header_font = get_font(32)
-        screen.blit(header_font.render("RANK", True, (200, 200, 200)), (300, 200))
-        screen.blit(header_font.render("NAME", True, (200, 200, 200)), (450, 200))
-        screen.blit(header_font.render("SCORE", True, (200, 200, 200)), (750, 200))
-
-        entry_font = get_font(28)
-        y_start = 250
-
-        for entry in scores:
-            rank_surface = entry_font.render(f"#{entry['rank']}", True, (255, 255, 255))
-            name_surface = entry_font.render(entry['name'], True, (255, 255, 255))
-            score_surface = entry_font.render(str(entry['score']), True, (255, 255, 100))
-
-            y_pos = y_start + (entry['rank'] - 1) * 60
-            screen.blit(rank_surface, (300, y_pos))
-            screen.blit(name_surface, (450, y_pos))
-            screen.blit(score_surface, (750, y_pos))
-
-        if not scores:
-            no_data_font = get_font(36)
-            no_data_surface = no_data_font.render("No scores yet!", True, (150, 150, 150))
-            screen.blit(no_data_surface, (500, 350))
+        needs_redraw = menu_needs_redraw(events, buttons, mouse_position)
 
-        back_button.update(mouse_position)
-        back_button.draw(screen)
-
-        for event in pg.event.get():
+        for event in events:
             if event.type == pg.QUIT or (event.type == pg.KEYDOWN and event.key == pg.K_ESCAPE):
                 return
 
@@ -743,16 +927,14 @@ def leaderboard_screen():
                 if back_button.is_clicked(mouse_position):
                     return
 
-        pg.display.flip()
-        clock.tick(60)
-
 
+@scene("Tetris - Main Menu")
 def main_menu():
     """Main menu with reorganised layout"""
-    screen = pg.display.set_mode((1280, 720))
-    pg.display.set_caption("Tetris - Main Menu")
+    scene_manager = get_scene_manager()
+    screen = scene_manager.screen
 
-    background = make_background(1280, 720, (20, 20, 40), (40, 20, 60))
+    background = make_background(*MENU_RES, (20, 20, 40), (40, 20, 60))
 
     centre_x = 640
     button_width = 400
@@ -781,36 +963,57 @@ def main_menu():
             (1100, 30, 150, 50),
             "QUIT", get_font(32), (180, 60, 60), (210, 90, 90)
         ),
+        'resume': Button(
+            (30, 30, 150, 50),
+            "RESUME", get_font(32), (50, 160, 80), (70, 190, 110)
+        ),
         'leaderboard': Button(
-            (480, 630, 160, 50),
+            (290, 630, 160, 50),
             "LEADERBOARD", get_font(24), (100, 60, 140), (130, 90, 170)
         ),
         'how_to_play': Button(
-            (660, 630, 160, 50),
+            (470, 630, 160, 50),
             "HOW TO PLAY", get_font(24), (60, 140, 100), (90, 170, 130)
         ),
         'controls': Button(
-            (840, 630, 160, 50),
+            (650, 630, 160, 50),
             "CONTROLS", get_font(24), (60, 100, 140), (90, 130, 170)
         ),
+        'arena': Button(
+            (830, 630, 160, 50),
+            "CPU ARENA", get_font(24), (180, 110, 40), (210, 140, 70)
+        ),
     }
 
-    clock = pg.time.Clock()
+    clock = scene_manager.clock
+
+    buttons = list(menu_buttons.values())
+    mouse_position = pg.mouse.get_pos()
+    menu_needs_redraw([], buttons, mouse_position)
+    needs_redraw = True
 
     while True:
-        mouse_position = pg.mouse.get_pos()
-        screen.blit(background, (0, 0))
+        if needs_redraw:
+            resume_available = has_checkpoint()
+            screen.blit(background, (0, 0))
+
+            title_font = get_font(100)
+            title_surface = title_font.render("TETRIS", True, (255, 215, 100))
+            title_rect = title_surface.get_rect(center=(640, 110))
+            screen.blit(title_surface, title_rect)
+
+            for name, button in menu_buttons.items():
+                if name != 'resume' or resume_available:
+                    button.draw(screen)
 
-        title_font = get_font(100)
-        title_surface = title_font.render("TETRIS", True, (255, 215, 100))
-        title_rect = title_surface.get_rect(center=(640, 110))
-        screen.blit(title_surface, title_rect)
+            pg.display.flip()
+            clock.tick(60)
 
-        for button in menu_buttons.values():
-            button.update(mouse_position)
-            button.draw(screen)
+        events = wait_for_events()
+        mouse_position = pg.mouse.get_pos()
+        needs_redraw = menu_needs_redraw(events, buttons, mouse_position)
 
-        for event in pg.event.get():
+        for event in events:
             if event.type == pg.QUIT:
                 pg.quit()
                 sys.exit()
@@ -820,7 +1023,9 @@ def main_menu():
                 sys.exit()
 
             if event.type == pg.MOUSEBUTTONDOWN:
-                if menu_buttons['practice'].is_clicked(mouse_position):
+                if menu_buttons['resume'].is_clicked(mouse_position) and resume_available:
+                    resume_game()
+                elif menu_buttons['practice'].is_clicked(mouse_position):
                     play_solo()
                 elif menu_buttons['local_2p'].is_clicked(mouse_position):
                     local_multiplayer_2p()
@@ -835,13 +1040,14 @@ def main_menu():
                     how_to_play_screen()
                 elif menu_buttons['controls'].is_clicked(mouse_position):
                     controls_screen()
+                elif menu_buttons['arena'].is_clicked(mouse_position):
+                    from arena import ArenaApp
+                    scene_manager.run(Scene("Tetris – CPU Arena", ARENA_WINDOW_RES), lambda: ArenaApp().run())
+                    screen = scene_manager.screen
                 elif menu_buttons['quit'].is_clicked(mouse_position):
                     pg.quit()
                     sys.exit()
 
-        pg.display.flip()
-        clock.tick(60)
-
 
 if __name__ == "__main__":
     pg.init()
@@ -1,19 +1,28 @@
 from settings import *
-from Tetromino import Tetromino, Block
+from Tetromino import Tetromino, Block, BlockPool, ROTATION_STATES, BOTTOM_PROFILES
+from tracing import traced
 
 import random
+from collections import namedtuple
 import pygame.freetype as ft
 import pygame as pg
 
 
 class ScorePopup:
+    __slots__ = ("tetris", "text", "tile_pos", "colour", "life_frames", "age_frames", "text_surface")
+
     def __init__(self, tetris, text: str, tile_pos: vec, colour=(255, 240, 140)):
         self.tetris = tetris
+        self.tile_pos = vec(0, 0)
+        self.reset(text, tile_pos, colour)
+
+    def reset(self, text: str, tile_pos: vec, colour=(255, 240, 140)):
         self.text = text
-        self.tile_pos = vec(tile_pos)
+        self.tile_pos.update(tile_pos)
         self.colour = colour
         self.life_frames = 60
         self.age_frames = 0
+        self.text_surface = None
 
     def update(self):
         self.age_frames += 1
@@ -22,14 +31,20 @@ class ScorePopup:
 
     def draw(self, surface, font: pg.font.Font):
         alpha = max(0, 255 - int(255 * (self.age_frames / self.life_frames)))
-        rgb = (self.colour[0], self.colour[1], self.colour[2])
+        if self.text_surface is None:
+            rgb = (self.colour[0], self.colour[1], self.colour[2])
+            self.text_surface = font.render(self.text, True, rgb).convert_alpha()
+        self.text_surface.set_alpha(alpha)
 
-        text_surface = font.render(self.text, True, rgb).convert_alpha()
-        text_surface.set_alpha(alpha)
+        pixel_x = int((self.tile_pos.x + self.tetris.offset_tiles.x) * TILE_SIZE)
+        pixel_y = int((self.tile_pos.y + self.tetris.offset_tiles.y) * TILE_SIZE)
+        surface.blit(self.text_surface, (pixel_x, pixel_y))
 
+    def draw_texture(self, renderer, font: pg.font.Font):
+        alpha = max(0, 255 - int(255 * (self.age_frames / self.life_frames)))
         pixel_x = int((self.tile_pos.x + self.tetris.offset_tiles.x) * TILE_SIZE)
         pixel_y = int((self.tile_pos.y + self.tetris.offset_tiles.y) * TILE_SIZE)
-        surface.blit(text_surface, (pixel_x, pixel_y))
+        renderer.draw_text(font, self.text, self.colour, alpha=alpha, topleft=(pixel_x, pixel_y))
 
 
 class Text:
@@ -46,64 +61,174 @@ class Text:
         self.fallback_mid = pg.font.Font(None, int(TILE_SIZE * 1.2))
         self.fallback_big = pg.font.Font(None, int(TILE_SIZE * 1.8))
 
-    def draw(self):
+    def lines(self):
+        """(text, position, freetype size, fallback font) for everything the side panel shows"""
         tetris_game = self.app.tetris
+        panel_lines = [
+            ("TETRIS", (WIN_W * 0.595, WIN_W * 0.02), TILE_SIZE * 1.65, self.fallback_title),
+            ("NEXT", (WIN_W * 0.65, WIN_H * 0.22), TILE_SIZE * 1.4, self.fallback_mid),
+            ("SCORE", (WIN_W * 0.64, WIN_H * 0.67), TILE_SIZE * 1.2, self.fallback_mid),
+            (f"{tetris_game.score}", (WIN_W * 0.64, WIN_H * 0.78), TILE_SIZE * 1.6, self.fallback_big),
+        ]
+        if getattr(self.app, "is_solo", False):
+            panel_lines.append(
+                (
+                    f"SPEED: {tetris_game.manual_speed}  x{tetris_game.speed_multiplier:.1f}",
+                    (WIN_W * 0.64, WIN_H * 0.88),
+                    TILE_SIZE * 0.9,
+                    self.fallback_mid,
+                )
+            )
+            panel_lines.append((f"LEVEL: {tetris_game.level}", (WIN_W * 0.64, WIN_H * 0.94), TILE_SIZE * 0.9, self.fallback_mid))
+        return panel_lines
 
-        title_pos = (WIN_W * 0.595, WIN_W * 0.02)
-        next_pos = (WIN_W * 0.65, WIN_H * 0.22)
-        score_label_pos = (WIN_W * 0.64, WIN_H * 0.67)
-        score_value_pos = (WIN_W * 0.64, WIN_H * 0.78)
-        speed_pos = (WIN_W * 0.64, WIN_H * 0.88)
-        level_pos = (WIN_W * 0.64, WIN_H * 0.94)
+    def draw(self):
+        for text, position, size, fallback_font in self.lines():
+            if self.using_freetype and self.font:
+                self.font.render_to(self.app.screen, position, text=text, fgcolor="white", size=size)
+            else:
+                self.app.screen.blit(fallback_font.render(text, True, "white"), position)
 
-        if self.using_freetype and self.font:
-            self.font.render_to(self.app.screen, title_pos, text="TETRIS", fgcolor="white", size=TILE_SIZE * 1.65)
-            self.font.render_to(self.app.screen, next_pos, text="NEXT", fgcolor="white", size=TILE_SIZE * 1.4)
+    def draw_textures(self, renderer):
+        for text, position, size, fallback_font in self.lines():
+            if self.using_freetype and self.font:
+                renderer.draw_text(self.font, text, "white", size=size, topleft=position)
+            else:
+                renderer.draw_text(fallback_font, text, "white", topleft=position)
 
-            self.font.render_to(self.app.screen, score_label_pos, text="SCORE", fgcolor="white", size=TILE_SIZE * 1.2)
-            self.font.render_to(
-                self.app.screen, score_value_pos, text=f"{tetris_game.score}", fgcolor="white", size=TILE_SIZE * 1.6
-            )
 
-            if getattr(self.app, "is_solo", False):
-                self.font.render_to(
-                    self.app.screen,
-                    speed_pos,
-                    text=f"SPEED: {tetris_game.manual_speed}  x{tetris_game.speed_multiplier:.1f}",
-                    fgcolor="white",
-                    size=TILE_SIZE * 0.9,
-                )
-                self.font.render_to(
-                    self.app.screen,
-                    level_pos,
-                    text=f"LEVEL: {tetris_game.level}",
-                    fgcolor="white",
-                    size=TILE_SIZE * 0.9,
-                )
-        else:
-            self.app.screen.blit(self.fallback_title.render("TETRIS", True, "white"), title_pos)
-            self.app.screen.blit(self.fallback_mid.render("NEXT", True, "white"), next_pos)
+simulation_random = random.Random()
 
-            self.app.screen.blit(self.fallback_mid.render("SCORE", True, "white"), score_label_pos)
-            self.app.screen.blit(self.fallback_big.render(f"{tetris_game.score}", True, "white"), score_value_pos)
+GameState = namedtuple(
+    "GameState",
+    [
+        "field_rows",
+        "column_heights",
+        "piece",
+        "next_piece",
+        "score",
+        "lines_cleared",
+        "level",
+        "pieces_locked",
+        "speed_up",
+        "game_over_flag",
+        "rng_state",
+    ],
+)
 
-            if getattr(self.app, "is_solo", False):
-                self.app.screen.blit(
-                    self.fallback_mid.render(
-                        f"SPEED: {tetris_game.manual_speed}  x{tetris_game.speed_multiplier:.1f}", True, "white"
-                    ),
-                    speed_pos,
-                )
-                self.app.screen.blit(self.fallback_mid.render(f"LEVEL: {tetris_game.level}", True, "white"), level_pos)
+
+class SimulationApp:
+    __slots__ = ("images", "animation_trigger", "fast_animation_trigger")
+
+    def __init__(self, images):
+        self.images = images
+        self.animation_trigger = True
+        self.fast_animation_trigger = False
+
+
+class SimpleBlock:
+    __slots__ = ("tetris", "pos", "is_next_piece")
+
+    def __init__(self, tetris, pos, is_next_piece):
+        self.tetris = tetris
+        self.pos = vec(pos)
+        self.is_next_piece = is_next_piece
+
+    def rotate(self, pivot_pos):
+        translated = self.pos - pivot_pos
+        rotated = translated.rotate(90)
+        return rotated + pivot_pos
+
+    def has_collided(self, test_pos):
+        grid_x, grid_y = int(test_pos.x), int(test_pos.y)
+        if grid_x < 0 or grid_x >= self.tetris.field_w or grid_y >= self.tetris.field_h:
+            return True
+        if grid_y < 0:
+            return False
+        if self.tetris.field_array[grid_y][grid_x]:
+            return True
+        return False
+
+
+class SimpleTetromino:
+    __slots__ = ("tetris", "shape", "landing", "current_shape", "rotation", "blocks")
+
+    def __init__(self, tetris, original_tetromino, is_current):
+        self.tetris = tetris
+        self.shape = original_tetromino.shape
+        self.landing = False
+        self.current_shape = is_current
+        self.rotation = original_tetromino.rotation
+        self.blocks = [SimpleBlock(tetris, block.pos, block.is_next_piece) for block in original_tetromino.blocks]
+
+    @property
+    def pos(self):
+        if self.blocks:
+            return self.blocks[0].pos
+        return vec(0, 0)
+
+    def rotate(self):
+        if not self.blocks:
+            return
+        pivot_pos = self.blocks[0].pos
+        pivot_x, pivot_y = pivot_pos.x, pivot_pos.y
+        for block in self.blocks:
+            if self.tetris.cell_blocked(int(pivot_x + pivot_y - block.pos.y), int(pivot_y + block.pos.x - pivot_x)):
+                return
+        for block in self.blocks:
+            block_x = block.pos.x
+            block.pos.x = pivot_x + pivot_y - block.pos.y
+            block.pos.y = pivot_y + block_x - pivot_x
+        self.rotation = (self.rotation + 1) % 4
+
+    def has_collided(self, positions):
+        for block, test_pos in zip(self.blocks, positions):
+            if block.has_collided(test_pos):
+                return True
+        return False
+
+    def shift(self, move_x, move_y):
+        for block in self.blocks:
+            if self.tetris.cell_blocked(int(block.pos.x) + move_x, int(block.pos.y) + move_y):
+                return False
+        for block in self.blocks:
+            block.pos.x += move_x
+            block.pos.y += move_y
+        return True
+
+    def move(self, direction):
+        if not self.blocks:
+            return
+        move_vector = MOVE_DIRECTIONS[direction]
+        if not self.shift(int(move_vector.x), int(move_vector.y)) and direction == "down":
+            self.landing = True
+
+    def update(self):
+        self.move("down")
+
+
+def board_trace_args(tetris, *args):
+    return {"board": f"{tetris.offset_tiles.x:g},{tetris.offset_tiles.y:g}"}
 
 
 class Tetris:
-    def __init__(self, app, offset_tiles=None, is_simulation=False, random_seed=None, solo_mode=False, solo_speed=3):
+    def __init__(
+        self,
+        app,
+        offset_tiles=None,
+        is_simulation=False,
+        random_seed=None,
+        solo_mode=False,
+        solo_speed=3,
+        spawn_pieces=True,
+        rng=None,
+        field_size=FIELD_SIZE,
+    ):
         self.app = app
         self.is_simulation = is_simulation
         self.solo_mode = bool(solo_mode) and (not is_simulation)
 
-        self.random_generator = random.Random(random_seed)
+        self.random_generator = rng if rng is not None else random.Random(random_seed)
 
         if not is_simulation:
             self.sprite_group = pg.sprite.Group()
@@ -113,12 +238,24 @@ class Tetris:
         self.offset_tiles = offset_tiles if offset_tiles is not None else vec(0, 0)
         self.images = getattr(app, "images", [])
 
-        self.field_array = [[0 for _ in range(FIELD_W)] for _ in range(FIELD_H)]
+        # Board geometry is per game; pieces spawn centred and the preview sits just right of the board
+        self.field_w, self.field_h = int(field_size[0]), int(field_size[1])
+        self.spawn_pos = vec(self.field_w // 2 - 1, 0)
+        self.next_pos = vec(self.field_w + 1, 3)
+
+        self.field_array = [[0 for _ in range(self.field_w)] for _ in range(self.field_h)]
+        self.column_heights = [0] * self.field_w
+        self.board_version = 0
+
+        self.show_ghost = not is_simulation
+        self.ghost_cache_key = None
+        self.ghost_cells = []
 
         self.speed_up = False
         self.score = 0
         self.full_lines = 0
         self.lines_cleared = 0
+        self.pieces_locked = 0
         self.game_over_flag = False
 
         self.manual_speed = max(1, min(5, int(solo_speed)))
@@ -128,10 +265,16 @@ class Tetris:
         self.points_per_line = {0: 0, 1: 100, 2: 300, 3: 700, 4: 1500}
 
         self.popups = []
-        self.popup_font = pg.font.Font(None, 42)
+        self.popup_pool = []
+        self.popup_font = None if is_simulation else pg.font.Font(None, 42)
 
-        self.tetromino = Tetromino(self, current_shape=True, rng=self.random_generator)
-        self.next_tetromino = Tetromino(self, current_shape=False, rng=self.random_generator)
+        self.block_pool = BlockPool()
+        if spawn_pieces:
+            self.tetromino = Tetromino(self, current_shape=True, rng=self.random_generator)
+            self.next_tetromino = Tetromino(self, current_shape=False, rng=self.random_generator)
+        else:
+            self.tetromino = None
+            self.next_tetromino = None
 
         if self.solo_mode and hasattr(self.app, "set_fall_interval_ms"):
             self.app.set_fall_interval_ms(self.get_fall_interval_ms())
@@ -151,13 +294,13 @@ class Tetris:
         self.score += gained_points
         self.lines_cleared += self.full_lines
 
-        phrase = LINE_CLEAR_PHRASES.get(self.full_lines, "")
-        popup_text = f"+{gained_points}"
-        if phrase:
-            popup_text = f"{popup_text}  {phrase}"
+        if not self.is_simulation:
+            phrase = LINE_CLEAR_PHRASES.get(self.full_lines, "")
+            popup_text = f"+{gained_points}"
+            if phrase:
+                popup_text = f"{popup_text}  {phrase}"
 
-        popup_tile = vec(FIELD_W // 2 - 1, FIELD_H // 2)
-        self.popups.append(ScorePopup(self, popup_text, popup_tile))
+            self.show_popup(popup_text, (self.field_w // 2 - 1, self.field_h // 2))
 
         self.full_lines = 0
 
@@ -168,36 +311,139 @@ class Tetris:
                 if hasattr(self.app, "set_fall_interval_ms"):
                     self.app.set_fall_interval_ms(self.get_fall_interval_ms())
 
+    def show_popup(self, text, tile_pos):
+        if self.popup_pool:
+            popup = self.popup_pool.pop()
+            popup.reset(text, tile_pos)
+        else:
+            popup = ScorePopup(self, text, tile_pos)
+        self.popups.append(popup)
+
+    def update_popups(self):
+        """Ages the popups in place, handing expired ones back to the pool"""
+        kept_count = 0
+        for popup in self.popups:
+            if popup.update():
+                self.popups[kept_count] = popup
+                kept_count += 1
+            else:
+                self.popup_pool.append(popup)
+        del self.popups[kept_count:]
+
+    def release_piece(self, tetromino):
+        if not isinstance(tetromino, Tetromino):
+            # Clones carry plain SimpleBlocks, which are not pooled
+            return
+        for block in tetromino.blocks:
+            self.block_pool.release(block)
+        tetromino.blocks.clear()
+
+    def discard(self):
+        """Drops a finished clone's pieces, whose back-references to the board would otherwise leave it to the cyclic collector"""
+        for tetromino in (self.tetromino, self.next_tetromino):
+            if tetromino is not None:
+                self.release_piece(tetromino)
+        self.tetromino = None
+        self.next_tetromino = None
+
+    @traced("Tetris.check_full_line", board_trace_args)
     def check_full_line(self):
-        target_row_index = FIELD_H - 1
+        target_row_index = self.field_h - 1
+        cleared_rows = 0
 
-        for current_row_index in range(FIELD_H - 1, -1, -1):
+        for current_row_index in range(self.field_h - 1, -1, -1):
             row_is_full = True
-            for column_index in range(FIELD_W):
+            for column_index in range(self.field_w):
                 if not self.field_array[current_row_index][column_index]:
                     row_is_full = False
                     break
 
             if not row_is_full:
                 if target_row_index != current_row_index:
-                    for column_index in range(FIELD_W):
+                    for column_index in range(self.field_w):
                         self.field_array[target_row_index][column_index] = self.field_array[current_row_index][column_index]
                         if isinstance(self.field_array[target_row_index][column_index], Block):
-                            self.field_array[target_row_index][column_index].pos = vec(column_index, target_row_index)
+                            self.field_array[target_row_index][column_index].pos.update(column_index, target_row_index)
                 target_row_index -= 1
             else:
                 self.full_lines += 1
-                for column_index in range(FIELD_W):
-                    if isinstance(self.field_array[current_row_index][column_index], Block):
-                        self.field_array[current_row_index][column_index].alive = False
-                        self.field_array[current_row_index][column_index].kill()
+                cleared_rows += 1
+                for column_index in range(self.field_w):
+                    cleared_block = self.field_array[current_row_index][column_index]
+                    if isinstance(cleared_block, Block):
+                        cleared_block.tetromino.blocks.remove(cleared_block)
+                        self.block_pool.release(cleared_block)
                     self.field_array[current_row_index][column_index] = 0
 
+        if cleared_rows:
+            for row_index in range(target_row_index + 1):
+                for column_index in range(self.field_w):
+                    self.field_array[row_index][column_index] = 0
+            self.refresh_column_heights()
+
+    def refresh_column_heights(self):
+        # Clearing only moves cells down, so each column's new surface is at or below its old one.
+        for column_index in range(self.field_w):
+            height = self.column_heights[column_index]
+            for row_index in range(self.field_h - height, self.field_h):
+                if self.field_array[row_index][column_index]:
+                    break
+                height -= 1
+            self.column_heights[column_index] = height
+        self.board_version += 1
+
+    def locked_cell(self, block):
+        """What a locked block leaves in field_array: its sprite on live boards, its shape on simulated ones"""
+        return self.tetromino.shape if self.is_simulation else block
+
     def lock_piece(self):
         for block in self.tetromino.blocks:
             grid_x, grid_y = int(block.pos.x), int(block.pos.y)
-            if 0 <= grid_x < FIELD_W and 0 <= grid_y < FIELD_H:
-                self.field_array[grid_y][grid_x] = block
+            if 0 <= grid_x < self.field_w and 0 <= grid_y < self.field_h:
+                self.field_array[grid_y][grid_x] = self.locked_cell(block)
+                if self.field_h - grid_y > self.column_heights[grid_x]:
+                    self.column_heights[grid_x] = self.field_h - grid_y
+        self.board_version += 1
+
+    def cell_blocked(self, grid_x, grid_y):
+        if grid_x < 0 or grid_x >= self.field_w or grid_y >= self.field_h:
+            return True
+        return grid_y >= 0 and bool(self.field_array[grid_y][grid_x])
+
+    def cells_collide(self, offsets, pivot_x, pivot_y):
+        for offset_x, offset_y in offsets:
+            grid_x, grid_y = pivot_x + offset_x, pivot_y + offset_y
+            if grid_x < 0 or grid_x >= self.field_w or grid_y >= self.field_h:
+                return True
+            if grid_y >= 0 and self.field_array[grid_y][grid_x]:
+                return True
+        return False
+
+    def landing_row(self, shape, rotation, pivot_x, pivot_y):
+        """Pivot row where a piece dropped from (pivot_x, pivot_y) comes to rest"""
+        landing_y = self.field_h
+        for offset_x, lowest_offset_y in BOTTOM_PROFILES[shape][rotation]:
+            column_x = pivot_x + offset_x
+            if column_x < 0 or column_x >= self.field_w:
+                return pivot_y
+            resting_y = self.field_h - self.column_heights[column_x] - 1 - lowest_offset_y
+            if resting_y < landing_y:
+                landing_y = resting_y
+
+        if landing_y >= pivot_y:
+            return landing_y
+
+        # The piece is tucked under an overhang, so the surface does not bound it.
+        offsets = ROTATION_STATES[shape][rotation]
+        while not self.cells_collide(offsets, pivot_x, pivot_y + 1):
+            pivot_y += 1
+        return pivot_y
+
+    def get_drop_distance(self, tetromino):
+        if not tetromino.blocks:
+            return 0
+        pivot_x, pivot_y = int(tetromino.pos.x), int(tetromino.pos.y)
+        return self.landing_row(tetromino.shape, tetromino.rotation, pivot_x, pivot_y) - pivot_y
 
     def check_game_over(self):
         for block in self.tetromino.blocks:
@@ -206,9 +452,11 @@ class Tetris:
                 return True
         return False
 
+    @traced("Tetris.check_landing", board_trace_args)
     def check_landing(self):
         if self.tetromino.landing:
             self.lock_piece()
+            self.pieces_locked += 1
 
             if self.check_game_over():
                 self.game_over_flag = True
@@ -219,14 +467,15 @@ class Tetris:
 
             self.speed_up = False
 
+            # Simulated boards store shapes rather than sprites, so the locked piece's blocks are free again
+            if self.is_simulation:
+                self.release_piece(self.tetromino)
             self.tetromino = self.next_tetromino
             self.tetromino.current_shape = True
 
             for block in self.tetromino.blocks:
-                block.pos = vec(
-                    block.pos.x - NEXT_TETROMINO_POS.x + INIT_POS_OFFSET.x,
-                    block.pos.y - NEXT_TETROMINO_POS.y + INIT_POS_OFFSET.y,
-                )
+                block.pos.x += self.spawn_pos.x - self.next_pos.x
+                block.pos.y += self.spawn_pos.y - self.next_pos.y
                 block.is_next_piece = False
 
             self.next_tetromino = Tetromino(self, current_shape=False, rng=self.random_generator)
@@ -251,12 +500,45 @@ class Tetris:
             self.tetromino.rotate()
         elif action_name == "down":
             self.speed_up = True
+        elif action_name == "release":
+            self.speed_up = False
+
+    def update_ghost(self):
+        pivot = self.tetromino.pos
+        cache_key = (int(pivot.x), int(pivot.y), self.tetromino.rotation, self.board_version, id(self.tetromino))
+        if cache_key == self.ghost_cache_key:
+            return
+        self.ghost_cache_key = cache_key
+
+        drop_distance = self.get_drop_distance(self.tetromino)
+        self.ghost_cells.clear()
+        if drop_distance <= 0:
+            return
+        for block in self.tetromino.blocks:
+            grid_y = int(block.pos.y) + drop_distance
+            if grid_y >= 0:
+                self.ghost_cells.append((int(block.pos.x), grid_y))
+
+    def draw_ghost(self):
+        self.update_ghost()
+        for grid_x, grid_y in self.ghost_cells:
+            pg.draw.rect(
+                self.app.screen,
+                (200, 200, 220),
+                (
+                    (grid_x + self.offset_tiles.x) * TILE_SIZE,
+                    (grid_y + self.offset_tiles.y) * TILE_SIZE,
+                    TILE_SIZE,
+                    TILE_SIZE,
+                ),
+                2,
+            )
 
     def draw_grid(self):
         if self.is_simulation:
             return
-        for grid_x in range(FIELD_W):
-            for grid_y in range(FIELD_H):
+        for grid_x in range(self.field_w):
+            for grid_y in range(self.field_h):
                 pg.draw.rect(
                     self.app.screen,
                     (50, 70, 110),
@@ -269,11 +551,13 @@ class Tetris:
                     1,
                 )
 
+    @traced("Tetris.update", board_trace_args)
     def update(self):
         if self.game_over_flag:
             return
 
-        self.popups = [p for p in self.popups if p.update()]
+        if self.popups:
+            self.update_popups()
 
         animation_trigger = self.app.fast_animation_trigger if self.speed_up else self.app.animation_trigger
         if animation_trigger:
@@ -288,36 +572,58 @@ class Tetris:
             return
 
         self.draw_grid()
+        if self.show_ghost and not self.game_over_flag:
+            self.draw_ghost()
         if self.sprite_group:
             self.sprite_group.draw(self.app.screen)
 
         for popup in self.popups:
             popup.draw(self.app.screen, self.popup_font)
 
-    def get_board(self):
-        board_matrix = [[0 for _ in range(FIELD_W)] for _ in range(FIELD_H)]
-        for grid_y in range(FIELD_H):
-            for grid_x in range(FIELD_W):
+    def draw_textures(self, renderer):
+        """Same picture as draw(), as texture copies on a TextureRenderer"""
+        if self.is_simulation:
+            return
+
+        renderer.draw_grid(self.offset_tiles, (self.field_w, self.field_h))
+        if self.show_ghost and not self.game_over_flag:
+            self.update_ghost()
+            for grid_x, grid_y in self.ghost_cells:
+                renderer.draw_ghost_cell((grid_x + self.offset_tiles.x) * TILE_SIZE, (grid_y + self.offset_tiles.y) * TILE_SIZE)
+        for block in self.sprite_group:
+            renderer.draw_tile(block.image, block.rect.x, block.rect.y)
+
+        for popup in self.popups:
+            popup.draw_texture(renderer, self.popup_font)
+
+    def get_board(self, include_piece=True):
+        board_matrix = [[0 for _ in range(self.field_w)] for _ in range(self.field_h)]
+        for grid_y in range(self.field_h):
+            for grid_x in range(self.field_w):
                 if self.field_array[grid_y][grid_x]:
                     board_matrix[grid_y][grid_x] = 1
+        if not include_piece:
+            return board_matrix
         for block in self.tetromino.blocks:
             grid_x, grid_y = int(block.pos.x), int(block.pos.y)
-            if 0 <= grid_x < FIELD_W and 0 <= grid_y < FIELD_H:
+            if 0 <= grid_x < self.field_w and 0 <= grid_y < self.field_h:
                 board_matrix[grid_y][grid_x] = 1
         return board_matrix
 
     def clone(self):
-        class DummyApp:
-            def __init__(self, images):
-                self.images = images
-                self.animation_trigger = True
-                self.fast_animation_trigger = False
-
-        simulation = Tetris(DummyApp(self.images), offset_tiles=self.offset_tiles, is_simulation=True, random_seed=None)
-
-        for grid_y in range(FIELD_H):
-            for grid_x in range(FIELD_W):
-                simulation.field_array[grid_y][grid_x] = 1 if self.field_array[grid_y][grid_x] else 0
+        simulation = Tetris(
+            SimulationApp(self.images),
+            offset_tiles=self.offset_tiles,
+            is_simulation=True,
+            spawn_pieces=False,
+            rng=simulation_random,
+            field_size=(self.field_w, self.field_h),
+        )
+
+        for grid_y in range(self.field_h):
+            source_row = self.field_array[grid_y]
+            simulation.field_array[grid_y] = [1 if cell else 0 for cell in source_row]
+        simulation.column_heights = self.column_heights[:]
 
         simulation.score = self.score
         simulation.lines_cleared = self.lines_cleared
@@ -328,121 +634,132 @@ class Tetris:
         return simulation
 
     def clone_tetromino(self, original_tetromino, target_tetris, is_current):
-        class SimpleBlock:
-            def __init__(self, pos, is_next_piece):
-                if is_next_piece:
-                    self.pos = vec(pos) + NEXT_TETROMINO_POS
-                else:
-                    self.pos = vec(pos) + INIT_POS_OFFSET
-                self.is_next_piece = is_next_piece
-
-            def rotate(self, pivot_pos):
-                translated = self.pos - pivot_pos
-                rotated = translated.rotate(90)
-                return rotated + pivot_pos
-
-            def has_collided(self, test_pos):
-                grid_x, grid_y = int(test_pos.x), int(test_pos.y)
-                if grid_x < 0 or grid_x >= FIELD_W or grid_y >= FIELD_H:
-                    return True
-                if grid_y < 0:
-                    return False
-                if target_tetris.field_array[grid_y][grid_x]:
-                    return True
-                return False
-
-        class SimpleTetromino:
-            def __init__(self, shape, blocks_data, is_current):
-                self.shape = shape
-                self.landing = False
-                self.current_shape = is_current
-                self.blocks = []
-                for relative_pos, is_next_piece in blocks_data:
-                    self.blocks.append(SimpleBlock(relative_pos, is_next_piece))
-
-            @property
-            def pos(self):
-                if self.blocks:
-                    return self.blocks[0].pos
-                return vec(0, 0)
-
-            def rotate(self):
-                if not self.blocks:
-                    return
-                pivot_pos = self.blocks[0].pos
-                new_positions = [block.rotate(pivot_pos) for block in self.blocks]
-                if not self.has_collided(new_positions):
-                    for i, block in enumerate(self.blocks):
-                        block.pos = new_positions[i]
-
-            def has_collided(self, positions):
-                for block, test_pos in zip(self.blocks, positions):
-                    if block.has_collided(test_pos):
-                        return True
-                return False
-
-            def move(self, direction):
-                if not self.blocks:
-                    return
-                move_vector = MOVE_DIRECTIONS[direction]
-                new_positions = [block.pos + move_vector for block in self.blocks]
-                if not self.has_collided(new_positions):
-                    for block in self.blocks:
-                        block.pos += move_vector
-                elif direction == "down":
-                    self.landing = True
-
-            def update(self):
-                self.move("down")
-
-        blocks_data = []
-        for block in original_tetromino.blocks:
-            if block.is_next_piece:
-                relative_pos = block.pos - NEXT_TETROMINO_POS
-            else:
-                relative_pos = block.pos - INIT_POS_OFFSET
-            blocks_data.append((relative_pos, block.is_next_piece))
-
-        return SimpleTetromino(original_tetromino.shape, blocks_data, is_current)
+        return SimpleTetromino(target_tetris, original_tetromino, is_current)
+
+    def plan_key(self):
+        """Identifies a position for reusing CPU plans: the occupied cells plus the current piece, ignoring its height"""
+        rows = tuple(sum(1 << grid_x for grid_x, cell in enumerate(row) if cell) for row in self.field_array)
+        return rows, self.piece_state(self.tetromino)[:3]
+
+    def rows_empty_through(self, row_index):
+        return self.field_h - max(self.column_heights) > row_index
+
+    def piece_state(self, tetromino):
+        pivot = tetromino.pos
+        return tetromino.shape, tetromino.rotation, int(pivot.x), int(pivot.y), tetromino.landing
+
+    def restore_piece(self, piece_state, is_current, image=None):
+        shape, rotation, pivot_x, pivot_y, landing = piece_state
+        tetromino = Tetromino(self, current_shape=is_current, rng=self.random_generator, shape=shape, image=image)
+        for block, (offset_x, offset_y) in zip(tetromino.blocks, ROTATION_STATES[shape][rotation]):
+            block.pos.update(pivot_x + offset_x, pivot_y + offset_y)
+        tetromino.rotation = rotation
+        tetromino.landing = landing
+        return tetromino
+
+    def save_state(self):
+        """Snapshot that load_state() can rewind to; on live boards the cells are still Block sprites"""
+        return GameState(
+            [row[:] for row in self.field_array],
+            self.column_heights[:],
+            self.piece_state(self.tetromino),
+            self.piece_state(self.next_tetromino),
+            self.score,
+            self.lines_cleared,
+            self.level,
+            self.pieces_locked,
+            self.speed_up,
+            self.game_over_flag,
+            self.random_generator.getstate(),
+        )
+
+    def load_state(self, state, piece_images=(None, None)):
+        for tetromino in (self.tetromino, self.next_tetromino):
+            if tetromino is not None:
+                self.release_piece(tetromino)
+        self.field_array = [row[:] for row in state.field_rows]
+        self.column_heights = state.column_heights[:]
+        self.tetromino = self.restore_piece(state.piece, is_current=True, image=piece_images[0])
+        self.next_tetromino = self.restore_piece(state.next_piece, is_current=False, image=piece_images[1])
+        self.score = state.score
+        self.lines_cleared = state.lines_cleared
+        self.level = state.level
+        self.pieces_locked = state.pieces_locked
+        self.speed_up = state.speed_up
+        self.game_over_flag = state.game_over_flag
+        self.full_lines = 0
+        self.random_generator.setstate(state.rng_state)
+        self.board_version += 1
+
+    def image_at(self, image_index):
+        if 0 <= image_index < len(self.images):
+            return self.images[image_index]
+        return None
+
+    def load_checkpoint(self, state, cell_images, piece_images):
+        """Restores a live board from a saved game; locked cells come back as Block sprites"""
+        for row in self.field_array:
+            for cell in row:
+                if isinstance(cell, Block):
+                    self.block_pool.release(cell)
+        if self.sprite_group is not None:
+            self.sprite_group.empty()
+        self.popup_pool.extend(self.popups)
+        self.popups.clear()
+        self.ghost_cache_key = None
+        self.load_state(state, (self.image_at(piece_images[0]), self.image_at(piece_images[1])))
+
+        holders = {}
+        for grid_y, row in enumerate(self.field_array):
+            for grid_x, shape in enumerate(row):
+                if not shape:
+                    continue
+                image_index = cell_images[grid_y][grid_x]
+                holder = holders.get((shape, image_index))
+                if holder is None:
+                    holder = Tetromino(self, current_shape=True, shape=shape, image=self.image_at(image_index))
+                    self.release_piece(holder)
+                    holders[(shape, image_index)] = holder
+                block = self.block_pool.acquire(holder, (0, 0))
+                block.pos.update(grid_x, grid_y)
+                holder.blocks.append(block)
+                row[grid_x] = block
+
+        if self.sprite_group is not None:
+            self.sprite_group.update()
 
     def get_possible_moves(self):
         possible_moves = []
-        base_simulation = self.clone()
+        if not self.tetromino.blocks:
+            return possible_moves
+
+        shape = self.tetromino.shape
+        pivot_x, pivot_y = int(self.tetromino.pos.x), int(self.tetromino.pos.y)
+        rotation = self.tetromino.rotation
 
         for rotation_count in range(4):
-            rotated_simulation = base_simulation.clone()
-            for _ in range(rotation_count):
-                rotated_simulation.tetromino.rotate()
-
-            for target_x in range(FIELD_W):
-                test_simulation = rotated_simulation.clone()
-
-                current_x = int(test_simulation.tetromino.blocks[0].pos.x)
-                horizontal_shift = target_x - current_x
-
-                can_move_horizontally = True
-                for _ in range(abs(horizontal_shift)):
-                    step = vec(1 if horizontal_shift > 0 else -1, 0)
-                    new_positions = [block.pos + step for block in test_simulation.tetromino.blocks]
-                    if test_simulation.tetromino.has_collided(new_positions):
-                        can_move_horizontally = False
+            if rotation_count > 0:
+                next_rotation = (rotation + 1) % 4
+                if not self.cells_collide(ROTATION_STATES[shape][next_rotation], pivot_x, pivot_y):
+                    rotation = next_rotation
+            offsets = ROTATION_STATES[shape][rotation]
+
+            for target_x in range(self.field_w):
+                step = 1 if target_x > pivot_x else -1
+                current_x = pivot_x
+                while current_x != target_x:
+                    if self.cells_collide(offsets, current_x + step, pivot_y):
                         break
-                    for block in test_simulation.tetromino.blocks:
-                        block.pos += step
-                if not can_move_horizontally:
+                    current_x += step
+                if current_x != target_x:
                     continue
 
-                while True:
-                    new_positions = [block.pos + vec(0, 1) for block in test_simulation.tetromino.blocks]
-                    if test_simulation.tetromino.has_collided(new_positions):
-                        break
-                    for block in test_simulation.tetromino.blocks:
-                        block.pos.y += 1
+                landing_y = self.landing_row(shape, rotation, target_x, pivot_y)
 
                 is_valid_move = True
-                for block in test_simulation.tetromino.blocks:
-                    grid_x, grid_y = int(block.pos.x), int(block.pos.y)
-                    if grid_x < 0 or grid_x >= FIELD_W or grid_y < 0 or grid_y >= FIELD_H:
+                for offset_x, offset_y in offsets:
+                    grid_x, grid_y = target_x + offset_x, landing_y + offset_y
+                    if grid_x < 0 or grid_x >= self.field_w or grid_y < 0 or grid_y >= self.field_h:
                         is_valid_move = False
                         break
                 if is_valid_move:
@@ -450,6 +767,42 @@ class Tetris:
 
         return possible_moves
 
+    def placement_cells(self, move):
+        """Cells the current piece would occupy after the move is hard dropped"""
+        rotation_count, target_x = move
+        shape = self.tetromino.shape
+        pivot_x, pivot_y = int(self.tetromino.pos.x), int(self.tetromino.pos.y)
+        rotation = self.tetromino.rotation
+
+        for _ in range(rotation_count):
+            next_rotation = (rotation + 1) % 4
+            if not self.cells_collide(ROTATION_STATES[shape][next_rotation], pivot_x, pivot_y):
+                rotation = next_rotation
+        offsets = ROTATION_STATES[shape][rotation]
+
+        step = 1 if target_x > pivot_x else -1
+        while pivot_x != target_x and not self.cells_collide(offsets, pivot_x + step, pivot_y):
+            pivot_x += step
+
+        landing_y = self.landing_row(shape, rotation, pivot_x, pivot_y)
+        return [(pivot_x + offset_x, landing_y + offset_y) for offset_x, offset_y in offsets]
+
+    def simulate_placement(self, move):
+        """Returns (board, lines_cleared, topped_out) for a move without cloning the game"""
+        board = [[1 if cell else 0 for cell in row] for row in self.field_array]
+        topped_out = False
+        for grid_x, grid_y in self.placement_cells(move):
+            if grid_y <= 1:
+                topped_out = True
+            if 0 <= grid_y < self.field_h:
+                board[grid_y][grid_x] = 1
+
+        remaining_rows = [row for row in board if not all(row)]
+        lines_cleared = self.field_h - len(remaining_rows)
+        if lines_cleared:
+            board = [[0] * self.field_w for _ in range(lines_cleared)] + remaining_rows
+        return board, lines_cleared, topped_out
+
     def apply_ai_move(self, move):
         if not move or self.game_over_flag:
             return
@@ -462,21 +815,14 @@ class Tetris:
         horizontal_shift = target_x - current_x
 
         if horizontal_shift != 0:
-            step = vec(1 if horizontal_shift > 0 else -1, 0)
+            step_x = 1 if horizontal_shift > 0 else -1
             for _ in range(abs(horizontal_shift)):
-                new_positions = [block.pos + step for block in self.tetromino.blocks]
-                if self.tetromino.has_collided(new_positions):
+                if not self.tetromino.shift(step_x, 0):
                     break
-                for block in self.tetromino.blocks:
-                    block.pos += step
-
-        while True:
-            new_positions = [block.pos + vec(0, 1) for block in self.tetromino.blocks]
-            if self.tetromino.has_collided(new_positions):
-                self.tetromino.landing = True
-                break
-            for block in self.tetromino.blocks:
-                block.pos.y += 1
 
-        if self.tetromino.landing:
-            self.check_landing()
\ No newline at end of file
+        drop_distance = self.get_drop_distance(self.tetromino)
+        for block in self.tetromino.blocks:
+            block.pos.y += drop_distance
+        self.tetromino.landing = True
+
+        self.check_landing()
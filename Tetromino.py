@@ -4,38 +4,84 @@ import random
 import pygame as pg
 
 
+def rotate_offset(offset):
+    rotated = vec(offset).rotate(90)
+    return int(round(rotated.x)), int(round(rotated.y))
+
+
+def build_rotation_states():
+    rotation_states = {}
+    for shape, offsets in TETROMINOES.items():
+        shape_states = []
+        current_offsets = [tuple(offset) for offset in offsets]
+        for _ in range(4):
+            shape_states.append(tuple(current_offsets))
+            current_offsets = [rotate_offset(offset) for offset in current_offsets]
+        rotation_states[shape] = tuple(shape_states)
+    return rotation_states
+
+
+def bottom_profile(offsets):
+    lowest_by_column = {}
+    for offset_x, offset_y in offsets:
+        if offset_x not in lowest_by_column or offset_y > lowest_by_column[offset_x]:
+            lowest_by_column[offset_x] = offset_y
+    return tuple(sorted(lowest_by_column.items()))
+
+
+# Block offsets relative to the pivot (blocks[0]) for each of the four rotations,
+# and the lowest block offset per column used to find the landing row directly.
+ROTATION_STATES = build_rotation_states()
+BOTTOM_PROFILES = {
+    shape: tuple(bottom_profile(offsets) for offsets in shape_states)
+    for shape, shape_states in ROTATION_STATES.items()
+}
+
+
+FALLBACK_COLOURS_BY_SHAPE = {
+    "T": (255, 0, 255),
+    "O": (255, 255, 0),
+    "J": (0, 0, 255),
+    "L": (255, 165, 0),
+    "I": (0, 255, 255),
+    "S": (0, 255, 0),
+    "Z": (255, 0, 0),
+}
+
+fallback_tile_cache = {}
+
+
+def get_fallback_tile(shape):
+    if shape not in fallback_tile_cache:
+        tile_image = pg.Surface((TILE_SIZE, TILE_SIZE))
+        tile_image.fill(FALLBACK_COLOURS_BY_SHAPE.get(shape, (200, 200, 200)))
+        pg.draw.rect(tile_image, (255, 255, 255), (0, 0, TILE_SIZE, TILE_SIZE), 2)
+        fallback_tile_cache[shape] = tile_image
+    return fallback_tile_cache[shape]
+
+
 class Block(pg.sprite.Sprite):
     def __init__(self, tetromino, pos, is_next_piece=False):
         pg.sprite.Sprite.__init__(self)
+        self.pos = vec(0, 0)
+        self.rect = None
+        self.reset(tetromino, pos, is_next_piece)
 
+    def reset(self, tetromino, pos, is_next_piece=False):
         self.tetromino = tetromino
         self.alive = True
         self.is_next_piece = is_next_piece
 
-        if is_next_piece:
-            self.pos = vec(pos) + NEXT_TETROMINO_POS
-        else:
-            self.pos = vec(pos) + INIT_POS_OFFSET
+        origin = tetromino.tetris.next_pos if is_next_piece else tetromino.tetris.spawn_pos
+        self.pos.update(pos[0] + origin.x, pos[1] + origin.y)
 
         if tetromino.image:
             self.image = tetromino.image
         else:
-            self.image = pg.Surface((TILE_SIZE, TILE_SIZE))
-            colours_by_shape = {
-                "T": (255, 0, 255),
-                "O": (255, 255, 0),
-                "J": (0, 0, 255),
-                "L": (255, 165, 0),
-                "I": (0, 255, 255),
-                "S": (0, 255, 0),
-                "Z": (255, 0, 0),
-            }
-
-            colour = colours_by_shape.get(tetromino.shape, (200, 200, 200))
-            self.image.fill(colour)
-            pg.draw.rect(self.image, (255, 255, 255), (0, 0, TILE_SIZE, TILE_SIZE), 2)
-
-        self.rect = self.image.get_rect()
+            self.image = get_fallback_tile(tetromino.shape)
+
+        if self.rect is None:
+            self.rect = self.image.get_rect()
 
         if not tetromino.tetris.is_simulation and tetromino.tetris.sprite_group is not None:
             tetromino.tetris.sprite_group.add(self)
@@ -53,40 +99,76 @@ class Block(pg.sprite.Sprite):
         block_grid_position = self.pos
         if hasattr(self.tetromino.tetris, "offset_tiles"):
             grid_offset_tiles = self.tetromino.tetris.offset_tiles
-            self.rect.topleft = (block_grid_position + grid_offset_tiles) * TILE_SIZE
+            self.rect.x = (block_grid_position.x + grid_offset_tiles.x) * TILE_SIZE
+            self.rect.y = (block_grid_position.y + grid_offset_tiles.y) * TILE_SIZE
         else:
-            self.rect.topleft = block_grid_position * TILE_SIZE
+            self.rect.x = block_grid_position.x * TILE_SIZE
+            self.rect.y = block_grid_position.y * TILE_SIZE
 
     def has_collided(self, test_pos):
         grid_x, grid_y = int(test_pos.x), int(test_pos.y)
+        tetris = self.tetromino.tetris
 
-        if grid_x < 0 or grid_x >= FIELD_W or grid_y >= FIELD_H:
+        if grid_x < 0 or grid_x >= tetris.field_w or grid_y >= tetris.field_h:
             return True
         if grid_y < 0:
             return False
-        if self.tetromino.tetris.field_array[grid_y][grid_x]:
+        if tetris.field_array[grid_y][grid_x]:
             return True
         return False
 
 
+class BlockPool:
+    """Recycles Block sprites, so once a board has cleared a few lines spawning a piece allocates nothing"""
+
+    __slots__ = ("free_blocks", "created", "reused")
+
+    def __init__(self):
+        self.free_blocks = []
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, tetromino, pos, is_next_piece=False):
+        if self.free_blocks:
+            self.reused += 1
+            block = self.free_blocks.pop()
+            block.reset(tetromino, pos, is_next_piece)
+            return block
+        self.created += 1
+        return Block(tetromino, pos, is_next_piece)
+
+    def release(self, block):
+        block.alive = False
+        block.kill()
+        block.tetromino = None
+        self.free_blocks.append(block)
+
+
 class Tetromino:
-    def __init__(self, tetris, current_shape=True, rng=None):
+    __slots__ = ("tetris", "landing", "current_shape", "rotation", "random_generator", "shape", "image", "blocks")
+
+    def __init__(self, tetris, current_shape=True, rng=None, shape=None, image=None):
         self.tetris = tetris
         self.landing = False
         self.current_shape = current_shape
+        self.rotation = 0
 
         self.random_generator = rng if rng is not None else random
 
-        self.shape = self.random_generator.choice(list(TETROMINOES.keys()))
-
-        if hasattr(tetris, "images") and tetris.images:
-            self.image = self.random_generator.choice(tetris.images)
+        if shape is not None:
+            self.shape = shape
+            self.image = image
         else:
-            self.image = None
+            self.shape = self.random_generator.choice(list(TETROMINOES.keys()))
+
+            if hasattr(tetris, "images") and tetris.images:
+                self.image = self.random_generator.choice(tetris.images)
+            else:
+                self.image = None
 
         self.blocks = []
         for relative_pos in TETROMINOES[self.shape]:
-            self.blocks.append(Block(self, relative_pos, is_next_piece=not current_shape))
+            self.blocks.append(tetris.block_pool.acquire(self, relative_pos, is_next_piece=not current_shape))
 
     @property
     def pos(self):
@@ -98,12 +180,18 @@ class Tetromino:
         if not self.blocks:
             return
 
+        # Turns each block a quarter about the pivot in place: (x, y) -> (-y, x) relative to blocks[0]
         pivot_pos = self.blocks[0].pos
-        rotated_positions = [block.rotate(pivot_pos) for block in self.blocks]
+        pivot_x, pivot_y = pivot_pos.x, pivot_pos.y
+        for block in self.blocks:
+            if self.tetris.cell_blocked(int(pivot_x + pivot_y - block.pos.y), int(pivot_y + block.pos.x - pivot_x)):
+                return
 
-        if not self.has_collided(rotated_positions):
-            for index, block in enumerate(self.blocks):
-                block.pos = rotated_positions[index]
+        for block in self.blocks:
+            block_x = block.pos.x
+            block.pos.x = pivot_x + pivot_y - block.pos.y
+            block.pos.y = pivot_y + block_x - pivot_x
+        self.rotation = (self.rotation + 1) % 4
 
     def has_collided(self, positions):
         for block, test_pos in zip(self.blocks, positions):
@@ -111,18 +199,23 @@ class Tetromino:
                 return True
         return False
 
+    def shift(self, move_x, move_y):
+        """Moves every block by whole cells unless one would collide; returns whether it moved"""
+        for block in self.blocks:
+            if self.tetris.cell_blocked(int(block.pos.x) + move_x, int(block.pos.y) + move_y):
+                return False
+        for block in self.blocks:
+            block.pos.x += move_x
+            block.pos.y += move_y
+        return True
+
     def move(self, direction):
         if not self.blocks:
             return
 
         move_direction_vector = MOVE_DIRECTIONS[direction]
-        moved_positions = [block.pos + move_direction_vector for block in self.blocks]
-
-        if not self.has_collided(moved_positions):
-            for block in self.blocks:
-                block.pos += move_direction_vector
-        elif direction == "down":
+        if not self.shift(int(move_direction_vector.x), int(move_direction_vector.y)) and direction == "down":
             self.landing = True
 
     def update(self):
-        self.move("down")
\ No newline at end of file
+        self.move("down")
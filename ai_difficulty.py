@@ -1,7 +1,25 @@
+import multiprocessing
+import os
 import random
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
 
+from settings import (
+    AI_SPECULATION_CANDIDATES,
+    EXPECTIMAX_NEXT_BEAM,
+    EXPECTIMAX_ROOT_BEAM,
+    EXPECTIMAX_TIME_LIMIT_MS,
+    EXPECTIMAX_WORKER_NICENESS,
+    EXPECTIMAX_WORKERS,
+    FIELD_H,
+    FIELD_SIZE,
+    TETROMINOES,
+)
 from TetrisGame import Tetris
-from ai_features import aggregate_height, complete_lines, holes, bumpiness
+from ai_features import aggregate_height, holes, bumpiness
+from opening_book import get_opening_book, pack_rows, position_game
+from tracing import traced
 
 
 HEURISTIC_WEIGHTS = {
@@ -11,39 +29,441 @@ HEURISTIC_WEIGHTS = {
     "bumpiness": -0.184483,
 }
 
+GAME_OVER_SCORE = -1e9
+
+
+def score_board(board, lines_cleared):
+    return (
+        HEURISTIC_WEIGHTS["aggregate_height"] * aggregate_height(board)
+        + HEURISTIC_WEIGHTS["complete_lines"] * lines_cleared
+        + HEURISTIC_WEIGHTS["holes"] * holes(board)
+        + HEURISTIC_WEIGHTS["bumpiness"] * bumpiness(board)
+    )
+
+
+def evaluate_move(game: Tetris, move):
+    board, lines_cleared, topped_out = game.simulate_placement(move)
+    if topped_out:
+        return GAME_OVER_SCORE
+    return score_board(board, lines_cleared)
+
+
+class Speculation:
+    """A search for the next piece on the board one candidate placement would leave"""
+
+    __slots__ = ("key", "pivot_y", "game", "moves", "next_move_index", "best", "best_score")
+
+    def __init__(self, game: Tetris):
+        self.key = game.plan_key()
+        self.pivot_y = int(game.tetromino.pos.y)
+        self.game = game
+        self.moves = game.get_possible_moves()
+        self.next_move_index = 0
+        self.best = None
+        self.best_score = GAME_OVER_SCORE
 
-class EasyAI:
-    def choose_move(self, game: Tetris):
-        possible_moves = game.get_possible_moves()
-        return random.choice(possible_moves) if possible_moves else None
 
+class SearchAgent:
+    """Agent whose search can be spread across frames.
+
+    start_search() snapshots the game, search_step() evaluates candidates until
+    the deadline passes, and best_move() returns the best placement found so far.
+
+    Once the search is done, speculate_step() plans the next piece on the boards
+    the top few candidates would leave, while the current piece is still
+    falling. When the piece locks and the board matches one of those, the next
+    search is answered from plan_cache without evaluating anything.
+    Low-stack positions near the start of a game come from the opening book.
+    """
+
+    speculates = True
+    uses_book = True
+
+    def __init__(self):
+        self.candidates_evaluated = 0
+        self.root = None
+        self.pending_moves = []
+        self.next_move_index = 0
+        self.best = None
+        self.best_score = GAME_OVER_SCORE
+        self.ranked_moves = []
+        self.speculations = []
+        self.plan_cache = {}
+        self.cache_lookups = 0
+        self.cache_hits = 0
+        self.speculative_evaluations = 0
+        self.book_lookups = 0
+        self.book_hits = 0
+
+    @traced("SearchAgent.start_search")
+    def start_search(self, game: Tetris):
+        self.discard_clones()
+        self.root = game.clone()
+        self.next_move_index = 0
+        self.ranked_moves = []
+        self.best = None
+        self.best_score = GAME_OVER_SCORE
+
+        planned_move = self.lookup_plan(game)
+        if planned_move is None:
+            planned_move = self.lookup_book(game)
+        if planned_move is None:
+            self.pending_moves = game.get_possible_moves()
+        else:
+            self.pending_moves = []
+            self.best = planned_move
+            self.ranked_moves = [(0.0, planned_move)]
+
+    def lookup_plan(self, game: Tetris):
+        if not self.speculates:
+            return None
+        self.cache_lookups += 1
+        plan = self.plan_cache.get(game.plan_key())
+        self.plan_cache.clear()
+        if plan is None:
+            return None
 
-class MediumAI:
+        planned_move, planned_y = plan
+        current_y = int(game.tetromino.pos.y)
+        # A piece that has already fallen a row plans the same unless the stack reaches the rows it sweeps through
+        if current_y != planned_y and not game.rows_empty_through(max(current_y, planned_y) + 2):
+            return None
+        self.cache_hits += 1
+        return planned_move
+
+    def lookup_book(self, game: Tetris):
+        book = get_opening_book() if self.uses_book else None
+        if book is None:
+            return None
+        self.book_lookups += 1
+        move = book.lookup(game)
+        if move is not None:
+            self.book_hits += 1
+        return move
+
+    def candidates_remaining(self):
+        return self.next_move_index < len(self.pending_moves)
+
+    def search_done(self):
+        return not self.candidates_remaining()
+
+    @traced("SearchAgent.search_step")
+    def search_step(self, deadline_s: float):
+        while self.candidates_remaining():
+            if time.perf_counter() >= deadline_s:
+                break
+            move = self.pending_moves[self.next_move_index]
+            self.next_move_index += 1
+            score = self.evaluate(self.root, move)
+            self.candidates_evaluated += 1
+            self.ranked_moves.append((score, move))
+            if self.best is None or score > self.best_score:
+                self.best_score = score
+                self.best = move
+        return self.search_done()
+
+    def queue_speculations(self):
+        candidates = sorted(self.ranked_moves, key=lambda scored: scored[0], reverse=True)
+        self.ranked_moves = []
+        for _, move in candidates[:AI_SPECULATION_CANDIDATES]:
+            next_game = self.root.clone()
+            next_game.apply_ai_move(move)
+            if next_game.game_over_flag:
+                next_game.discard()
+            else:
+                self.speculations.append(Speculation(next_game))
+
+    def speculation_pending(self):
+        return self.speculates and bool(self.ranked_moves or self.speculations)
+
+    @traced("SearchAgent.speculate_step")
+    def speculate_step(self, deadline_s: float):
+        if self.ranked_moves:
+            self.queue_speculations()
+        while self.speculations:
+            speculation = self.speculations[0]
+            while speculation.next_move_index < len(speculation.moves):
+                if time.perf_counter() >= deadline_s:
+                    return
+                move = speculation.moves[speculation.next_move_index]
+                speculation.next_move_index += 1
+                score = self.evaluate(speculation.game, move)
+                self.speculative_evaluations += 1
+                if speculation.best is None or score > speculation.best_score:
+                    speculation.best_score = score
+                    speculation.best = move
+            if speculation.best is not None:
+                self.plan_cache[speculation.key] = (speculation.best, speculation.pivot_y)
+            self.speculations.pop(0).game.discard()
+
+    def discard_clones(self):
+        """Frees the boards of the last search now, so they never reach the older GC generations"""
+        if self.root is not None:
+            self.root.discard()
+            self.root = None
+        for speculation in self.speculations:
+            speculation.game.discard()
+        self.speculations = []
+
+    def best_move(self):
+        return self.best
+
+    def evaluate(self, game: Tetris, move):
+        return evaluate_move(game, move)
+
+    @traced("SearchAgent.choose_move")
     def choose_move(self, game: Tetris):
-        possible_moves = game.get_possible_moves()
-        if not possible_moves:
+        self.start_search(game)
+        self.search_step(float("inf"))
+        return self.best_move()
+
+
+class EasyAI(SearchAgent):
+    speculates = False
+    uses_book = False
+
+    @traced("EasyAI.start_search")
+    def start_search(self, game: Tetris):
+        self.pending_moves = game.get_possible_moves()
+        self.next_move_index = len(self.pending_moves)
+        self.candidates_evaluated += len(self.pending_moves)
+        self.best = random.choice(self.pending_moves) if self.pending_moves else None
+
+
+class MediumAI(SearchAgent):
+    """Ranks every placement with the board heuristic, the search SearchAgent does by default"""
+
+
+SHAPES = list(TETROMINOES.keys())
+
+
+def ranked_placements(packed_rows, shape, lines_so_far):
+    """(score, board, total lines, topped out) for every placement of shape on the packed board, best first"""
+    game = position_game(packed_rows, shape, FIELD_H)
+    ranked = []
+    for move in game.get_possible_moves():
+        board, lines_cleared, topped_out = game.simulate_placement(move)
+        total_lines = lines_so_far + lines_cleared
+        score = GAME_OVER_SCORE if topped_out else score_board(board, total_lines)
+        ranked.append((score, board, total_lines, topped_out))
+    ranked.sort(key=lambda placement: placement[0], reverse=True)
+    return ranked
+
+
+def chance_value(field_rows, lines_so_far, cutoff):
+    """Average over the seven equally likely shapes of their best placement, or None once it cannot beat cutoff"""
+    # Height, holes and bumpiness only ever lower a score, so no placement beats clearing four more lines on a flat floor
+    upper_bound = HEURISTIC_WEIGHTS["complete_lines"] * (lines_so_far + 4)
+    packed_rows = pack_rows(field_rows, FIELD_H)
+    total = 0.0
+    for shape_index, shape in enumerate(SHAPES):
+        ranked = ranked_placements(packed_rows, shape, lines_so_far)
+        total += ranked[0][0] if ranked else GAME_OVER_SCORE
+        unseen_shapes = len(SHAPES) - shape_index - 1
+        if (total + unseen_shapes * upper_bound) / len(SHAPES) <= cutoff:
+            return None
+    return total / len(SHAPES)
+
+
+def expectimax_subtree(packed_rows, lines_so_far, next_shape, deadline_wall_s):
+    """Value of the board one current-piece placement leaves: best next-piece placement, then a chance node.
+
+    Runs in a pool worker. Only the top EXPECTIMAX_NEXT_BEAM next-piece placements
+    by the static score are expanded. Returns None if the deadline passes first.
+    """
+    best_value = None
+    for _, board, total_lines, topped_out in ranked_placements(packed_rows, next_shape, lines_so_far)[:EXPECTIMAX_NEXT_BEAM]:
+        if time.time() >= deadline_wall_s:
             return None
+        value = GAME_OVER_SCORE if topped_out else chance_value(board, total_lines, GAME_OVER_SCORE if best_value is None else best_value)
+        if value is not None and (best_value is None or value > best_value):
+            best_value = value
+    return GAME_OVER_SCORE if best_value is None else best_value
+
+
+_expectimax_pool = None
+_expectimax_worker_count = None
+
+
+def lower_worker_priority():
+    # Workers yield to the game loop whenever they have to share a core with it
+    if hasattr(os, "nice"):
+        os.nice(EXPECTIMAX_WORKER_NICENESS)
+
+
+def set_expectimax_workers(worker_count: int) -> None:
+    """Sizes the pools get_expectimax_pool() starts from now on, for processes that share the cores with others"""
+    global _expectimax_worker_count
+    _expectimax_worker_count = worker_count
+
 
-        best_move = None
-        best_score = -1e9
+def get_expectimax_pool() -> ProcessPoolExecutor:
+    """Returns the shared pool, starting its workers in the background on first use"""
+    global _expectimax_pool
+    if _expectimax_pool is None:
+        worker_count = _expectimax_worker_count or EXPECTIMAX_WORKERS or os.cpu_count() or 1
+        # Spawned rather than forked so workers never inherit the game's SDL state
+        _expectimax_pool = ProcessPoolExecutor(
+            worker_count, mp_context=multiprocessing.get_context("spawn"), initializer=lower_worker_priority
+        )
+        for _ in range(worker_count):
+            _expectimax_pool.submit(time.sleep, 0)
+    return _expectimax_pool
 
-        for move in possible_moves:
-            simulation = game.clone()
-            simulation.apply_ai_move(move)
-            board = simulation.get_board()
 
-            score = (
-                HEURISTIC_WEIGHTS["aggregate_height"] * aggregate_height(board)
-                + HEURISTIC_WEIGHTS["complete_lines"] * complete_lines(board)
-                + HEURISTIC_WEIGHTS["holes"] * holes(board)
-                + HEURISTIC_WEIGHTS["bumpiness"] * bumpiness(board)
-            )
+def discard_expectimax_pool(pool):
+    """Drops a pool whose workers died, so the next get_expectimax_pool() starts a fresh one"""
+    global _expectimax_pool
+    if _expectimax_pool is pool:
+        _expectimax_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
 
-            if score > best_score:
-                best_score = score
-                best_move = move
 
-        return best_move
+def shutdown_expectimax_pool():
+    """Stops the pool's workers; a process that is about to exit must do this or its workers outlive it"""
+    global _expectimax_pool
+    if _expectimax_pool is not None:
+        _expectimax_pool.shutdown(wait=True, cancel_futures=True)
+        _expectimax_pool = None
+
+
+class ExpectimaxAI(SearchAgent):
+    """Plans the current and next piece and averages over the seven shapes the piece after could be.
+
+    The current piece's placements are ranked with the medium heuristic on the
+    game thread in time slices, exactly like MediumAI. The best
+    EXPECTIMAX_ROOT_BEAM are then handed to the process pool, as many per slice
+    as fit before its deadline, so the game loop only ever submits and polls.
+    Whatever has come back when the time limit passes decides the move; if
+    nothing has, or the pool's workers have died, the heuristic's choice stands.
+    """
+
+    speculates = False
+    uses_book = False
+
+    def __init__(self, time_limit_ms: float = EXPECTIMAX_TIME_LIMIT_MS):
+        super().__init__()
+        self.time_limit_ms = time_limit_ms
+        self.pool = get_expectimax_pool()
+        self.placements = {}
+        self.subtrees = []
+        self.unsubmitted = None
+        self.subtrees_submitted = False
+        self.next_shape = None
+        self.limit_s = 0.0
+        self.expectimax_score = None
+        self.standard_board = True
+        self.subtrees_completed = 0
+        self.subtrees_timed_out = 0
+
+    def start_search(self, game: Tetris):
+        self.cancel_subtrees()
+        self.placements = {}
+        self.unsubmitted = None
+        self.subtrees_submitted = False
+        self.next_shape = game.next_tetromino.shape
+        # Subtrees are searched on packed standard-size boards; other sizes keep the heuristic's choice
+        self.standard_board = (game.field_w, game.field_h) == FIELD_SIZE
+        self.limit_s = time.perf_counter() + self.time_limit_ms / 1000.0
+        self.expectimax_score = None
+        super().start_search(game)
+
+    def evaluate(self, game: Tetris, move):
+        board, lines_cleared, topped_out = game.simulate_placement(move)
+        self.placements[move] = (board, lines_cleared, topped_out)
+        return GAME_OVER_SCORE if topped_out else score_board(board, lines_cleared)
+
+    def queue_subtrees(self):
+        self.unsubmitted = []
+        if not self.standard_board:
+            return
+        ranked = sorted(self.ranked_moves, key=lambda scored: scored[0], reverse=True)
+        for _, move in ranked[:EXPECTIMAX_ROOT_BEAM]:
+            if move in self.placements and not self.placements[move][2]:
+                self.unsubmitted.append(move)
+
+    def submit_subtrees(self, deadline_s: float):
+        """Submits queued subtrees, at least one per call, until deadline_s passes"""
+        if self.unsubmitted is None:
+            self.queue_subtrees()
+        if time.perf_counter() >= self.limit_s:
+            self.subtrees_timed_out += len(self.unsubmitted)
+            self.unsubmitted.clear()
+        deadline_wall_s = time.time() + max(0.0, self.limit_s - time.perf_counter())
+        while self.unsubmitted:
+            move = self.unsubmitted.pop(0)
+            board, lines_cleared, _ = self.placements[move]
+            try:
+                future = self.pool.submit(expectimax_subtree, pack_rows(board, FIELD_H), lines_cleared, self.next_shape, deadline_wall_s)
+            except (BrokenProcessPool, RuntimeError) as error:  # a dead worker must cost the CPU its lookahead, not the game
+                print(f"[AI] Expectimax pool unavailable ({error}), keeping the heuristic move")
+                self.replace_pool()
+                self.unsubmitted.clear()
+                break
+            self.subtrees.append((move, future))
+            if time.perf_counter() >= deadline_s:
+                break
+        self.subtrees_submitted = not self.unsubmitted
+
+    def replace_pool(self):
+        discard_expectimax_pool(self.pool)
+        self.pool = get_expectimax_pool()
+
+    def collect_subtrees(self):
+        still_running = []
+        for move, future in self.subtrees:
+            if not future.done():
+                still_running.append((move, future))
+                continue
+            try:
+                value = future.result()
+            except Exception as error:  # a dead worker must cost the CPU its lookahead, not the game
+                print(f"[AI] Expectimax subtree failed: {error}")
+                continue
+            if value is None:
+                self.subtrees_timed_out += 1
+                continue
+            self.subtrees_completed += 1
+            if self.expectimax_score is None or value > self.expectimax_score:
+                self.expectimax_score = value
+                self.best = move
+        self.subtrees = still_running
+        if self.subtrees and time.perf_counter() >= self.limit_s:
+            self.cancel_subtrees()
+
+    def cancel_subtrees(self):
+        self.subtrees_timed_out += len(self.subtrees)
+        for _, future in self.subtrees:
+            future.cancel()
+        self.subtrees = []
+
+    def search_done(self):
+        return not self.candidates_remaining() and self.subtrees_submitted and not self.subtrees
+
+    def best_move(self):
+        # The move can be released before the scheduler polls again, so pick up anything that has finished
+        if self.subtrees:
+            self.collect_subtrees()
+        return self.best
+
+    @traced("ExpectimaxAI.search_step")
+    def search_step(self, deadline_s: float):
+        if self.candidates_remaining():
+            super().search_step(deadline_s)
+            if self.candidates_remaining() or time.perf_counter() >= deadline_s:
+                return False
+        if not self.subtrees_submitted:
+            self.submit_subtrees(deadline_s)
+        self.collect_subtrees()
+        return self.search_done()
+
+    def choose_move(self, game: Tetris):
+        self.start_search(game)
+        while not self.search_done():
+            self.search_step(float("inf"))
+            if self.subtrees:
+                wait([future for _, future in self.subtrees], max(0.0, self.limit_s - time.perf_counter()), FIRST_COMPLETED)
+        return self.best_move()
 
 
 def get_ai_by_difficulty(difficulty_name: str):
@@ -52,6 +472,8 @@ def get_ai_by_difficulty(difficulty_name: str):
         return EasyAI()
     if difficulty_key == "medium":
         return MediumAI()
+    if difficulty_key == "hard":
+        return ExpectimaxAI()
 
     print(f"[AI Difficulty] Unknown difficulty '{difficulty_name}', defaulting to Medium")
-    return MediumAI()
\ No newline at end of file
+    return MediumAI()
@@ -1,12 +1,15 @@
-from settings import FIELD_W, FIELD_H
+def board_size(board):
+    """(width, height) of a board given as rows of cells"""
+    return (len(board[0]) if board else 0), len(board)
 
 
 def column_heights(board):
-    heights = [0] * FIELD_W
-    for column_index in range(FIELD_W):
-        for row_index in range(FIELD_H):
+    field_w, field_h = board_size(board)
+    heights = [0] * field_w
+    for column_index in range(field_w):
+        for row_index in range(field_h):
             if board[row_index][column_index]:
-                heights[column_index] = FIELD_H - row_index
+                heights[column_index] = field_h - row_index
                 break
     return heights
 
@@ -16,14 +19,15 @@ def aggregate_height(board):
 
 
 def complete_lines(board):
-    return sum(1 for row_index in range(FIELD_H) if all(board[row_index][col] for col in range(FIELD_W)))
+    return sum(1 for row in board if all(row))
 
 
 def holes(board):
+    field_w, field_h = board_size(board)
     hole_count = 0
-    for column_index in range(FIELD_W):
+    for column_index in range(field_w):
         seen_block = False
-        for row_index in range(FIELD_H):
+        for row_index in range(field_h):
             if board[row_index][column_index]:
                 seen_block = True
             elif seen_block:
@@ -33,4 +37,4 @@ def holes(board):
 
 def bumpiness(board):
     heights = column_heights(board)
-    return sum(abs(heights[i] - heights[i + 1]) for i in range(FIELD_W - 1))
\ No newline at end of file
+    return sum(abs(heights[i] - heights[i + 1]) for i in range(len(heights) - 1))
\ No newline at end of file
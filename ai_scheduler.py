@@ -0,0 +1,106 @@
+import time
+from typing import List, Tuple
+
+from settings import AI_FRAME_BUDGET_MS, CPU_DIFFICULTY_BUDGETS
+
+
+class AgentSlot:
+    def __init__(self, board_index, game, agent, difficulty):
+        budgets = CPU_DIFFICULTY_BUDGETS.get(difficulty, CPU_DIFFICULTY_BUDGETS["medium"])
+        self.board_index = board_index
+        self.game = game
+        self.agent = agent
+        self.compute_ms = budgets["compute_ms"]
+        self.reaction_ms = budgets["reaction_ms"]
+
+        self.piece_id = None
+        self.waited_ms = 0.0
+        self.spent_ms = 0.0
+        self.searching = False
+        self.started = False
+
+    def needs_new_search(self):
+        return self.piece_id != self.game.pieces_locked
+
+
+class AIScheduler:
+    """Shares a per-frame time budget between several CPU agents.
+
+    Each agent searches in slices of at most its difficulty's compute budget,
+    taking turns within the shared frame budget. The budget is a soft limit:
+    starting a search (cloning the board and listing its placements) cannot be
+    split, so a slice that starts one can run over by that much. Its cost is
+    counted in the slot's spent time. A move is released
+    once the agent's reaction time has passed since the piece spawned, using the
+    best placement found so far if the search has not finished. Budget left over
+    while an agent waits out its reaction time goes to speculating on the next
+    piece, so the search at the next spawn is usually already answered.
+    """
+
+    def __init__(self, frame_budget_ms: float = AI_FRAME_BUDGET_MS):
+        self.frame_budget_ms = frame_budget_ms
+        self.slots: List[AgentSlot] = []
+        self.next_slot_index = 0
+        self.ready_moves: List[Tuple[AgentSlot, tuple]] = []
+
+    def add_agent(self, board_index, game, agent, difficulty):
+        slot = AgentSlot(board_index, game, agent, difficulty)
+        self.slots.append(slot)
+        return slot
+
+    def update(self, frame_ms: float) -> List[Tuple[AgentSlot, tuple]]:
+        frame_start_s = time.perf_counter()
+        frame_deadline_s = frame_start_s + self.frame_budget_ms / 1000.0
+
+        slot_count = len(self.slots)
+        for offset in range(slot_count):
+            slot = self.slots[(self.next_slot_index + offset) % slot_count]
+            if slot.game.game_over_flag:
+                continue
+
+            if slot.needs_new_search():
+                slot.piece_id = slot.game.pieces_locked
+                slot.waited_ms = 0.0
+                slot.spent_ms = 0.0
+                slot.searching = True
+                slot.started = False
+            else:
+                slot.waited_ms += frame_ms
+
+            if not slot.searching:
+                continue
+            search_finished = slot.started and slot.agent.search_done()
+            if search_finished and not slot.agent.speculation_pending():
+                continue
+
+            slice_start_s = time.perf_counter()
+            if slice_start_s >= frame_deadline_s:
+                continue
+            slice_deadline_s = min(frame_deadline_s, slice_start_s + slot.compute_ms / 1000.0)
+            if search_finished:
+                slot.agent.speculate_step(slice_deadline_s)
+                continue
+            if not slot.started:
+                slot.agent.start_search(slot.game)
+                slot.started = True
+            if time.perf_counter() < slice_deadline_s:
+                slot.agent.search_step(slice_deadline_s)
+            slot.spent_ms += (time.perf_counter() - slice_start_s) * 1000.0
+
+        if slot_count:
+            self.next_slot_index = (self.next_slot_index + 1) % slot_count
+
+        # Reused every frame; callers consume the moves before the next update
+        ready_moves = self.ready_moves
+        ready_moves.clear()
+        for slot in self.slots:
+            if not slot.searching or not slot.started or slot.game.game_over_flag:
+                continue
+            if slot.waited_ms < slot.reaction_ms:
+                continue
+            chosen_move = slot.agent.best_move()
+            if chosen_move is None and not slot.agent.search_done():
+                continue
+            slot.searching = False
+            ready_moves.append((slot, chosen_move))
+        return ready_moves
@@ -0,0 +1,286 @@
+import math
+import sys
+
+import pygame as pg
+
+from settings import *
+from TetrisGame import Tetris
+from Tetromino import Block, FALLBACK_COLOURS_BY_SHAPE
+from ai_difficulty import get_ai_by_difficulty
+from ai_scheduler import AIScheduler
+from tracing import traced
+from scenes import get_scene_manager
+
+
+ARENA_PANEL_WIDTH = 360
+ARENA_HEADER_HEIGHT = 60
+ARENA_LABEL_HEIGHT = 16
+ARENA_BOARD_GAP = 10
+
+
+def arena_grid_layout(board_count, area_width, area_height):
+    """Picks the column count that gives the largest whole-pixel tile size"""
+    best_layout = (1, board_count, 1)
+    for columns in range(1, board_count + 1):
+        rows = math.ceil(board_count / columns)
+        tile_width = (area_width / columns - ARENA_BOARD_GAP) / FIELD_W
+        tile_height = (area_height / rows - ARENA_BOARD_GAP - ARENA_LABEL_HEIGHT) / FIELD_H
+        tile_size = int(min(tile_width, tile_height))
+        if tile_size > best_layout[2]:
+            best_layout = (columns, rows, tile_size)
+    return best_layout
+
+
+class BoardThumbnail:
+    """Scaled-down board image that is only redrawn when the board changes"""
+
+    def __init__(self, game, tile_size):
+        self.game = game
+        self.tile_size = tile_size
+        self.surface = pg.Surface((game.field_w * tile_size, game.field_h * tile_size))
+        self.render_key = None
+
+    def cell_colour(self, cell):
+        if isinstance(cell, Block):
+            return FALLBACK_COLOURS_BY_SHAPE.get(cell.tetromino.shape, (200, 200, 200))
+        return FALLBACK_COLOURS_BY_SHAPE.get(cell, (200, 200, 200))
+
+    def refresh(self):
+        game = self.game
+        pivot = game.tetromino.pos
+        render_key = (
+            game.board_version,
+            int(pivot.x),
+            int(pivot.y),
+            game.tetromino.rotation,
+            id(game.tetromino),
+            game.game_over_flag,
+        )
+        if render_key == self.render_key:
+            return False
+        self.render_key = render_key
+
+        tile_size = self.tile_size
+        self.surface.fill(FIELD_COLOUR)
+        for grid_y, row in enumerate(game.field_array):
+            for grid_x, cell in enumerate(row):
+                if cell:
+                    self.surface.fill(self.cell_colour(cell), (grid_x * tile_size, grid_y * tile_size, tile_size, tile_size))
+
+        if not game.game_over_flag:
+            piece_colour = FALLBACK_COLOURS_BY_SHAPE.get(game.tetromino.shape, (200, 200, 200))
+            for block in game.tetromino.blocks:
+                grid_x, grid_y = int(block.pos.x), int(block.pos.y)
+                if grid_y >= 0:
+                    self.surface.fill(piece_colour, (grid_x * tile_size, grid_y * tile_size, tile_size, tile_size))
+        else:
+            self.surface.fill((70, 70, 70), special_flags=pg.BLEND_RGB_MULT)
+        return True
+
+
+class ArenaApp:
+    def __init__(self, board_count=ARENA_DEFAULT_BOARDS, cpu_difficulty="mixed", random_seed=None):
+        pg.init()
+
+        self.board_count = max(ARENA_MIN_BOARDS, min(ARENA_MAX_BOARDS, int(board_count)))
+        self.cpu_difficulty = str(cpu_difficulty).lower().strip()
+        if self.cpu_difficulty not in ("easy", "medium", "hard", "mixed"):
+            self.cpu_difficulty = "mixed"
+        self.random_seed = random_seed
+
+        scene_manager = get_scene_manager()
+        self.screen = scene_manager.show(ARENA_WINDOW_RES, "Tetris – CPU Arena")
+        self.clock = scene_manager.clock
+        self.images = []
+
+        self.normal_tick_event = pg.USEREVENT + 0
+        self.fast_tick_event = pg.USEREVENT + 1
+        self.animation_trigger = False
+        self.fast_animation_trigger = False
+
+        self.background = self.make_background()
+        self.title_font = pg.font.Font(None, 48)
+        self.label_font = pg.font.Font(None, ARENA_LABEL_HEIGHT + 4)
+        self.panel_font = pg.font.Font(None, 26)
+
+        area_width = ARENA_WINDOW_RES[0] - ARENA_PANEL_WIDTH
+        area_height = ARENA_WINDOW_RES[1] - ARENA_HEADER_HEIGHT
+        self.grid_columns, self.grid_rows, self.tile_size = arena_grid_layout(self.board_count, area_width, area_height)
+        self.cell_width = area_width // self.grid_columns
+        self.cell_height = area_height // self.grid_rows
+
+        self.paused = False
+        self.reset()
+
+    def make_background(self):
+        width, height = ARENA_WINDOW_RES
+        background = pg.Surface((width, height))
+        for y in range(height):
+            blend = y / height
+            colour = (int(25 * (1 - blend) + 40 * blend), int(30 * (1 - blend) + 20 * blend), int(50 * (1 - blend) + 60 * blend))
+            pg.draw.line(background, colour, (0, y), (width, y))
+        return background
+
+    def board_difficulty(self, board_index):
+        if self.cpu_difficulty == "mixed":
+            return "medium" if board_index % 2 == 0 else "easy"
+        return self.cpu_difficulty
+
+    def reset(self):
+        self.games = []
+        self.names = []
+        self.thumbnails = []
+        self.label_surfaces = []
+        self.board_positions = []
+        self.ai_scheduler = AIScheduler(ARENA_AI_FRAME_BUDGET_MS)
+
+        for board_index in range(self.board_count):
+            seed = None if self.random_seed is None else self.random_seed + board_index
+            game = Tetris(self, is_simulation=True, random_seed=seed)
+            difficulty = self.board_difficulty(board_index)
+            self.ai_scheduler.add_agent(board_index, game, get_ai_by_difficulty(difficulty), difficulty)
+            self.games.append(game)
+
+            name = f"CPU {board_index + 1:02d} ({difficulty[0].upper()})"
+            self.names.append(name)
+            self.thumbnails.append(BoardThumbnail(game, self.tile_size))
+            self.label_surfaces.append(self.label_font.render(name, True, (220, 220, 240)))
+
+            column, row = board_index % self.grid_columns, board_index // self.grid_columns
+            board_pixel_width = FIELD_W * self.tile_size
+            board_x = column * self.cell_width + (self.cell_width - board_pixel_width) // 2
+            board_y = ARENA_HEADER_HEIGHT + row * self.cell_height + ARENA_LABEL_HEIGHT
+            self.board_positions.append((board_x, board_y))
+
+        self.eliminations = []
+        self.eliminated = set()
+        self.arena_finished = False
+        self.elapsed_ms = 0
+        self.level = LEVEL_START
+        self.panel_surface = None
+        self.panel_key = None
+        self.set_timers()
+
+    def set_timers(self):
+        pg.time.set_timer(self.normal_tick_event, level_base_interval_ms(self.level))
+        pg.time.set_timer(self.fast_tick_event, FAST_ANIMATION_TIME_INTERVAL)
+
+    @traced("ArenaApp.check_events")
+    def check_events(self):
+        self.animation_trigger = False
+        self.fast_animation_trigger = False
+
+        for event in pg.event.get():
+            if event.type == pg.QUIT:
+                pg.quit()
+                raise SystemExit
+            if event.type == pg.KEYDOWN and event.key == pg.K_ESCAPE:
+                return False
+            if event.type == pg.KEYDOWN and event.key == PAUSE_KEY_MATCH:
+                self.paused = not self.paused
+            if event.type == pg.KEYDOWN and event.key == pg.K_r:
+                self.reset()
+            if event.type == self.normal_tick_event:
+                self.animation_trigger = True
+            if event.type == self.fast_tick_event:
+                self.fast_animation_trigger = True
+        return True
+
+    def update(self):
+        frame_ms = self.clock.tick(FPS)
+        if self.paused or self.arena_finished:
+            return
+
+        self.elapsed_ms += frame_ms
+        target_level = LEVEL_START + self.elapsed_ms // (ARENA_SECONDS_PER_LEVEL * 1000)
+        if target_level != self.level:
+            self.level = target_level
+            pg.time.set_timer(self.normal_tick_event, level_base_interval_ms(self.level))
+
+        for slot, chosen_move in self.ai_scheduler.update(frame_ms):
+            if chosen_move:
+                slot.game.apply_ai_move(chosen_move)
+
+        alive_count = 0
+        for board_index, game in enumerate(self.games):
+            game.update()
+            if game.game_over_flag:
+                if board_index not in self.eliminated:
+                    self.eliminated.add(board_index)
+                    self.eliminations.append(board_index)
+            else:
+                alive_count += 1
+
+        self.arena_finished = alive_count <= 1
+
+    def standings(self):
+        alive = [index for index in range(self.board_count) if index not in self.eliminated]
+        alive.sort(key=lambda index: self.games[index].score, reverse=True)
+        return alive + list(reversed(self.eliminations))
+
+    def draw_panel(self):
+        panel_key = (len(self.eliminations), tuple(game.score for game in self.games), self.arena_finished)
+        if panel_key != self.panel_key:
+            self.panel_key = panel_key
+            panel_height = ARENA_WINDOW_RES[1] - ARENA_HEADER_HEIGHT
+            self.panel_surface = pg.Surface((ARENA_PANEL_WIDTH, panel_height), pg.SRCALPHA)
+            self.panel_surface.fill((0, 0, 0, 110))
+            heading = self.panel_font.render("STANDINGS", True, (255, 215, 120))
+            self.panel_surface.blit(heading, (16, 10))
+
+            row_height = 24
+            max_rows = (panel_height - 50) // row_height
+            for place, board_index in enumerate(self.standings()[:max_rows], start=1):
+                is_out = board_index in self.eliminated
+                colour = (150, 150, 160) if is_out else (255, 255, 255)
+                status = "OUT" if is_out else ""
+                line = f"{place:>2}. {self.names[board_index]:<14} {self.games[board_index].score:>7}  {status}"
+                self.panel_surface.blit(self.panel_font.render(line, True, colour), (16, 44 + (place - 1) * row_height))
+
+        self.screen.blit(self.panel_surface, (ARENA_WINDOW_RES[0] - ARENA_PANEL_WIDTH, ARENA_HEADER_HEIGHT))
+
+    @traced("ArenaApp.draw")
+    def draw(self):
+        self.screen.blit(self.background, (0, 0))
+
+        alive_count = self.board_count - len(self.eliminations)
+        header = f"CPU ARENA   {alive_count}/{self.board_count} alive   level {self.level}   {self.clock.get_fps():.0f} FPS"
+        self.screen.blit(self.title_font.render(header, True, (255, 255, 150)), (20, 14))
+
+        for board_index, thumbnail in enumerate(self.thumbnails):
+            thumbnail.refresh()
+            board_x, board_y = self.board_positions[board_index]
+            self.screen.blit(self.label_surfaces[board_index], (board_x, board_y - ARENA_LABEL_HEIGHT))
+            self.screen.blit(thumbnail.surface, (board_x, board_y))
+
+        self.draw_panel()
+
+        if self.arena_finished or self.paused:
+            message = "PAUSED" if self.paused else "ARENA COMPLETE!  R to restart, ESC to leave"
+            message_surface = self.title_font.render(message, True, (255, 255, 100))
+            message_rect = message_surface.get_rect(center=(ARENA_WINDOW_RES[0] // 2, ARENA_WINDOW_RES[1] // 2))
+            self.screen.blit(message_surface, message_rect)
+
+        pg.display.flip()
+
+    def run(self):
+        while self.check_events():
+            self.update()
+            self.draw()
+        pg.time.set_timer(self.normal_tick_event, 0)
+        pg.time.set_timer(self.fast_tick_event, 0)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run many CPU boards side by side")
+    parser.add_argument("--boards", type=int, default=ARENA_DEFAULT_BOARDS)
+    parser.add_argument("--difficulty", default="mixed", choices=["easy", "medium", "hard", "mixed"])
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--trace", nargs="?", const=TRACE_DEFAULT_PATH, help="write a Chrome trace to this path on exit")
+    args = parser.parse_args()
+
+    ArenaApp(board_count=args.boards, cpu_difficulty=args.difficulty, random_seed=args.seed).run()
+    pg.quit()
+    sys.exit()
@@ -0,0 +1,244 @@
+import os
+import struct
+import threading
+import zlib
+from collections import namedtuple
+from typing import Optional
+
+from settings import AUTOSAVE_PATH, FIELD_W, FIELD_H, TETROMINOES
+from TetrisGame import GameState
+from io_worker import get_io_worker
+
+
+# Layout: magic, format version, then a zlib-compressed body of
+#   mode, board count, CPU opponents, string count, length-prefixed UTF-8 strings
+#   and per board a header, the two pieces, the cell shapes, the cell images,
+#   the column heights and the Mersenne Twister state.
+AUTOSAVE_MAGIC = b"TSAV"
+AUTOSAVE_VERSION = 1
+
+SNAPSHOT_HEADER = struct.Struct("<BBBB")
+BOARD_HEADER = struct.Struct("<IIHIBB")
+PIECE = struct.Struct("<BBbbBB")
+RNG_STATE = struct.Struct("<625I")
+
+MODE_SOLO = 0
+MODE_MATCH = 1
+FLAG_GAME_OVER = 1
+FLAG_SPEED_UP = 2
+NO_IMAGE = 255
+
+SHAPES = list(TETROMINOES.keys())
+SHAPE_CODES = {shape: index + 1 for index, shape in enumerate(SHAPES)}
+
+BoardSnapshot = namedtuple("BoardSnapshot", ["state", "cell_images", "piece_images", "manual_speed"])
+Snapshot = namedtuple("Snapshot", ["mode", "cpu_opponents", "strings", "boards"])
+BoardCheckpoint = namedtuple("BoardCheckpoint", ["state", "cell_images", "piece_images", "manual_speed"])
+Checkpoint = namedtuple("Checkpoint", ["mode", "cpu_opponents", "strings", "boards"])
+
+
+def take_snapshot(mode, games, images, strings, cpu_opponents=0) -> Snapshot:
+    """Turns each board into plain shapes and image indices on the game thread; encoding happens later on the I/O worker.
+
+    Live cells are pooled Block sprites that a line clear hands back to the
+    pool, so none of them may be kept past this call.
+    """
+    image_indices = {id(image): index for index, image in enumerate(images)}
+    boards = []
+    for game in games:
+        state = game.save_state()
+        shape_rows = []
+        cell_images = []
+        for row in state.field_rows:
+            shape_row = []
+            image_row = []
+            for cell in row:
+                if not cell or isinstance(cell, str):
+                    shape_row.append(cell)
+                    image_row.append(NO_IMAGE)
+                else:
+                    shape_row.append(cell.tetromino.shape)
+                    image_row.append(image_indices.get(id(cell.image), NO_IMAGE))
+            shape_rows.append(shape_row)
+            cell_images.append(image_row)
+        piece_images = tuple(image_indices.get(id(piece.image), NO_IMAGE) for piece in (game.tetromino, game.next_tetromino))
+        boards.append(BoardSnapshot(state._replace(field_rows=shape_rows), cell_images, piece_images, game.manual_speed))
+    return Snapshot(mode, cpu_opponents, list(strings), boards)
+
+
+def encode_piece(piece_state, image_index) -> bytes:
+    shape, rotation, pivot_x, pivot_y, landing = piece_state
+    return PIECE.pack(SHAPE_CODES[shape], rotation, pivot_x, pivot_y, int(landing), image_index)
+
+
+def encode_snapshot(snapshot: Snapshot) -> bytes:
+    parts = [SNAPSHOT_HEADER.pack(snapshot.mode, len(snapshot.boards), snapshot.cpu_opponents, len(snapshot.strings))]
+    for text in snapshot.strings:
+        encoded_text = text.encode("utf-8")[:255]
+        parts.append(bytes((len(encoded_text),)) + encoded_text)
+
+    for board in snapshot.boards:
+        state = board.state
+        flags = (FLAG_GAME_OVER if state.game_over_flag else 0) | (FLAG_SPEED_UP if state.speed_up else 0)
+        parts.append(
+            BOARD_HEADER.pack(state.score, state.lines_cleared, state.level, state.pieces_locked, flags, board.manual_speed)
+        )
+        for piece_state, image_index in zip((state.piece, state.next_piece), board.piece_images):
+            parts.append(encode_piece(piece_state, image_index))
+
+        shape_bytes = bytearray(FIELD_W * FIELD_H)
+        image_bytes = bytearray(b"\xff" * (FIELD_W * FIELD_H))
+        for grid_y, (row, image_row) in enumerate(zip(state.field_rows, board.cell_images)):
+            for grid_x, shape in enumerate(row):
+                if shape:
+                    cell_index = grid_y * FIELD_W + grid_x
+                    shape_bytes[cell_index] = SHAPE_CODES[shape]
+                    image_bytes[cell_index] = image_row[grid_x]
+        parts.append(bytes(shape_bytes))
+        parts.append(bytes(image_bytes))
+        parts.append(bytes(state.column_heights))
+        parts.append(RNG_STATE.pack(*state.rng_state[1]))
+
+    return AUTOSAVE_MAGIC + bytes((AUTOSAVE_VERSION,)) + zlib.compress(b"".join(parts))
+
+
+def decode_checkpoint(data: bytes) -> Checkpoint:
+    if data[:4] != AUTOSAVE_MAGIC or data[4] != AUTOSAVE_VERSION:
+        raise ValueError("not a version %d autosave" % AUTOSAVE_VERSION)
+    body = zlib.decompress(data[5:])
+
+    mode, board_count, cpu_opponents, string_count = SNAPSHOT_HEADER.unpack_from(body, 0)
+    offset = SNAPSHOT_HEADER.size
+    strings = []
+    for _ in range(string_count):
+        length = body[offset]
+        strings.append(body[offset + 1: offset + 1 + length].decode("utf-8"))
+        offset += 1 + length
+
+    cell_count = FIELD_W * FIELD_H
+    boards = []
+    for _ in range(board_count):
+        score, lines_cleared, level, pieces_locked, flags, manual_speed = BOARD_HEADER.unpack_from(body, offset)
+        offset += BOARD_HEADER.size
+
+        pieces = []
+        piece_images = []
+        for _ in range(2):
+            shape_code, rotation, pivot_x, pivot_y, landing, image_index = PIECE.unpack_from(body, offset)
+            offset += PIECE.size
+            pieces.append((SHAPES[shape_code - 1], rotation, pivot_x, pivot_y, bool(landing)))
+            piece_images.append(image_index)
+
+        shape_bytes = body[offset: offset + cell_count]
+        image_bytes = body[offset + cell_count: offset + 2 * cell_count]
+        offset += 2 * cell_count
+        field_rows = []
+        cell_images = []
+        for grid_y in range(FIELD_H):
+            row_start = grid_y * FIELD_W
+            field_rows.append([SHAPES[code - 1] if code else 0 for code in shape_bytes[row_start: row_start + FIELD_W]])
+            cell_images.append(list(image_bytes[row_start: row_start + FIELD_W]))
+
+        column_heights = list(body[offset: offset + FIELD_W])
+        offset += FIELD_W
+        rng_state = (3, RNG_STATE.unpack_from(body, offset), None)
+        offset += RNG_STATE.size
+
+        state = GameState(
+            field_rows,
+            column_heights,
+            pieces[0],
+            pieces[1],
+            score,
+            lines_cleared,
+            level,
+            pieces_locked,
+            bool(flags & FLAG_SPEED_UP),
+            bool(flags & FLAG_GAME_OVER),
+            rng_state,
+        )
+        boards.append(BoardCheckpoint(state, cell_images, tuple(piece_images), manual_speed))
+
+    return Checkpoint(mode, cpu_opponents, strings, boards)
+
+
+def load_checkpoint(path: str = AUTOSAVE_PATH) -> Optional[Checkpoint]:
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as file_handle:
+            return decode_checkpoint(file_handle.read())
+    except (OSError, ValueError, IndexError, KeyError, struct.error, zlib.error) as error:
+        print(f"[Autosave] Ignoring unreadable autosave {path}: {error}")
+        return None
+
+
+def has_checkpoint(path: str = AUTOSAVE_PATH) -> bool:
+    return os.path.exists(path)
+
+
+class AutosaveWriter:
+    """Encodes and writes checkpoints on the shared background I/O worker.
+
+    Only the newest pending snapshot is kept, so a slow disk never queues up
+    stale saves, and each file is written beside the real one and swapped in
+    with os.replace so a crash mid-write leaves the previous checkpoint intact.
+    """
+
+    CLEAR = object()
+
+    def __init__(self, path: str = AUTOSAVE_PATH):
+        self.path = path
+        self.io = get_io_worker()
+        self.lock = threading.Lock()
+        self.pending = None
+        self.saves_written = 0
+
+    def save(self, snapshot: Snapshot) -> None:
+        self.replace_pending(snapshot)
+
+    def clear(self) -> None:
+        self.replace_pending(self.CLEAR)
+
+    def replace_pending(self, job) -> None:
+        with self.lock:
+            already_queued = self.pending is not None
+            self.pending = job
+        if not already_queued:
+            self.io.submit(f"autosave to {self.path}", self.write_pending)
+
+    def flush(self) -> None:
+        self.io.flush()
+
+    def write_pending(self) -> None:
+        with self.lock:
+            job = self.pending
+            self.pending = None
+        if job is self.CLEAR:
+            self.remove_file()
+        elif job is not None:
+            self.write_file(encode_snapshot(job))
+
+    def write_file(self, data: bytes) -> None:
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "wb") as file_handle:
+            file_handle.write(data)
+            file_handle.flush()
+            os.fsync(file_handle.fileno())
+        os.replace(temp_path, self.path)
+        self.saves_written += 1
+
+    def remove_file(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+_autosave_writer = None
+
+
+def get_autosave() -> AutosaveWriter:
+    """Returns the shared autosave writer"""
+    global _autosave_writer
+    if _autosave_writer is None:
+        _autosave_writer = AutosaveWriter()
+    return _autosave_writer
@@ -0,0 +1,88 @@
+"""Compares the expectimax CPU with the medium CPU on the same seeded games.
+
+Run with `python benchmark_expectimax.py [--games 10] [--pieces 150]`. Both
+agents are driven in 2 ms slices the way AIScheduler drives them, so the report
+also shows the longest the game thread was ever held by one slice, in wall
+time and in the thread's own CPU time (the two differ when workers share its core).
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from settings import EXPECTIMAX_TIME_LIMIT_MS
+from TetrisGame import Tetris, SimulationApp
+from ai_difficulty import MediumAI, ExpectimaxAI
+
+
+SLICE_MS = 2.0
+
+
+def play_game(agent, seed, piece_limit):
+    game = Tetris(SimulationApp([]), is_simulation=True, random_seed=seed)
+    decision_ms = []
+    longest_slice_ms = 0.0
+    longest_slice_cpu_ms = 0.0
+    while not game.game_over_flag and game.pieces_locked < piece_limit:
+        decision_start_s = time.perf_counter()
+        agent.start_search(game)
+        while not agent.search_done():
+            slice_start_s = time.perf_counter()
+            slice_start_cpu_s = time.thread_time()
+            agent.search_step(slice_start_s + SLICE_MS / 1000.0)
+            longest_slice_ms = max(longest_slice_ms, (time.perf_counter() - slice_start_s) * 1000.0)
+            longest_slice_cpu_ms = max(longest_slice_cpu_ms, (time.thread_time() - slice_start_cpu_s) * 1000.0)
+            if not agent.search_done():
+                time.sleep(0.001)
+        decision_ms.append((time.perf_counter() - decision_start_s) * 1000.0)
+        game.apply_ai_move(agent.best_move())
+    return game, decision_ms, longest_slice_ms, longest_slice_cpu_ms
+
+
+def run(game_count, piece_limit):
+    for label, make_agent in (("medium", MediumAI), ("expectimax", ExpectimaxAI)):
+        agent = make_agent()
+        if isinstance(agent, ExpectimaxAI):
+            # Let the spawned workers finish importing so their start-up is not counted
+            agent.pool.submit(time.sleep, 0).result()
+        totals = {"pieces": 0, "lines": 0, "score": 0, "survived": 0}
+        all_decisions = []
+        longest_slice_ms = 0.0
+        longest_slice_cpu_ms = 0.0
+        for seed in range(game_count):
+            game, decision_ms, game_longest_ms, game_longest_cpu_ms = play_game(agent, seed, piece_limit)
+            totals["pieces"] += game.pieces_locked
+            totals["lines"] += game.lines_cleared
+            totals["score"] += game.score
+            totals["survived"] += not game.game_over_flag
+            all_decisions.extend(decision_ms)
+            longest_slice_ms = max(longest_slice_ms, game_longest_ms)
+            longest_slice_cpu_ms = max(longest_slice_cpu_ms, game_longest_cpu_ms)
+        all_decisions.sort()
+        print(
+            f"{label:<11} survived {totals['survived']}/{game_count}  "
+            f"pieces {totals['pieces'] / game_count:6.1f}  lines {totals['lines'] / game_count:5.1f}  "
+            f"score {totals['score'] / game_count:7.0f}  "
+            f"decision p50 {all_decisions[len(all_decisions) // 2]:5.1f} ms  max {all_decisions[-1]:5.1f} ms  "
+            f"longest slice {longest_slice_ms:.2f} ms ({longest_slice_cpu_ms:.2f} ms CPU)"
+        )
+        if isinstance(agent, ExpectimaxAI):
+            print(
+                f"{'':<11} subtrees completed {agent.subtrees_completed}, cut off by the "
+                f"{EXPECTIMAX_TIME_LIMIT_MS} ms limit {agent.subtrees_timed_out}, workers {agent.pool._max_workers}"
+            )
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--pieces", type=int, default=150)
+    args = parser.parse_args()
+    return run(args.games, args.pieces)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
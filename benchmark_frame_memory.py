@@ -0,0 +1,128 @@
+"""Measures per-frame allocations and GC pauses of the live frame loop in each GC mode.
+
+Run with `python benchmark_frame_memory.py [--frames 20000] [--boards 3]`. Each
+mode runs in its own process with TETRIS_GC set, driving live boards (sprites,
+ghost pieces and popups included) headlessly with the medium CPU placing every
+piece, and reports what FrameMemory counted. It exits with status 1 when the
+pieces mode leaves clearly more allocated blocks per frame than automatic
+collection does, which means cycles are escaping its gen0-only collections.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame as pg
+
+from settings import FIELD_W, TILE_SIZE, GC_ENV_VAR, GC_MODE_AUTOMATIC, GC_MODE_PIECES, vec
+from TetrisGame import Tetris
+from ai_difficulty import MediumAI
+from frame_memory import start_frame_memory, stop_frame_memory
+from telemetry import FrameStats
+
+
+GRAVITY_FRAMES = 6
+# Allocated blocks per frame the pieces mode may keep above automatic collection before the run counts as a leak
+LEAK_MARGIN_BLOCKS = 1.0
+
+
+class BenchmarkApp:
+    def __init__(self, board_count):
+        board_width = FIELD_W + 8
+        self.screen = pg.display.set_mode((board_width * board_count * TILE_SIZE, 22 * TILE_SIZE))
+        self.images = []
+        self.animation_trigger = False
+        self.fast_animation_trigger = False
+        self.games = [
+            Tetris(self, offset_tiles=vec(1 + board_index * board_width, 1), random_seed=board_index)
+            for board_index in range(board_count)
+        ]
+
+
+def run_child(frame_count, board_count):
+    pg.init()
+    app = BenchmarkApp(board_count)
+    agents = [MediumAI() for _ in app.games]
+    for agent in agents:
+        agent.uses_book = False
+        agent.speculates = False
+    placed = [-1] * board_count
+    frame_memory, gc_schedule = start_frame_memory(os.environ)
+    frame_stats = FrameStats()
+
+    for frame in range(frame_count):
+        frame_start_s = time.perf_counter()
+        app.animation_trigger = frame % GRAVITY_FRAMES == 0
+        for board_index, game in enumerate(app.games):
+            if game.game_over_flag:
+                app.games[board_index] = game = Tetris(app, offset_tiles=game.offset_tiles, random_seed=frame)
+                placed[board_index] = -1
+            # Place each piece once it has fallen for a while, as a CPU opponent would
+            if placed[board_index] != game.pieces_locked and game.tetromino.pos.y >= 3:
+                placed[board_index] = game.pieces_locked
+                game.apply_ai_move(agents[board_index].choose_move(game))
+            game.update()
+        app.screen.fill((0, 0, 0))
+        for game in app.games:
+            game.draw()
+        pg.display.flip()
+        frame_stats.add((time.perf_counter() - frame_start_s) * 1000.0)
+        frame_memory.frame_done()
+        if gc_schedule:
+            gc_schedule.after_frame(sum(game.pieces_locked for game in app.games))
+
+    stop_frame_memory(frame_memory, gc_schedule)
+    report = frame_memory.to_dict(app.games)
+    report["frame_work"] = frame_stats.percentiles()
+    print(json.dumps(report))
+    return 0
+
+
+def run(frame_count, board_count):
+    blocks_per_frame = {}
+    for gc_mode in (GC_MODE_AUTOMATIC, GC_MODE_PIECES):
+        environment = dict(os.environ, **{GC_ENV_VAR: gc_mode})
+        completed = subprocess.run(
+            [sys.executable, __file__, "--child", "--frames", str(frame_count), "--boards", str(board_count)],
+            env=environment,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        report = json.loads(completed.stdout.strip().splitlines()[-1])
+        pauses = report["gc_pauses"]
+        blocks_per_frame[gc_mode] = report["allocated_blocks_per_frame"]["mean"]
+        print(
+            f"{gc_mode:<7} objects/frame {report['objects_per_frame']['mean']:6.2f}  "
+            f"blocks/frame {report['allocated_blocks_per_frame']['mean']:6.2f}  "
+            f"frames with GC {report['frames_with_gc']:5d}  "
+            f"longest GC {pauses['max_ms']:6.3f} ms  collections {report['collections']}  "
+            f"frame p99 {report['frame_work']['p99_ms']:.2f} ms  "
+            f"blocks created {report['blocks_created']} reused {report['blocks_reused']}"
+        )
+    if blocks_per_frame[GC_MODE_PIECES] > blocks_per_frame[GC_MODE_AUTOMATIC] + LEAK_MARGIN_BLOCKS:
+        print(
+            f"[GC] {GC_MODE_PIECES} mode keeps {blocks_per_frame[GC_MODE_PIECES]:.2f} blocks/frame against "
+            f"{blocks_per_frame[GC_MODE_AUTOMATIC]:.2f} with automatic collection: garbage is escaping gen0"
+        )
+        return 1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=20000)
+    parser.add_argument("--boards", type=int, default=3)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return run_child(args.frames, args.boards)
+    return run(args.frames, args.boards)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""How CPU move generation and evaluation scale with the board size.
+
+Run with `python benchmark_geometry.py [--pieces 120] [--sizes 10x20 20x40 30x60 40x80]`.
+Each size plays one seeded simulated game, placing every piece with the
+medium CPU's heuristic. For every position it times get_possible_moves() on
+its own, and then scoring each of those moves (simulate_placement() plus the
+board features). Costs are per position, with the 10x20 board as the 1.0x
+reference; the cell count grows by the square of the scale, while the number
+of moves only grows with the width.
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from TetrisGame import Tetris, SimulationApp
+from ai_difficulty import evaluate_move
+
+
+def parse_size(text):
+    field_w, _, field_h = text.lower().partition("x")
+    return int(field_w), int(field_h)
+
+
+def play_game(field_size, piece_limit, seed):
+    game = Tetris(SimulationApp([]), is_simulation=True, random_seed=seed, field_size=field_size)
+    generation_s = 0.0
+    evaluation_s = 0.0
+    move_count = 0
+    positions = 0
+    while not game.game_over_flag and positions < piece_limit:
+        generation_start_s = time.perf_counter()
+        moves = game.get_possible_moves()
+        evaluation_start_s = time.perf_counter()
+        scored = [(evaluate_move(game, move), move) for move in moves]
+        evaluation_end_s = time.perf_counter()
+        generation_s += evaluation_start_s - generation_start_s
+        evaluation_s += evaluation_end_s - evaluation_start_s
+        move_count += len(moves)
+        positions += 1
+        game.apply_ai_move(max(scored)[1] if scored else None)
+        if not scored:
+            break
+    return positions, move_count, generation_s, evaluation_s, game
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pieces", type=int, default=120)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sizes", nargs="+", default=["10x20", "20x40", "30x60", "40x80"])
+    args = parser.parse_args()
+
+    reference = None
+    for field_size in map(parse_size, args.sizes):
+        positions, move_count, generation_s, evaluation_s, game = play_game(field_size, args.pieces, args.seed)
+        generation_us = generation_s / positions * 1e6
+        evaluation_us = evaluation_s / positions * 1e6
+        if reference is None:
+            reference = (generation_us, evaluation_us)
+        print(
+            f"{field_size[0]:>3}x{field_size[1]:<3} {positions:4d} positions  {move_count / positions:5.1f} moves each  "
+            f"generation {generation_us:8.1f} us ({generation_us / reference[0]:5.1f}x)  "
+            f"evaluation {evaluation_us:9.1f} us ({evaluation_us / reference[1]:5.1f}x, "
+            f"{evaluation_s / move_count * 1e6:6.1f} us per move)  lines {game.lines_cleared}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""Input-to-photon latency when key presses are read at the frame boundary compared with the KeyDispatch wait.
+
+Run with `python benchmark_input.py [--presses 300] [--work-ms 4]`. A thread
+posts left/right key presses at random moments. Each press is tagged with the
+time it was posted, so the true latency is measured from that time to the
+flip that first shows the move. Each frame updates and draws one solo board
+and busy-waits --work-ms more to stand in for a heavier frame. The frame-boundary loop
+is the old one: take the events, update, clock.tick(FPS), draw. The
+dispatch loop uses KeyDispatch and wait_for_frame(). It also prints what its
+own perf_counter stamps report, which is the number that goes into telemetry.
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame as pg
+
+from settings import FPS, TILE_SIZE, WIN_RES, BACKGROUND_COLOUR, SOLO_CONTROLS
+from TetrisGame import Tetris
+from controls import KeyDispatch
+from display import set_display_mode, load_tile_images
+from telemetry import FrameStats
+
+
+class BenchmarkApp:
+    def __init__(self):
+        self.screen = set_display_mode(WIN_RES)
+        self.images = load_tile_images(TILE_SIZE)
+        self.animation_trigger = False
+        self.fast_animation_trigger = False
+        self.clock = pg.time.Clock()
+        self.tetris = Tetris(self, random_seed=0)
+
+    def draw(self, work_ms):
+        busy_until_s = time.perf_counter() + work_ms / 1000.0
+        while time.perf_counter() < busy_until_s:
+            pass
+        self.screen.fill(BACKGROUND_COLOUR)
+        self.tetris.draw()
+        pg.display.flip()
+
+
+class TaggedKeyDispatch(KeyDispatch):
+    """Also keeps the posting time of every press it applies"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.unpresented_posted_s = []
+
+    def handle(self, event, stamp_s):
+        handled = super().handle(event, stamp_s)
+        if handled and event.type == pg.KEYDOWN:
+            self.unpresented_posted_s.append(event.posted_s)
+        return handled
+
+
+def post_presses(press_count, seed, done):
+    rng = random.Random(seed)
+    for _ in range(press_count):
+        time.sleep(rng.uniform(0.03, 0.09))
+        key = SOLO_CONTROLS[rng.choice(("left", "right"))]
+        pg.event.post(pg.event.Event(pg.KEYDOWN, key=key, posted_s=time.perf_counter()))
+        time.sleep(0.01)
+        pg.event.post(pg.event.Event(pg.KEYUP, key=key, posted_s=time.perf_counter()))
+    done.set()
+
+
+def record_presented(true_latency, posted_times):
+    now_s = time.perf_counter()
+    for posted_s in posted_times:
+        true_latency.add((now_s - posted_s) * 1000.0)
+    posted_times.clear()
+
+
+def frame_boundary_loop(app, press_count, seed, work_ms):
+    true_latency = FrameStats()
+    unpresented_posted_s = []
+    done = threading.Event()
+    threading.Thread(target=post_presses, args=(press_count, seed, done), daemon=True).start()
+    while not done.is_set() or pg.event.peek(pg.KEYDOWN):
+        for event in pg.event.get():
+            if event.type == pg.KEYDOWN:
+                app.tetris.control(event.key)
+                unpresented_posted_s.append(event.posted_s)
+        app.tetris.update()
+        app.clock.tick(FPS)
+        app.draw(work_ms)
+        record_presented(true_latency, unpresented_posted_s)
+    return true_latency, None
+
+
+def dispatch_loop(app, press_count, seed, work_ms):
+    true_latency = FrameStats()
+    dispatch = TaggedKeyDispatch([SOLO_CONTROLS], lambda board_index, action: app.tetris.handle_action(action))
+    done = threading.Event()
+    threading.Thread(target=post_presses, args=(press_count, seed, done), daemon=True).start()
+    while not done.is_set() or pg.event.peek(pg.KEYDOWN) or dispatch.deferred_events:
+        stamp_s = time.perf_counter()
+        for event in dispatch.take_events(pg.event.get()):
+            dispatch.handle(event, stamp_s)
+        app.tetris.update()
+        dispatch.wait_for_frame(app.clock, FPS)
+        app.draw(work_ms)
+        dispatch.presented()
+        record_presented(true_latency, dispatch.unpresented_posted_s)
+    return true_latency, dispatch.latency
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--presses", type=int, default=300)
+    parser.add_argument("--work-ms", type=float, default=4.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    pg.init()
+    print(f"{args.presses} presses, {FPS} fps cap, {args.work_ms:g} ms of extra work per frame")
+    app = BenchmarkApp()
+    for label, loop in (("frame boundary", frame_boundary_loop), ("key dispatch", dispatch_loop)):
+        app.tetris = Tetris(app, random_seed=args.seed)
+        true_latency, stamped_latency = loop(app, args.presses, args.seed, args.work_ms)
+        percentiles = true_latency.percentiles("samples")
+        line = (
+            f"{label:<15} p50 {percentiles['p50_ms']:6.2f} ms  p90 {percentiles['p90_ms']:6.2f} ms  "
+            f"p99 {percentiles['p99_ms']:6.2f} ms  max {percentiles['max_ms']:6.2f} ms  ({percentiles['samples']} presses)"
+        )
+        if stamped_latency is not None:
+            stamped = stamped_latency.percentiles("samples")
+            line += f"\n{'':<15} stamped by KeyDispatch: p50 {stamped['p50_ms']:6.2f} ms  p99 {stamped['p99_ms']:6.2f} ms"
+        print(line)
+    pg.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
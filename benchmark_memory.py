@@ -0,0 +1,122 @@
+"""Memory benchmark for the game engine and CPU agents.
+
+Run with `python benchmark_memory.py`. Reports bytes per live game, per board
+snapshot and per AI decision using tracemalloc, then plays a long headless
+arena session to check memory stays flat. Exits with status 1 when any number
+goes over its budget.
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame as pg
+
+from TetrisGame import Tetris, SimulationApp
+from ai_difficulty import MediumAI
+
+
+MEMORY_BUDGETS_BYTES = {
+    "live_game": 16 * 1024,
+    "snapshot": 8 * 1024,
+    "ai_decision_peak": 64 * 1024,
+    "arena_growth": 64 * 1024,
+}
+
+
+def traced_bytes():
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def measure_live_game(sample_count):
+    start_bytes = traced_bytes()
+    games = [Tetris(SimulationApp([]), random_seed=index) for index in range(sample_count)]
+    used_bytes = traced_bytes() - start_bytes
+    del games
+    return used_bytes / sample_count
+
+
+def measure_snapshot(game, sample_count):
+    start_bytes = traced_bytes()
+    snapshots = [game.clone() for _ in range(sample_count)]
+    used_bytes = traced_bytes() - start_bytes
+    del snapshots
+    return used_bytes / sample_count
+
+
+def measure_ai_decision(game, sample_count):
+    agent = MediumAI()
+    peak_total = 0
+    for _ in range(sample_count):
+        start_bytes = traced_bytes()
+        tracemalloc.reset_peak()
+        agent.choose_move(game)
+        peak_total += tracemalloc.get_traced_memory()[1] - start_bytes
+    return peak_total / sample_count
+
+
+def play_arena(games, agents, decisions_per_board):
+    for _ in range(decisions_per_board):
+        for board_index, game in enumerate(games):
+            if game.game_over_flag:
+                games[board_index] = game = Tetris(SimulationApp([]), is_simulation=True)
+            chosen_move = agents[board_index].choose_move(game)
+            if chosen_move:
+                game.apply_ai_move(chosen_move)
+            else:
+                game.game_over_flag = True
+
+
+def measure_arena_growth(board_count, decisions_per_board, rounds=4):
+    """Plays several arena rounds with the same agents and compares memory between them.
+
+    Boards start fresh each round so the result is not skewed by how tall the
+    stacks happen to be; anything the session keeps hold of shows up as growth.
+    """
+    agents = [MediumAI() for _ in range(board_count)]
+    round_bytes = []
+    for round_index in range(rounds):
+        games = [
+            Tetris(SimulationApp([]), is_simulation=True, random_seed=round_index * board_count + index)
+            for index in range(board_count)
+        ]
+        play_arena(games, agents, decisions_per_board)
+        del games
+        round_bytes.append(traced_bytes())
+    return round_bytes[-1] - round_bytes[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=50)
+    parser.add_argument("--boards", type=int, default=8)
+    parser.add_argument("--decisions", type=int, default=40)
+    args = parser.parse_args()
+
+    pg.init()
+    tracemalloc.start()
+
+    game = Tetris(SimulationApp([]), is_simulation=True, random_seed=1)
+    results = {
+        "live_game": measure_live_game(args.samples),
+        "snapshot": measure_snapshot(game, args.samples),
+        "ai_decision_peak": measure_ai_decision(game, min(args.samples, 10)),
+        "arena_growth": measure_arena_growth(args.boards, args.decisions),
+    }
+
+    over_budget = False
+    for name, used_bytes in results.items():
+        budget_bytes = MEMORY_BUDGETS_BYTES[name]
+        status = "ok" if used_bytes <= budget_bytes else "OVER BUDGET"
+        over_budget = over_budget or used_bytes > budget_bytes
+        print(f"{name:18} {used_bytes:12,.0f} B   budget {budget_bytes:10,} B   {status}")
+
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""Frames per second of the Surface and texture drawing backends for 1, 2 and 3 boards.
+
+Run with `python benchmark_render.py [--frames 1500] [--backends surface software texture]`.
+Every backend replays the same seeded games, with the medium CPU placing
+each piece, and draws as fast as it can (no frame cap). Whole-frame rates
+include the simulation and CPU moves, which cost the same for every backend;
+the drawing-alone rate times only clearing, drawing and presenting. software
+is the texture backend on SDL's software renderer, which also runs headless;
+texture asks SDL for an accelerated renderer and falls back to software when
+there is none.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame as pg
+
+from settings import FIELD_W, FIELD_H, TILE_SIZE, BACKGROUND_COLOUR, RENDERER_SURFACE, RENDERER_TEXTURE, RENDERER_SOFTWARE, vec
+from TetrisGame import Tetris
+from ai_difficulty import MediumAI
+from display import set_display_mode, load_tile_images
+from texture_render import TextureRenderer
+
+
+GRAVITY_FRAMES = 6
+BOARD_STRIDE_TILES = FIELD_W + 8
+
+
+class BenchmarkApp:
+    def __init__(self, board_count, images):
+        self.images = images
+        self.animation_trigger = False
+        self.fast_animation_trigger = False
+        self.games = [
+            Tetris(self, offset_tiles=vec(1 + board_index * BOARD_STRIDE_TILES, 2), random_seed=board_index)
+            for board_index in range(board_count)
+        ]
+        self.agents = [MediumAI() for _ in self.games]
+        for agent in self.agents:
+            agent.uses_book = False
+            agent.speculates = False
+        self.placed = [-1] * board_count
+        self.score_font = pg.font.Font(None, 36)
+
+    def step(self, frame):
+        self.animation_trigger = frame % GRAVITY_FRAMES == 0
+        for board_index, game in enumerate(self.games):
+            if game.game_over_flag:
+                self.games[board_index] = game = Tetris(self, offset_tiles=game.offset_tiles, random_seed=frame)
+                self.placed[board_index] = -1
+            if self.placed[board_index] != game.pieces_locked and game.tetromino.pos.y >= 3:
+                self.placed[board_index] = game.pieces_locked
+                game.apply_ai_move(self.agents[board_index].choose_move(game))
+            game.update()
+
+    def score_labels(self):
+        return [
+            (f"Score: {game.score}", (int(game.offset_tiles.x * TILE_SIZE), TILE_SIZE // 2))
+            for game in self.games
+        ]
+
+
+def window_size(board_count):
+    return (BOARD_STRIDE_TILES * board_count * TILE_SIZE, (FIELD_H + 3) * TILE_SIZE)
+
+
+def run_surface(board_count, frame_count):
+    screen = set_display_mode(window_size(board_count))
+    app = BenchmarkApp(board_count, load_tile_images(TILE_SIZE))
+    app.screen = screen
+    start_s = time.perf_counter()
+    draw_s = 0.0
+    for frame in range(frame_count):
+        app.step(frame)
+        draw_start_s = time.perf_counter()
+        screen.fill(BACKGROUND_COLOUR)
+        for game in app.games:
+            game.draw()
+        for text, position in app.score_labels():
+            screen.blit(app.score_font.render(text, True, (150, 255, 150)), position)
+        pg.display.flip()
+        draw_s += time.perf_counter() - draw_start_s
+    return frame_count / (time.perf_counter() - start_s), frame_count / draw_s, None
+
+
+def run_texture(board_count, frame_count, software):
+    set_display_mode((64, 64))
+    images = load_tile_images(TILE_SIZE)
+    renderer = TextureRenderer(window_size(board_count), "Render benchmark", images, software=software)
+    app = BenchmarkApp(board_count, images)
+    try:
+        start_s = time.perf_counter()
+        draw_s = 0.0
+        for frame in range(frame_count):
+            app.step(frame)
+            draw_start_s = time.perf_counter()
+            renderer.clear(BACKGROUND_COLOUR)
+            for game in app.games:
+                game.draw_textures(renderer)
+            for text, position in app.score_labels():
+                renderer.draw_text(app.score_font, text, (150, 255, 150), topleft=position)
+            renderer.present()
+            draw_s += time.perf_counter() - draw_start_s
+        frames_per_second = frame_count / (time.perf_counter() - start_s)
+    finally:
+        renderer.close()
+    return frames_per_second, frame_count / draw_s, renderer
+
+
+def run_child(backend, board_count, frame_count):
+    pg.init()
+    if backend == RENDERER_SURFACE:
+        frames_per_second, draw_per_second, renderer = run_surface(board_count, frame_count)
+    else:
+        frames_per_second, draw_per_second, renderer = run_texture(board_count, frame_count, software=backend == RENDERER_SOFTWARE)
+    print(json.dumps({
+        "fps": frames_per_second,
+        "draw_fps": draw_per_second,
+        "renderer": renderer.backend if renderer else RENDERER_SURFACE,
+        "uploads": renderer.uploads if renderer else 0,
+    }))
+    pg.quit()
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=1500)
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        default=[RENDERER_SURFACE, RENDERER_SOFTWARE, RENDERER_TEXTURE],
+        choices=[RENDERER_SURFACE, RENDERER_SOFTWARE, RENDERER_TEXTURE],
+    )
+    parser.add_argument("--child", nargs=2, metavar=("BACKEND", "BOARDS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return run_child(args.child[0], int(args.child[1]), args.frames)
+
+    print(f"video driver {os.environ['SDL_VIDEODRIVER']}, {args.frames} frames per run")
+    for board_count in (1, 2, 3):
+        for backend in args.backends:
+            # A fresh process per run, so every surface run gets the same SCALED window setup
+            completed = subprocess.run(
+                [sys.executable, __file__, "--frames", str(args.frames), "--child", backend, str(board_count)],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            report = json.loads(completed.stdout.strip().splitlines()[-1])
+            details = f"  ({report['renderer']} renderer, {report['uploads']} texture uploads)" if backend != RENDERER_SURFACE else ""
+            print(
+                f"{board_count} board{'s' if board_count > 1 else ' '}  {backend:<8} {report['fps']:8.1f} fps  "
+                f"drawing alone {report['draw_fps']:8.1f} fps{details}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
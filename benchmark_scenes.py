@@ -0,0 +1,77 @@
+"""Times menu-to-menu transitions with a set_mode per screen against the scene manager.
+
+Run with `python benchmark_scenes.py [--transitions 200]`. Each transition opens
+a menu-sized screen and draws its gradient background and title once, the way
+the menus do on entry.
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame as pg
+
+from settings import MENU_RES
+from display import set_display_mode
+from scenes import Scene, SceneManager
+from telemetry import FrameStats
+
+MENU_COLOURS = [((20, 20, 40), (40, 20, 60)), ((20, 25, 40), (35, 20, 50))]
+
+
+def draw_menu(screen, background, font):
+    screen.blit(background, (0, 0))
+    screen.blit(font.render("TETRIS", True, (255, 215, 100)), (560, 80))
+    pg.display.flip()
+
+
+def per_screen_transitions(transition_count):
+    transition_stats = FrameStats()
+    for transition in range(transition_count):
+        transition_start_s = time.perf_counter()
+        screen = set_display_mode(MENU_RES)
+        pg.display.set_caption(f"Screen {transition % 2}")
+        # What every menu used to do on entry: a fresh gradient and fresh fonts
+        top_colour, bottom_colour = MENU_COLOURS[transition % 2]
+        manager = SceneManager()
+        draw_menu(screen, manager.background(*MENU_RES, top_colour, bottom_colour), manager.font(100))
+        transition_stats.add((time.perf_counter() - transition_start_s) * 1000.0)
+    return transition_stats
+
+
+def scene_manager_transitions(transition_count):
+    manager = SceneManager()
+    manager.push(Scene("Main Menu"))
+    transition_stats = FrameStats()
+    for transition in range(transition_count):
+        transition_start_s = time.perf_counter()
+        if transition % 2 == 0:
+            manager.push(Scene("Sub Menu"))
+        else:
+            manager.pop()
+        top_colour, bottom_colour = MENU_COLOURS[transition % 2]
+        draw_menu(manager.screen, manager.background(*MENU_RES, top_colour, bottom_colour), manager.font(100))
+        transition_stats.add((time.perf_counter() - transition_start_s) * 1000.0)
+    return transition_stats, manager.mode_changes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--transitions", type=int, default=200)
+    args = parser.parse_args()
+
+    pg.init()
+    old_stats = per_screen_transitions(args.transitions)
+    new_stats, mode_changes = scene_manager_transitions(args.transitions)
+    for label, stats in (("set_mode per screen", old_stats), ("scene manager", new_stats)):
+        percentiles = stats.percentiles()
+        print(f"{label:<20} p50 {percentiles['p50_ms']:7.3f} ms  p99 {percentiles['p99_ms']:7.3f} ms")
+    print(f"scene manager mode changes: {mode_changes} over {args.transitions} transitions")
+    pg.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
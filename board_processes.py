@@ -0,0 +1,645 @@
+"""Runs each versus board, CPU agent included, in its own process while the match window only reads and draws.
+
+Every worker steps one simulated board at FPS and, after each tick, publishes a
+compact snapshot into its slot of a shared memory block: scores, flags, the
+current and next piece and one byte per cell. A slot is guarded by a sequence
+counter that is odd while the worker is writing, so the window copies a slot and
+keeps the copy only if the counter did not move. Key presses travel to the
+worker over a pipe as (sequence, action); the snapshot carries the last
+sequence applied, which is how the window measures input latency.
+
+Turned on with TETRIS_BOARD_PROCESSES=1. Boards in this mode are not autosaved.
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import struct
+import sys
+import time
+from collections import deque
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional
+
+import pygame as pg
+
+from settings import (
+    FIELD_W,
+    FIELD_H,
+    FPS,
+    TILE_SIZE,
+    LEVEL_START,
+    vec,
+    TETROMINOES,
+    ANIMATION_TIME_INTERVAL,
+    FAST_ANIMATION_TIME_INTERVAL,
+    LINE_CLEAR_PHRASES,
+    BOARD_PROCESSES_ENV_VAR,
+    BOARD_PROCESS_START_TIMEOUT_S,
+    BOARD_PROCESS_READ_RETRIES,
+    BOARD_PROCESS_SUMMARY_TIMEOUT_S,
+    EXPECTIMAX_WORKERS,
+)
+from Tetromino import ROTATION_STATES, get_fallback_tile
+from TetrisGame import Tetris, ScorePopup
+from ai_difficulty import get_ai_by_difficulty, set_expectimax_workers, shutdown_expectimax_pool
+from ai_scheduler import AIScheduler
+from telemetry import LatencyHistogram, game_summary, agent_summary
+
+
+SHAPES = list(TETROMINOES.keys())
+SHAPE_CODES = {shape: index + 1 for index, shape in enumerate(SHAPES)}
+CELL_SHAPE_MASK = 0x07
+CELL_IMAGE_SHIFT = 3
+MAX_IMAGE_NUMBER = 0xFF >> CELL_IMAGE_SHIFT
+
+# Slot layout: sequence counter, header, then FIELD_H * FIELD_W cell bytes (shape code | image number << 3)
+SLOT_SEQUENCE = struct.Struct("<I")
+SLOT_HEADER = struct.Struct("<IiiiBBBBBbbBBBbbB")
+SLOT_CELLS_OFFSET = SLOT_SEQUENCE.size + SLOT_HEADER.size
+# Whole cache lines per slot, so two workers never write to the same line
+SLOT_SIZE = (SLOT_CELLS_OFFSET + FIELD_W * FIELD_H + 63) // 64 * 64
+
+NO_PIECE = (0, 0, 0, 0, 0)
+
+
+def board_processes_from(environ) -> bool:
+    return environ.get(BOARD_PROCESSES_ENV_VAR, "").strip() not in ("", "0")
+
+
+def cell_tile(app_images, cell_code):
+    image_number = cell_code >> CELL_IMAGE_SHIFT
+    if image_number and image_number <= len(app_images):
+        return app_images[image_number - 1]
+    return get_fallback_tile(SHAPES[(cell_code & CELL_SHAPE_MASK) - 1])
+
+
+class WorkerApp:
+    """Stands in for the match window inside a worker; gravity triggers are set by the worker's clock.
+
+    images holds one placeholder surface per window tile, so pieces pick their
+    tile the same way they do in the window and the tile's number is what gets published.
+    """
+
+    __slots__ = ("images", "image_numbers", "animation_trigger", "fast_animation_trigger")
+
+    def __init__(self, image_count):
+        self.images = [pg.Surface((1, 1)) for _ in range(min(image_count, MAX_IMAGE_NUMBER))]
+        self.image_numbers = {image: number for number, image in enumerate(self.images, start=1)}
+        self.animation_trigger = False
+        self.fast_animation_trigger = False
+
+
+class WorkerBoard(Tetris):
+    """A simulated board whose locked cells remember the tile they were drawn with"""
+
+    def locked_cell(self, block):
+        return SHAPE_CODES[self.tetromino.shape] | self.app.image_numbers.get(self.tetromino.image, 0) << CELL_IMAGE_SHIFT
+
+
+class BoardWorker:
+    def __init__(self, buffer, board_index, seed, image_count, cpu_difficulty, show_ghost, connection):
+        self.buffer = buffer
+        self.slot_offset = board_index * SLOT_SIZE
+        self.connection = connection
+        self.show_ghost = show_ghost
+        self.app = WorkerApp(image_count)
+        self.game = WorkerBoard(self.app, is_simulation=True, random_seed=seed)
+
+        self.agent = None
+        self.scheduler = None
+        self.decision_latency = LatencyHistogram()
+        if cpu_difficulty:
+            self.agent = get_ai_by_difficulty(cpu_difficulty)
+            self.scheduler = AIScheduler()
+            self.scheduler.add_agent(board_index, self.game, self.agent, cpu_difficulty)
+
+        self.sequence = 0
+        self.input_sequence = 0
+        self.published_board_version = None
+        self.fall_ms = 0.0
+        self.fast_fall_ms = 0.0
+        self.active_ms = 0.0
+        self.finished_sent = False
+
+    def apply_input(self, action):
+        if self.game.game_over_flag:
+            return
+        if action == "release":
+            self.game.speed_up = False
+        else:
+            self.game.handle_action(action)
+
+    def handle_messages(self) -> bool:
+        """Applies queued inputs; returns False once the window asks the worker to stop"""
+        while self.connection.poll():
+            message = self.connection.recv()
+            command = message[0]
+            if command == "input":
+                _, self.input_sequence, action = message
+                self.apply_input(action)
+            elif command == "pause":
+                self.game.speed_up = False
+                if not self.wait_for_resume():
+                    return False
+            elif command == "close":
+                return False
+        return True
+
+    def wait_for_resume(self) -> bool:
+        while True:
+            command = self.connection.recv()[0]
+            if command == "resume":
+                return True
+            if command == "close":
+                return False
+
+    def tick(self, frame_ms):
+        game = self.game
+        if game.game_over_flag:
+            return
+        self.active_ms += frame_ms
+        self.fall_ms += frame_ms
+        self.fast_fall_ms += frame_ms
+        self.app.animation_trigger = self.fall_ms >= ANIMATION_TIME_INTERVAL
+        if self.app.animation_trigger:
+            self.fall_ms -= ANIMATION_TIME_INTERVAL
+        self.app.fast_animation_trigger = self.fast_fall_ms >= FAST_ANIMATION_TIME_INTERVAL
+        if self.app.fast_animation_trigger:
+            self.fast_fall_ms -= FAST_ANIMATION_TIME_INTERVAL
+
+        if self.scheduler is not None:
+            for slot, chosen_move in self.scheduler.update(frame_ms):
+                self.decision_latency.add(slot.spent_ms)
+                if chosen_move:
+                    game.apply_ai_move(chosen_move)
+        game.update()
+
+    def piece_fields(self, tetromino):
+        if tetromino is None or not tetromino.blocks:
+            return NO_PIECE
+        shape, rotation, pivot_x, pivot_y, _ = self.game.piece_state(tetromino)
+        return SHAPE_CODES[shape], rotation, pivot_x, pivot_y, self.app.image_numbers.get(tetromino.image, 0)
+
+    def publish(self):
+        game = self.game
+        ghost_drop = 0
+        if self.show_ghost and not game.game_over_flag:
+            ghost_drop = max(0, game.get_drop_distance(game.tetromino))
+
+        slot_offset = self.slot_offset
+        self.sequence += 1
+        SLOT_SEQUENCE.pack_into(self.buffer, slot_offset, self.sequence)
+        SLOT_HEADER.pack_into(
+            self.buffer,
+            slot_offset + SLOT_SEQUENCE.size,
+            self.input_sequence,
+            game.score,
+            game.lines_cleared,
+            game.pieces_locked,
+            game.game_over_flag,
+            game.speed_up,
+            ghost_drop,
+            *self.piece_fields(game.tetromino),
+            *self.piece_fields(game.next_tetromino),
+        )
+        if game.board_version != self.published_board_version:
+            self.published_board_version = game.board_version
+            cells_offset = slot_offset + SLOT_CELLS_OFFSET
+            for grid_y, row in enumerate(game.field_array):
+                row_offset = cells_offset + grid_y * FIELD_W
+                self.buffer[row_offset:row_offset + FIELD_W] = bytes(row)
+        self.sequence += 1
+        SLOT_SEQUENCE.pack_into(self.buffer, slot_offset, self.sequence)
+
+    def summary(self) -> Dict:
+        result = game_summary(self.game, self.active_ms)
+        if self.agent is not None:
+            result.update(agent_summary(self.agent, self.decision_latency))
+        return result
+
+    def run(self):
+        frame_s = 1.0 / FPS
+        last_tick_s = time.perf_counter()
+        next_frame_s = last_tick_s
+        while self.handle_messages():
+            now_s = time.perf_counter()
+            # A pause blocks in handle_messages, so cap the step rather than replay the time spent paused
+            frame_ms = min((now_s - last_tick_s) * 1000.0, 4 * frame_s * 1000.0)
+            last_tick_s = now_s
+            self.tick(frame_ms)
+            if self.game.game_over_flag and not self.finished_sent:
+                # Sent before the flag is published, so the window always finds it waiting
+                self.connection.send(("finished", self.summary()))
+                self.finished_sent = True
+            self.publish()
+
+            next_frame_s += frame_s
+            delay_s = next_frame_s - time.perf_counter()
+            if delay_s > 0:
+                time.sleep(delay_s)
+            else:
+                next_frame_s = time.perf_counter()
+
+
+def run_board_worker(memory_name, board_index, seed, image_count, cpu_difficulty, show_ghost, connection, expectimax_workers):
+    memory = shared_memory.SharedMemory(name=memory_name)
+    set_expectimax_workers(expectimax_workers)
+    try:
+        worker = BoardWorker(memory.buf, board_index, seed, image_count, cpu_difficulty, show_ghost, connection)
+        worker.publish()
+        connection.send(("ready",))
+        worker.run()
+    finally:
+        worker = None
+        shutdown_expectimax_pool()
+        memory.close()
+
+
+class BoardView:
+    """The window's side of a board running in a worker: the fields MatchApp reads, inputs, and drawing"""
+
+    def __init__(self, app, board_index, offset_tiles, buffer, connection, show_ghost, process=None):
+        self.app = app
+        self.board_index = board_index
+        self.process = process
+        self.offset_tiles = offset_tiles
+        self.buffer = buffer
+        self.slot_offset = board_index * SLOT_SIZE
+        self.connection = connection
+        self.show_ghost = show_ghost
+
+        self.score = 0
+        self.lines_cleared = 0
+        self.level = LEVEL_START
+        self.pieces_locked = 0
+        self.game_over_flag = False
+        self.speed_up = False
+        self.ghost_drop = 0
+        self.piece = NO_PIECE
+        self.next_piece = NO_PIECE
+        self.cells = bytearray(FIELD_W * FIELD_H)
+        self.incoming_cells = bytearray(FIELD_W * FIELD_H)
+        self.snapshot_sequence = None
+        self.torn_reads = 0
+
+        self.input_sequence = 0
+        self.inputs_in_flight = deque()
+        self.input_latency = LatencyHistogram()
+        self.finished_summary: Optional[Dict] = None
+        self.worker_lost = False
+
+        self.popups = []
+        self.popup_pool = []
+        self.popup_font = pg.font.Font(None, 42)
+
+    def send_input(self, action):
+        self.input_sequence += 1
+        self.inputs_in_flight.append((self.input_sequence, time.perf_counter()))
+        try:
+            self.connection.send(("input", self.input_sequence, action))
+        except OSError:
+            # The worker is gone; update() ends the board
+            pass
+
+    def read_snapshot(self) -> bool:
+        buffer = self.buffer
+        slot_offset = self.slot_offset
+        cells_offset = slot_offset + SLOT_CELLS_OFFSET
+        for _ in range(BOARD_PROCESS_READ_RETRIES):
+            sequence = SLOT_SEQUENCE.unpack_from(buffer, slot_offset)[0]
+            if sequence == self.snapshot_sequence:
+                return False
+            if sequence & 1:
+                self.torn_reads += 1
+                continue
+            header = SLOT_HEADER.unpack_from(buffer, slot_offset + SLOT_SEQUENCE.size)
+            self.incoming_cells[:] = buffer[cells_offset:cells_offset + FIELD_W * FIELD_H]
+            if SLOT_SEQUENCE.unpack_from(buffer, slot_offset)[0] != sequence:
+                self.torn_reads += 1
+                continue
+            self.cells, self.incoming_cells = self.incoming_cells, self.cells
+            self.snapshot_sequence = sequence
+            self.apply_header(header)
+            return True
+        return False
+
+    def apply_header(self, header):
+        acknowledged_sequence, score, lines_cleared, pieces_locked, game_over, speed_up, self.ghost_drop = header[:7]
+        self.piece = header[7:12]
+        self.next_piece = header[12:17]
+
+        if lines_cleared > self.lines_cleared and score > self.score:
+            phrase = LINE_CLEAR_PHRASES.get(lines_cleared - self.lines_cleared, "")
+            popup_text = f"+{score - self.score}"
+            if phrase:
+                popup_text = f"{popup_text}  {phrase}"
+            self.show_popup(popup_text, (FIELD_W // 2 - 1, FIELD_H // 2))
+        self.score = score
+        self.lines_cleared = lines_cleared
+        self.pieces_locked = pieces_locked
+        self.speed_up = bool(speed_up)
+
+        now_s = time.perf_counter()
+        while self.inputs_in_flight and self.inputs_in_flight[0][0] <= acknowledged_sequence:
+            self.input_latency.add((now_s - self.inputs_in_flight.popleft()[1]) * 1000.0)
+
+        if game_over and not self.game_over_flag:
+            self.receive_summary()
+        self.game_over_flag = bool(game_over)
+
+    def receive_summary(self):
+        while self.finished_summary is None:
+            try:
+                if not self.connection.poll(BOARD_PROCESS_SUMMARY_TIMEOUT_S):
+                    raise EOFError("no summary")
+                message = self.connection.recv()
+            except (EOFError, OSError):
+                self.lose_worker()
+                return
+            if message[0] == "finished":
+                self.finished_summary = message[1]
+
+    def lose_worker(self):
+        """Ends a board whose worker died, keeping the score it last published"""
+        exit_code = self.process.exitcode if self.process is not None else None
+        print(f"[Board] Worker for board {self.board_index} stopped (exit code {exit_code}), ending that board")
+        self.worker_lost = True
+        self.game_over_flag = True
+        self.speed_up = False
+        self.finished_summary = {
+            "score": self.score,
+            "lines_cleared": self.lines_cleared,
+            "pieces_locked": self.pieces_locked,
+            "worker_lost": True,
+        }
+
+    def show_popup(self, text, tile_pos):
+        if self.popup_pool:
+            popup = self.popup_pool.pop()
+            popup.reset(text, tile_pos)
+        else:
+            popup = ScorePopup(self, text, tile_pos)
+        self.popups.append(popup)
+
+    def update(self):
+        if self.popups:
+            kept_count = 0
+            for popup in self.popups:
+                if popup.update():
+                    self.popups[kept_count] = popup
+                    kept_count += 1
+                else:
+                    self.popup_pool.append(popup)
+            del self.popups[kept_count:]
+        self.read_snapshot()
+        if not self.game_over_flag and self.process is not None and not self.process.is_alive():
+            # Take anything it published on its way out before ending the board
+            self.read_snapshot()
+            if not self.game_over_flag:
+                self.lose_worker()
+
+    def draw_piece(self, piece, screen, images):
+        for tile, pixel_x, pixel_y in self.piece_tiles(piece, images):
+            screen.blit(tile, (pixel_x, pixel_y))
+
+    def draw(self):
+        screen = self.app.screen
+        images = self.app.images
+        offset_x, offset_y = self.offset_tiles.x, self.offset_tiles.y
+        for grid_x in range(FIELD_W):
+            for grid_y in range(FIELD_H):
+                pg.draw.rect(
+                    screen,
+                    (50, 70, 110),
+                    ((grid_x + offset_x) * TILE_SIZE, (grid_y + offset_y) * TILE_SIZE, TILE_SIZE, TILE_SIZE),
+                    1,
+                )
+
+        shape_code, rotation, pivot_x, pivot_y, _ = self.piece
+        if self.show_ghost and shape_code and self.ghost_drop > 0 and not self.game_over_flag:
+            for offset_x_cells, offset_y_cells in ROTATION_STATES[SHAPES[shape_code - 1]][rotation]:
+                grid_y = pivot_y + offset_y_cells + self.ghost_drop
+                if grid_y >= 0:
+                    pg.draw.rect(
+                        screen,
+                        (200, 200, 220),
+                        (
+                            (pivot_x + offset_x_cells + offset_x) * TILE_SIZE,
+                            (grid_y + offset_y) * TILE_SIZE,
+                            TILE_SIZE,
+                            TILE_SIZE,
+                        ),
+                        2,
+                    )
+
+        cells = self.cells
+        for grid_y in range(FIELD_H):
+            row_start = grid_y * FIELD_W
+            for grid_x in range(FIELD_W):
+                cell_code = cells[row_start + grid_x]
+                if cell_code:
+                    screen.blit(cell_tile(images, cell_code), ((grid_x + offset_x) * TILE_SIZE, (grid_y + offset_y) * TILE_SIZE))
+
+        self.draw_piece(self.piece, screen, images)
+        self.draw_piece(self.next_piece, screen, images)
+
+        for popup in self.popups:
+            popup.draw(screen, self.popup_font)
+
+    def piece_tiles(self, piece, images):
+        """(tile, pixel x, pixel y) for each block of a published piece"""
+        shape_code, rotation, pivot_x, pivot_y, image_number = piece
+        if not shape_code:
+            return []
+        tile = cell_tile(images, shape_code | image_number << CELL_IMAGE_SHIFT)
+        return [
+            (tile, (pivot_x + offset_x + self.offset_tiles.x) * TILE_SIZE, (pivot_y + offset_y + self.offset_tiles.y) * TILE_SIZE)
+            for offset_x, offset_y in ROTATION_STATES[SHAPES[shape_code - 1]][rotation]
+        ]
+
+    def draw_textures(self, renderer):
+        images = self.app.images
+        offset_x, offset_y = self.offset_tiles.x, self.offset_tiles.y
+        renderer.draw_grid(self.offset_tiles)
+
+        shape_code, rotation, pivot_x, pivot_y, _ = self.piece
+        if self.show_ghost and shape_code and self.ghost_drop > 0 and not self.game_over_flag:
+            for offset_x_cells, offset_y_cells in ROTATION_STATES[SHAPES[shape_code - 1]][rotation]:
+                grid_y = pivot_y + offset_y_cells + self.ghost_drop
+                if grid_y >= 0:
+                    renderer.draw_ghost_cell((pivot_x + offset_x_cells + offset_x) * TILE_SIZE, (grid_y + offset_y) * TILE_SIZE)
+
+        cells = self.cells
+        for grid_y in range(FIELD_H):
+            row_start = grid_y * FIELD_W
+            for grid_x in range(FIELD_W):
+                cell_code = cells[row_start + grid_x]
+                if cell_code:
+                    renderer.draw_tile(cell_tile(images, cell_code), (grid_x + offset_x) * TILE_SIZE, (grid_y + offset_y) * TILE_SIZE)
+
+        for tile, pixel_x, pixel_y in self.piece_tiles(self.piece, images) + self.piece_tiles(self.next_piece, images):
+            renderer.draw_tile(tile, pixel_x, pixel_y)
+
+        for popup in self.popups:
+            popup.draw_texture(renderer, self.popup_font)
+
+
+class BoardProcesses:
+    """Starts one worker per board and hands MatchApp a BoardView for each"""
+
+    def __init__(self, app, board_specs, cpu_difficulty):
+        """board_specs holds (offset_tiles, is_cpu, show_ghost) per board"""
+        self.memory = shared_memory.SharedMemory(create=True, size=SLOT_SIZE * len(board_specs))
+        self.connections = []
+        self.processes = []
+        self.views: List[BoardView] = []
+
+        # Spawned rather than forked: the window process holds SDL state and I/O threads, and hard CPUs start pools of their own
+        context = multiprocessing.get_context("spawn")
+        # Hard CPUs split the cores between their pools rather than each starting one worker per core
+        expectimax_workers = max(1, (EXPECTIMAX_WORKERS or os.cpu_count() or 1) // len(board_specs))
+        for board_index, (offset_tiles, is_cpu, show_ghost) in enumerate(board_specs):
+            parent_connection, child_connection = context.Pipe()
+            process = context.Process(
+                target=run_board_worker,
+                args=(
+                    self.memory.name,
+                    board_index,
+                    random.getrandbits(32),
+                    len(app.images),
+                    cpu_difficulty if is_cpu else None,
+                    show_ghost,
+                    child_connection,
+                    expectimax_workers,
+                ),
+                name=f"board-{board_index}",
+            )
+            process.start()
+            self.connections.append(parent_connection)
+            self.processes.append(process)
+            self.views.append(BoardView(app, board_index, offset_tiles, self.memory.buf, parent_connection, show_ghost, process))
+
+        for board_index, connection in enumerate(self.connections):
+            if not connection.poll(BOARD_PROCESS_START_TIMEOUT_S):
+                self.close()
+                raise RuntimeError(f"board {board_index} worker did not start")
+            connection.recv()
+        for view in self.views:
+            view.read_snapshot()
+
+    def set_paused(self, paused):
+        for connection in self.connections:
+            try:
+                connection.send(("pause",) if paused else ("resume",))
+            except OSError:
+                pass
+
+    def input_latency(self) -> Dict:
+        merged = LatencyHistogram()
+        for view in self.views:
+            histogram = view.input_latency
+            merged.counts = [total + count for total, count in zip(merged.counts, histogram.counts)]
+            merged.total_count += histogram.total_count
+            merged.total_ms += histogram.total_ms
+            merged.max_ms = max(merged.max_ms, histogram.max_ms)
+        return merged.to_dict()
+
+    def close(self):
+        for connection in self.connections:
+            try:
+                connection.send(("close",))
+            except OSError:
+                pass
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        for view in self.views:
+            view.buffer = None
+        self.views = []
+        self.connections = []
+        self.processes = []
+        if self.memory is not None:
+            self.memory.close()
+            self.memory.unlink()
+            self.memory = None
+
+
+def run_benchmark(seconds, board_count, difficulty):
+    """CPU-only boards run in-process under one AIScheduler, then one worker each; compares pieces placed"""
+    pg.init()
+
+    class BenchmarkApp:
+        def __init__(self):
+            self.screen = pg.display.set_mode((board_count * (FIELD_W + 8) * TILE_SIZE, 22 * TILE_SIZE))
+            self.images = []
+            self.popup_font = pg.font.Font(None, 42)
+            self.animation_trigger = False
+            self.fast_animation_trigger = False
+
+    app = BenchmarkApp()
+    offsets = [vec(1 + board_index * (FIELD_W + 8), 1) for board_index in range(board_count)]
+
+    def frame_loop(games, before_frame):
+        frame_times_ms = []
+        clock = pg.time.Clock()
+        fall_ms = 0.0
+        end_s = time.perf_counter() + seconds
+        while time.perf_counter() < end_s:
+            frame_start_s = time.perf_counter()
+            frame_ms = clock.get_time()
+            fall_ms += frame_ms
+            app.animation_trigger = fall_ms >= ANIMATION_TIME_INTERVAL
+            if app.animation_trigger:
+                fall_ms -= ANIMATION_TIME_INTERVAL
+            before_frame(frame_ms)
+            app.screen.fill((0, 0, 0))
+            for game in games:
+                game.update()
+                game.draw()
+            pg.display.flip()
+            frame_times_ms.append((time.perf_counter() - frame_start_s) * 1000.0)
+            clock.tick(FPS)
+        frame_times_ms.sort()
+        return frame_times_ms[int(len(frame_times_ms) * 0.99)], sum(game.pieces_locked for game in games)
+
+    games = [Tetris(app, offset_tiles=offset, random_seed=board_index) for board_index, offset in enumerate(offsets)]
+    scheduler = AIScheduler()
+    for board_index, game in enumerate(games):
+        scheduler.add_agent(board_index, game, get_ai_by_difficulty(difficulty), difficulty)
+
+    def place_moves(frame_ms):
+        for slot, chosen_move in scheduler.update(frame_ms):
+            if chosen_move:
+                slot.game.apply_ai_move(chosen_move)
+
+    local_p99_ms, local_pieces = frame_loop(games, place_moves)
+    print(f"one process    frame p99 {local_p99_ms:6.2f} ms  pieces placed {local_pieces}")
+
+    processes = BoardProcesses(app, [(offset, True, False) for offset in offsets], difficulty)
+    try:
+        worker_p99_ms, worker_pieces = frame_loop(processes.views, lambda frame_ms: None)
+        torn_reads = sum(view.torn_reads for view in processes.views)
+    finally:
+        processes.close()
+        shutdown_expectimax_pool()
+    print(f"board workers  frame p99 {worker_p99_ms:6.2f} ms  pieces placed {worker_pieces}  retried reads {torn_reads}")
+    print(f"{board_count} {difficulty} CPUs for {seconds:g}s on {os.cpu_count()} cores")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CPU boards in worker processes against one process")
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--boards", type=int, default=3)
+    parser.add_argument("--difficulty", default="hard", choices=("easy", "medium", "hard"))
+    args = parser.parse_args()
+    return run_benchmark(args.seconds, args.boards, args.difficulty)
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    sys.exit(main())
@@ -0,0 +1,301 @@
+"""Headless game server for external bots over a Unix socket or loopback TCP.
+
+Each connection can run many seeded games. The protocol is one ASCII line per
+request and one per reply, and requests may be pipelined:
+
+  NEW [seed]                 start a game, replies with its state
+  STATE <id>                 current state
+  MOVES <id>                 legal placements: M <id> <rotations>:<x> ...
+  PLACE <id> <rotations> <x> rotate, shift and hard drop the current piece
+  INPUT <id> <keys>          play keys in order: L/R move, U rotate, D step down, H hard drop
+  RESET <id> [seed]          restart a game in place
+  CLOSE <id>                 end a game: OK <id>
+  PING / STATS
+
+States are sent as
+  S <id> <score> <lines> <level> <pieces> <over> <shape> <rotation> <x> <y> <next> <row0>,...,<row19>
+where each row is a bitmask with bit n set when column n is filled, top row
+first. Errors come back as ERR <message>.
+
+Serve:     python bot_server.py --socket tetris_bot.sock      (or --port 7300 for TCP)
+Self-test: python bot_server.py --selftest --games 16 --moves 20000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import sys
+import threading
+import time
+
+from settings import *
+from TetrisGame import Tetris, SimulationApp
+
+
+class BotGame:
+    """One headless seeded game driven by placements or key presses"""
+
+    def __init__(self, game_id, seed):
+        self.game_id = game_id
+        self.reset(seed)
+
+    def reset(self, seed):
+        self.seed = seed
+        self.tetris = Tetris(SimulationApp([]), is_simulation=True, random_seed=seed)
+
+    def place(self, rotation_count, target_x):
+        if not 0 <= rotation_count < 4 or not 0 <= target_x < FIELD_W:
+            raise ValueError("placement out of range")
+        self.tetris.apply_ai_move((rotation_count, target_x))
+
+    def play_keys(self, keys):
+        tetris = self.tetris
+        for key in keys:
+            if tetris.game_over_flag:
+                return
+            if key == "L":
+                tetris.tetromino.move("left")
+            elif key == "R":
+                tetris.tetromino.move("right")
+            elif key == "U":
+                tetris.tetromino.rotate()
+            elif key == "D":
+                tetris.tetromino.move("down")
+                tetris.check_landing()
+            elif key == "H":
+                drop_distance = tetris.get_drop_distance(tetris.tetromino)
+                for block in tetris.tetromino.blocks:
+                    block.pos.y += drop_distance
+                tetris.tetromino.landing = True
+                tetris.check_landing()
+            else:
+                raise ValueError(f"unknown key {key!r}")
+
+    def state_line(self):
+        tetris = self.tetris
+        rows = ",".join(str(sum(1 << grid_x for grid_x, cell in enumerate(row) if cell)) for row in tetris.field_array)
+        shape, rotation, pivot_x, pivot_y, _ = tetris.piece_state(tetris.tetromino)
+        return (
+            f"S {self.game_id} {tetris.score} {tetris.lines_cleared} {tetris.level} {tetris.pieces_locked} "
+            f"{int(tetris.game_over_flag)} {shape} {rotation} {pivot_x} {pivot_y} {tetris.next_tetromino.shape} {rows}"
+        )
+
+    def moves_line(self):
+        moves = self.tetris.get_possible_moves() if not self.tetris.game_over_flag else []
+        return f"M {self.game_id} " + " ".join(f"{rotation_count}:{target_x}" for rotation_count, target_x in moves)
+
+
+class BotServer:
+    def __init__(self, max_games=BOT_SERVER_MAX_GAMES):
+        self.max_games = max_games
+        self.games = {}
+        self.next_game_id = 1
+        self.moves_played = 0
+        self.connections = 0
+
+    def new_game(self, seed):
+        if len(self.games) >= self.max_games:
+            raise ValueError("too many games")
+        game = BotGame(self.next_game_id, seed)
+        self.games[game.game_id] = game
+        self.next_game_id += 1
+        return game
+
+    def owned_game(self, owned_ids, text):
+        game_id = int(text)
+        if game_id not in owned_ids:
+            raise ValueError(f"no game {game_id} on this connection")
+        return self.games[game_id]
+
+    def handle_line(self, line, owned_ids):
+        parts = line.split()
+        if not parts:
+            return None
+        command = parts[0].upper()
+        try:
+            if command == "PLACE":
+                game = self.owned_game(owned_ids, parts[1])
+                game.place(int(parts[2]), int(parts[3]))
+                self.moves_played += 1
+                return game.state_line()
+            if command == "INPUT":
+                game = self.owned_game(owned_ids, parts[1])
+                game.play_keys(parts[2].upper() if len(parts) > 2 else "")
+                self.moves_played += 1
+                return game.state_line()
+            if command == "STATE":
+                return self.owned_game(owned_ids, parts[1]).state_line()
+            if command == "MOVES":
+                return self.owned_game(owned_ids, parts[1]).moves_line()
+            if command == "NEW":
+                seed = int(parts[1]) if len(parts) > 1 else random.getrandbits(32)
+                game = self.new_game(seed)
+                owned_ids.add(game.game_id)
+                return game.state_line()
+            if command == "RESET":
+                game = self.owned_game(owned_ids, parts[1])
+                game.reset(int(parts[2]) if len(parts) > 2 else game.seed)
+                return game.state_line()
+            if command == "CLOSE":
+                game = self.owned_game(owned_ids, parts[1])
+                owned_ids.discard(game.game_id)
+                del self.games[game.game_id]
+                return f"OK {game.game_id}"
+            if command == "PING":
+                return "PONG"
+            if command == "STATS":
+                return f"STATS games={len(self.games)} moves={self.moves_played} connections={self.connections}"
+            return f"ERR unknown command {command}"
+        except (IndexError, ValueError) as error:
+            return f"ERR {error or 'bad arguments'}"
+
+    async def handle_client(self, reader, writer):
+        owned_ids = set()
+        self.connections += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                reply = self.handle_line(line.decode("ascii", "replace"), owned_ids)
+                if reply is None:
+                    continue
+                writer.write(reply.encode("ascii") + b"\n")
+                # Only wait on the socket when the client has stopped reading, so pipelined requests stay cheap
+                if writer.transport.get_write_buffer_size() > BOT_SERVER_WRITE_BUFFER:
+                    await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for game_id in owned_ids:
+                self.games.pop(game_id, None)
+            self.connections -= 1
+            writer.close()
+
+    async def start(self, socket_path=None, host="127.0.0.1", port=BOT_SERVER_PORT):
+        if socket_path and hasattr(socket, "AF_UNIX"):
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            return await asyncio.start_unix_server(self.handle_client, path=socket_path, limit=BOT_SERVER_LINE_LIMIT)
+        if socket_path:
+            print("[Bot server] Unix sockets are not available here, using loopback TCP")
+        return await asyncio.start_server(self.handle_client, host, port, limit=BOT_SERVER_LINE_LIMIT)
+
+
+class BotClient:
+    """Small blocking client, used by the self-test and as an example for other languages"""
+
+    def __init__(self, socket_path=None, host="127.0.0.1", port=BOT_SERVER_PORT):
+        if socket_path and hasattr(socket, "AF_UNIX"):
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.connect(socket_path)
+        else:
+            self.sock = socket.create_connection((host, port))
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.reader = self.sock.makefile("rb")
+
+    def request(self, line):
+        self.sock.sendall(line.encode("ascii") + b"\n")
+        return self.reader.readline().decode("ascii").rstrip("\n")
+
+    def close(self):
+        self.reader.close()
+        self.sock.close()
+
+
+def parse_state(reply):
+    parts = reply.split()
+    return {
+        "id": int(parts[1]),
+        "score": int(parts[2]),
+        "lines": int(parts[3]),
+        "pieces": int(parts[5]),
+        "over": parts[6] == "1",
+        "rows": [int(row) for row in parts[12].split(",")],
+    }
+
+
+def run_selftest(game_count, move_count, socket_path, seed):
+    server = BotServer()
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+
+    def serve():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(server.start(socket_path))
+        started.set()
+        loop.run_forever()
+
+    threading.Thread(target=serve, name="bot-server", daemon=True).start()
+    started.wait()
+
+    client = BotClient(socket_path)
+    chooser = random.Random(seed)
+    games = {}
+    for game_index in range(game_count):
+        state = parse_state(client.request(f"NEW {seed + game_index}"))
+        games[state["id"]] = (seed + game_index, [])
+
+    start_s = time.perf_counter()
+    moves_sent = 0
+    game_ids = list(games)
+    while moves_sent < move_count:
+        for game_id in game_ids:
+            placement = (chooser.randrange(4), chooser.randrange(FIELD_W))
+            state = parse_state(client.request(f"PLACE {game_id} {placement[0]} {placement[1]}"))
+            games[game_id][1].append(placement)
+            moves_sent += 1
+            if state["over"]:
+                client.request(f"RESET {game_id}")
+                games[game_id][1].clear()
+    elapsed_s = time.perf_counter() - start_s
+
+    mismatches = 0
+    for game_id, (game_seed, placements) in games.items():
+        local_game = BotGame(0, game_seed)
+        for placement in placements:
+            local_game.place(*placement)
+        remote_state = parse_state(client.request(f"STATE {game_id}"))
+        local_state = parse_state(local_game.state_line())
+        if (remote_state["score"], remote_state["rows"]) != (local_state["score"], local_state["rows"]):
+            mismatches += 1
+
+    print(client.request("STATS"))
+    client.close()
+    loop.call_soon_threadsafe(loop.stop)
+    print(f"{moves_sent} placements over {game_count} games in {elapsed_s:.2f}s ({moves_sent / elapsed_s:.0f}/s)")
+    print(f"replayed {len(games)} games locally, {mismatches} mismatched")
+    return 0 if mismatches == 0 else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless Tetris server for external bots")
+    parser.add_argument("--socket", default=None, help="Unix socket path (loopback TCP when omitted)")
+    parser.add_argument("--port", type=int, default=BOT_SERVER_PORT)
+    parser.add_argument("--selftest", action="store_true")
+    parser.add_argument("--games", type=int, default=16)
+    parser.add_argument("--moves", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.selftest:
+        return run_selftest(args.games, args.moves, args.socket, args.seed)
+
+    async def serve_forever():
+        server = BotServer()
+        async with await server.start(args.socket, port=args.port) as listener:
+            where = args.socket if args.socket else f"127.0.0.1:{args.port}"
+            print(f"[Bot server] Listening on {where}")
+            await listener.serve_forever()
+
+    try:
+        asyncio.run(serve_forever())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
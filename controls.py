@@ -0,0 +1,147 @@
+"""Keyboard input for the human boards: one lookup from key to (board, action), auto-repeat and input-to-photon latency.
+
+Every binding goes into one dict when the screen opens, so a key event costs a
+single lookup however many players there are. Held left and right repeat
+DAS_MS after the press and then every ARR_MS. The times count from the key
+press, not in frames, so a short ARR can land several moves in one frame.
+
+wait_for_frame() stands in for clock.tick(FPS). While the frame cap sleeps it
+keeps taking events off the queue. A key press or a due repeat is applied at
+once and ends the wait, and so does a press already applied by
+check_events(), so the change is drawn straight away instead of a frame
+later. Other events are kept for the next check_events().
+
+pygame does not pass on SDL's event timestamps, so each event is stamped with
+perf_counter when it comes off the queue. Latency is measured from that stamp
+to the present that first shows the change. During the frame-cap wait the
+stamp is within about a millisecond of the press. A key pressed while a frame
+is being updated or drawn is stamped only when that frame ends, so its
+latency reads low by up to one frame's work.
+"""
+
+import time
+
+import pygame as pg
+
+from settings import DAS_MS, ARR_MS, REPEATING_ACTIONS
+from telemetry import FrameStats
+
+
+class KeyDispatch:
+    def __init__(self, bindings, apply_action, das_ms: float = DAS_MS, arr_ms: float = ARR_MS, measure_latency: bool = True):
+        """bindings holds one {action: key} mapping per board; apply_action(board_index, action) carries an action out"""
+        self.apply_action = apply_action
+        self.table = {}
+        for board_index, mapping in enumerate(bindings):
+            for action, key in mapping.items():
+                self.table[key] = (board_index, action)
+        self.das_s = das_ms / 1000.0
+        self.arr_s = max(1.0, arr_ms) / 1000.0
+
+        # Repeating keys that are down, oldest first, and per board the one repeating now: [key, action, next repeat]
+        self.held_keys = []
+        self.repeats = {}
+        self.deferred_events = []
+        self.board_changed = False
+        self.frame_start_s = time.perf_counter()
+
+        self.measure_latency = measure_latency
+        self.unpresented_s = []
+        self.latency = FrameStats()
+        self.presses = 0
+        self.repeats_applied = 0
+
+    def handle(self, event, stamp_s: float) -> bool:
+        """Applies a bound key event; returns False for events that are not bound keys"""
+        if event.type != pg.KEYDOWN and event.type != pg.KEYUP:
+            return False
+        binding = self.table.get(event.key)
+        if binding is None:
+            return False
+        board_index, action = binding
+
+        if event.type == pg.KEYDOWN:
+            self.apply_action(board_index, action)
+            self.board_changed = True
+            self.presses += 1
+            if self.measure_latency:
+                self.unpresented_s.append(stamp_s)
+            if action in REPEATING_ACTIONS:
+                if event.key not in self.held_keys:
+                    self.held_keys.append(event.key)
+                self.repeats[board_index] = [event.key, action, stamp_s + self.das_s]
+        elif action == "down":
+            self.apply_action(board_index, "release")
+        elif action in REPEATING_ACTIONS:
+            if event.key in self.held_keys:
+                self.held_keys.remove(event.key)
+            repeat = self.repeats.get(board_index)
+            if repeat is not None and repeat[0] == event.key:
+                del self.repeats[board_index]
+                # Letting go of one direction hands over to the other if it is still held
+                for key in reversed(self.held_keys):
+                    if self.table[key][0] == board_index:
+                        self.repeats[board_index] = [key, self.table[key][1], stamp_s + self.das_s]
+                        break
+        return True
+
+    def repeat(self, now_s: float) -> int:
+        """Applies every repeat due by now_s, catching up on any that fell between frames"""
+        applied = 0
+        for board_index, repeat in self.repeats.items():
+            while repeat[2] <= now_s:
+                self.apply_action(board_index, repeat[1])
+                repeat[2] += self.arr_s
+                applied += 1
+        self.repeats_applied += applied
+        self.board_changed = self.board_changed or applied > 0
+        return applied
+
+    def next_repeat_s(self):
+        return min((repeat[2] for repeat in self.repeats.values()), default=None)
+
+    def release_all(self) -> None:
+        """Forgets held keys, e.g. on pause, so nothing repeats on resume until a key is pressed again"""
+        self.held_keys.clear()
+        self.repeats.clear()
+
+    def take_events(self, new_events):
+        """Events wait_for_frame() kept back, then new_events"""
+        if not self.deferred_events:
+            return new_events
+        events = self.deferred_events + list(new_events)
+        self.deferred_events = []
+        return events
+
+    def wait_for_frame(self, clock, fps: int) -> int:
+        """clock.tick(fps), except that it ends early once a key press or repeat has changed a board"""
+        deadline_s = self.frame_start_s + 1.0 / fps
+        while not self.board_changed:
+            now_s = time.perf_counter()
+            if self.repeat(now_s) or now_s >= deadline_s:
+                break
+            wake_s = min(deadline_s, self.next_repeat_s() or deadline_s)
+            event = pg.event.wait(max(1, int((wake_s - now_s) * 1000.0)))
+            if event.type != pg.NOEVENT and not self.handle(event, time.perf_counter()):
+                self.deferred_events.append(event)
+        self.board_changed = False
+        self.frame_start_s = time.perf_counter()
+        return clock.tick()
+
+    def presented(self) -> None:
+        """Call right after a frame is presented; every press applied before it is now on screen"""
+        if not self.unpresented_s:
+            return
+        now_s = time.perf_counter()
+        for stamp_s in self.unpresented_s:
+            self.latency.add((now_s - stamp_s) * 1000.0)
+        self.unpresented_s.clear()
+
+    def summary(self):
+        return {
+            "presses": self.presses,
+            "repeats": self.repeats_applied,
+            "das_ms": round(self.das_s * 1000.0, 3),
+            "arr_ms": round(self.arr_s * 1000.0, 3),
+            "input_to_photon": self.latency.percentiles("samples") if self.measure_latency else None,
+        }
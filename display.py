@@ -0,0 +1,63 @@
+import os
+import pathlib
+
+import pygame as pg
+
+from settings import DISPLAY_FIT_FRACTION, SPRITE_DIRECTORY_PATH, TILE_SIZE
+
+
+_tile_image_cache = {}
+_display_window = [None]
+
+
+def window_scale(logical_size) -> float:
+    """Largest whole-number scale that fits the desktop, or a fraction below 1 when even 1x does not fit"""
+    desktop_sizes = pg.display.get_desktop_sizes()
+    if not desktop_sizes:
+        return 1.0
+    desktop_width, desktop_height = desktop_sizes[0]
+    scale = min(
+        desktop_width * DISPLAY_FIT_FRACTION / logical_size[0],
+        desktop_height * DISPLAY_FIT_FRACTION / logical_size[1],
+    )
+    return float(int(scale)) if scale >= 1 else scale
+
+
+def set_display_mode(logical_size):
+    """Opens the window at a fixed logical size that SDL scales to the real window.
+
+    Everything is drawn at the logical size, so drawing costs the same on any
+    display. Scaling up uses whole-number factors with nearest-neighbour sampling
+    to keep tiles crisp; a window too big for the desktop is shrunk with linear
+    filtering instead.
+    """
+    logical_size = (int(logical_size[0]), int(logical_size[1]))
+    scale = window_scale(logical_size)
+    os.environ["SDL_RENDER_SCALE_QUALITY"] = "nearest" if scale >= 1 else "linear"
+
+    try:
+        screen = pg.display.set_mode(logical_size, pg.SCALED | pg.RESIZABLE)
+    except pg.error as error:
+        print(f"[Display] Scaled output unavailable ({error}), drawing at the logical size")
+        return pg.display.set_mode(logical_size)
+    if scale < 1:
+        try:
+            from pygame._sdl2.video import Window
+            window = Window.from_display_module()
+            window.size = (int(logical_size[0] * scale), int(logical_size[1] * scale))
+            # Window events refer back to this object, so it has to outlive the call
+            _display_window[0] = window
+        except (ImportError, AttributeError, pg.error) as error:
+            print(f"[Display] Could not shrink the window to fit the desktop: {error}")
+    return screen
+
+
+def load_tile_images(tile_size: int = TILE_SIZE):
+    """Sprite tiles scaled to tile_size; each size is loaded and scaled only once per run"""
+    if tile_size not in _tile_image_cache:
+        # Sorted so an autosave's image indices mean the same sprites next time the game starts
+        sprite_paths = sorted(path for path in pathlib.Path(SPRITE_DIRECTORY_PATH).rglob("*.png") if path.is_file())
+        _tile_image_cache[tile_size] = [
+            pg.transform.scale(pg.image.load(path).convert_alpha(), (tile_size, tile_size)) for path in sprite_paths
+        ]
+    return _tile_image_cache[tile_size]
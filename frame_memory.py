@@ -0,0 +1,169 @@
+"""Per-frame allocation and garbage-collector counters, and an optional GC schedule tied to pieces.
+
+FrameMemory times every collection through gc.callbacks and, once per frame,
+records how many GC-tracked objects the frame left behind (the growth of the
+youngest generation's count) and how far the interpreter's allocated block
+count moved. Setting TETRIS_GC=pieces hands collection to PieceCollector:
+everything alive after start-up is frozen out of the collector with
+gc.freeze(), automatic collection is switched off, and only the youngest
+generation is collected right after a piece locks. That is enough because
+the CPU's search discards its cloned boards as soon as it is done with them
+(SearchAgent.discard_clones), so no cycles get promoted mid-game. The older
+generations are only collected while the game is paused or over, never
+mid-game, since a full collection on the game thread costs more than a frame.
+stop_frame_memory() puts the collector back the way it was.
+"""
+
+import gc
+import sys
+import time
+from typing import Dict
+
+from settings import GC_ENV_VAR, GC_MODE_AUTOMATIC, GC_MODE_PIECES
+from telemetry import LatencyHistogram
+from tracing import tracer
+
+
+GC_PAUSE_BUCKETS_MS = [0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 33]
+GC_SPAN_NAMES = ("gc gen0", "gc gen1", "gc gen2")
+
+
+def gc_mode_from(environ) -> str:
+    configured_mode = environ.get(GC_ENV_VAR, "").strip().lower()
+    if not configured_mode or configured_mode == GC_MODE_AUTOMATIC:
+        return GC_MODE_AUTOMATIC
+    if configured_mode == GC_MODE_PIECES:
+        return GC_MODE_PIECES
+    print(f"[GC] Unknown {GC_ENV_VAR} mode {configured_mode!r}, keeping automatic collection")
+    return GC_MODE_AUTOMATIC
+
+
+class FrameMemory:
+    def __init__(self, gc_mode: str = GC_MODE_AUTOMATIC):
+        self.gc_mode = gc_mode
+        self.gc_pauses = LatencyHistogram(GC_PAUSE_BUCKETS_MS)
+        self.collections = [0, 0, 0]
+        self.collected_objects = 0
+
+        self.frames = 0
+        self.frames_with_gc = 0
+        self.frame_gc_ms = 0.0
+        self.max_frame_gc_ms = 0.0
+        self.objects_total = 0
+        self.objects_max = 0
+        self.blocks_total = 0
+        self.blocks_max = 0
+
+        self.pause_start_s = None
+        self.pause_start_us = 0.0
+        self.pending_objects = 0
+        self.young_count_start = gc.get_count()[0]
+        self.allocated_blocks_start = sys.getallocatedblocks()
+        gc.callbacks.append(self.on_gc)
+
+    def on_gc(self, phase, info):
+        if phase == "start":
+            # A collection resets the young count, so bank what the frame had allocated so far
+            self.pending_objects += gc.get_count()[0] - self.young_count_start
+            self.pause_start_s = time.perf_counter()
+            if tracer is not None:
+                self.pause_start_us = tracer.now_us()
+            return
+
+        if self.pause_start_s is None:
+            return
+        pause_ms = (time.perf_counter() - self.pause_start_s) * 1000.0
+        self.pause_start_s = None
+        generation = info["generation"]
+        self.gc_pauses.add(pause_ms)
+        self.collections[generation] += 1
+        self.collected_objects += info["collected"]
+        self.frame_gc_ms += pause_ms
+        self.young_count_start = gc.get_count()[0]
+        if tracer is not None:
+            tracer.record(GC_SPAN_NAMES[generation], self.pause_start_us, tracer.now_us(), {"collected": info["collected"]})
+
+    def frame_done(self) -> None:
+        young_count = gc.get_count()[0]
+        frame_objects = self.pending_objects + young_count - self.young_count_start
+        self.pending_objects = 0
+        self.young_count_start = young_count
+
+        allocated_blocks = sys.getallocatedblocks()
+        frame_blocks = allocated_blocks - self.allocated_blocks_start
+        self.allocated_blocks_start = allocated_blocks
+
+        self.frames += 1
+        self.objects_total += frame_objects
+        self.blocks_total += frame_blocks
+        if frame_objects > self.objects_max:
+            self.objects_max = frame_objects
+        if frame_blocks > self.blocks_max:
+            self.blocks_max = frame_blocks
+        if self.frame_gc_ms:
+            self.frames_with_gc += 1
+            if self.frame_gc_ms > self.max_frame_gc_ms:
+                self.max_frame_gc_ms = self.frame_gc_ms
+            self.frame_gc_ms = 0.0
+
+    def to_dict(self, games=()) -> Dict:
+        frames = self.frames or 1
+        return {
+            "gc_mode": self.gc_mode,
+            "frames": self.frames,
+            "objects_per_frame": {"mean": round(self.objects_total / frames, 3), "max": self.objects_max},
+            "allocated_blocks_per_frame": {"mean": round(self.blocks_total / frames, 3), "max": self.blocks_max},
+            "frames_with_gc": self.frames_with_gc,
+            "max_gc_ms_in_frame": round(self.max_frame_gc_ms, 4),
+            "gc_pauses": self.gc_pauses.to_dict(),
+            "collections": {f"gen{generation}": count for generation, count in enumerate(self.collections)},
+            "collected_objects": self.collected_objects,
+            "blocks_created": sum(game.block_pool.created for game in games),
+            "blocks_reused": sum(game.block_pool.reused for game in games),
+        }
+
+    def close(self) -> None:
+        if self.on_gc in gc.callbacks:
+            gc.callbacks.remove(self.on_gc)
+
+
+class PieceCollector:
+    """Runs the cyclic collector only between pieces, with start-up objects frozen out of it"""
+
+    def __init__(self):
+        gc.collect()
+        gc.freeze()
+        gc.disable()
+        self.pieces_seen = 0
+        self.idle_collected = False
+
+    def after_frame(self, pieces_locked: int, idle: bool = False) -> None:
+        if idle:
+            if not self.idle_collected:
+                gc.collect()
+                self.idle_collected = True
+            return
+        self.idle_collected = False
+
+        if pieces_locked == self.pieces_seen:
+            return
+        self.pieces_seen = pieces_locked
+        gc.collect(0)
+
+    def close(self) -> None:
+        gc.enable()
+        gc.unfreeze()
+
+
+def start_frame_memory(environ):
+    """Returns (FrameMemory, PieceCollector or None) for the mode the environment asks for"""
+    gc_mode = gc_mode_from(environ)
+    gc_schedule = PieceCollector() if gc_mode == GC_MODE_PIECES else None
+    return FrameMemory(gc_mode), gc_schedule
+
+
+def stop_frame_memory(frame_memory, gc_schedule) -> None:
+    """Undoes start_frame_memory(): removes the GC callback and gives collection back to the interpreter"""
+    frame_memory.close()
+    if gc_schedule:
+        gc_schedule.close()
@@ -0,0 +1,79 @@
+import atexit
+import queue
+import threading
+
+from settings import IO_QUEUE_SIZE, IO_FLUSH_TIMEOUT_S
+
+
+class IOWorker:
+    """Runs disk work (leaderboard writes, autosaves, telemetry) in order on one background thread.
+
+    The queue is bounded, so if the disk falls far behind, submit() waits for room
+    rather than letting memory grow. A failed job is printed from the worker and
+    never reaches the game loop. Pending work is flushed when the program exits.
+    """
+
+    def __init__(self, max_pending: int = IO_QUEUE_SIZE):
+        self.pending = queue.Queue(maxsize=max_pending)
+        self.closed = False
+        self.failures = []
+        self.full_warning_shown = False
+        self.worker = threading.Thread(target=self.run_worker, name="io-worker", daemon=True)
+        self.worker.start()
+        atexit.register(self.close)
+
+    def submit(self, description: str, function, *args) -> None:
+        job = (description, function, args)
+        if self.closed:
+            self.run_job(job)
+            return
+        try:
+            self.pending.put_nowait(job)
+        except queue.Full:
+            if not self.full_warning_shown:
+                print("[IO] Disk is falling behind, waiting for queued writes")
+                self.full_warning_shown = True
+            self.pending.put(job)
+
+    def run_job(self, job) -> None:
+        description, function, args = job
+        try:
+            function(*args)
+        except Exception as error:  # a failed job must not stop the jobs queued behind it
+            self.failures.append((description, error))
+            print(f"[IO] {description} failed: {error}")
+
+    def run_worker(self) -> None:
+        while True:
+            job = self.pending.get()
+            if job is None:
+                return
+            self.run_job(job)
+
+    def flush(self, timeout_s: float = IO_FLUSH_TIMEOUT_S) -> bool:
+        """Waits until everything submitted so far has run; False if that took longer than timeout_s"""
+        if self.closed:
+            return True
+        done = threading.Event()
+        self.submit("flush", done.set)
+        return done.wait(timeout_s)
+
+    def close(self, timeout_s: float = IO_FLUSH_TIMEOUT_S) -> None:
+        if self.closed:
+            return
+        if not self.flush(timeout_s):
+            print("[IO] Gave up waiting for queued writes at shutdown")
+        self.closed = True
+        self.pending.put(None)
+        self.worker.join(timeout_s)
+
+
+_io_worker = None
+
+
+def get_io_worker() -> IOWorker:
+    """Returns the shared worker, starting its thread on first use"""
+    global _io_worker
+    if _io_worker is None:
+        _io_worker = IOWorker()
+    return _io_worker
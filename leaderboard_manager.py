@@ -1,7 +1,19 @@
 import csv
+import heapq
 import os
 from datetime import datetime
-from typing import List, Dict
+from itertools import groupby
+from operator import itemgetter
+from typing import List, Dict, Iterator
+
+from settings import DEFAULT_CPU_NAMES, RATING_HISTORY_FILES, LEADERBOARD_RATINGS_STATE, LEADERBOARD_RANKINGS_CSV
+from leaderboard_stats import LeaderboardStats
+from ratings import RatingTable
+from tracing import traced
+from io_worker import get_io_worker
+
+MATCH_HEADER = ["timestamp", "name", "score", "is_cpu", "difficulty"]
+SOLO_HEADER = ["timestamp", "name", "score", "speed", "level", "lines"]
 
 
 def safe_name(name: str, max_len: int = 18) -> str:
@@ -12,55 +24,328 @@ def safe_name(name: str, max_len: int = 18) -> str:
     return cleaned[:max_len]
 
 
+def normalized_header(header: List[str]) -> List[str]:
+    """Column names with the padding and capitals some cabinets wrote stripped off"""
+    return [column.strip().lower() for column in header]
+
+
+def current_header(header: List[str]) -> List[str]:
+    """The standard header for a file started under an older, shorter one.
+
+    Match files from before the difficulty column keep their four-column
+    header; rows appended since carry the fifth column, and the older rows
+    read as having a blank difficulty.
+    """
+    for standard_header in (MATCH_HEADER, SOLO_HEADER):
+        if len(header) < len(standard_header) and header == standard_header[: len(header)]:
+            return standard_header
+    return header
+
+
 def ensure_csv_header(path: str, header: List[str]) -> None:
     os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if os.path.exists(path):
+        return
+    with open(path, "w", newline="", encoding="utf-8") as file_handle:
+        writer = csv.writer(file_handle)
+        writer.writerow(header)
+
+
+def stats_path(path: str) -> str:
+    return os.path.splitext(path)[0] + "_stats.json"
+
+
+def history_size(path: str) -> int:
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+def parse_int(value, default: int = 0) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def read_history(path: str) -> Iterator[Dict]:
+    """Yields each history row as a cleaned entry dict"""
     if not os.path.exists(path):
-        with open(path, "w", newline="", encoding="utf-8") as file_handle:
-            writer = csv.writer(file_handle)
-            writer.writerow(header)
+        return
+    with open(path, "r", newline="", encoding="utf-8") as file_handle:
+        reader = csv.DictReader(file_handle)
+        reader.fieldnames = current_header(normalized_header(reader.fieldnames or []))
+        for row in reader:
+            entry = {"name": safe_name(row.get("name", "Player")), "score": parse_int(row.get("score", 0))}
+            for column in ("speed", "level", "lines"):
+                if column in row:
+                    entry[column] = parse_int(row[column])
+            yield entry
+
+
+def rebuild_stats(path: str) -> LeaderboardStats:
+    """Recomputes the per-player aggregates for a history file with one full scan"""
+    leaderboard_stats = LeaderboardStats(history_size(path))
+    for entry in read_history(path):
+        leaderboard_stats.add(entry)
+    if os.path.exists(path):
+        leaderboard_stats.save(stats_path(path))
+    return leaderboard_stats
+
+
+def load_stats(path: str) -> LeaderboardStats:
+    leaderboard_stats = LeaderboardStats.load(stats_path(path))
+    if leaderboard_stats is None or leaderboard_stats.source_bytes != history_size(path):
+        leaderboard_stats = rebuild_stats(path)
+    return leaderboard_stats
+
+
+def update_stats(path: str, entries: List[Dict], size_before: int) -> None:
+    leaderboard_stats = LeaderboardStats.load(stats_path(path))
+    if leaderboard_stats is None or leaderboard_stats.source_bytes != size_before:
+        rebuild_stats(path)
+        return
+    for entry in entries:
+        leaderboard_stats.add(entry)
+    leaderboard_stats.source_bytes = history_size(path)
+    leaderboard_stats.save(stats_path(path))
 
 
 def append_solo_score(path: str, name: str, score: int, speed: int, level: int, lines: int) -> None:
-    ensure_csv_header(path, ["timestamp", "name", "score", "speed", "level", "lines"])
+    """Queues the score for the background I/O worker; the timestamp is taken now"""
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    entry = {"name": safe_name(name), "score": int(score), "speed": int(speed), "level": int(level), "lines": int(lines)}
+    get_io_worker().submit(f"saving score to {path}", write_solo_score, path, timestamp, entry)
+
+
+@traced("leaderboard.write_solo_score")
+def write_solo_score(path: str, timestamp: str, entry: Dict) -> None:
+    ensure_csv_header(path, SOLO_HEADER)
+    size_before = history_size(path)
     with open(path, "a", newline="", encoding="utf-8") as file_handle:
         writer = csv.writer(file_handle)
-        writer.writerow([timestamp, safe_name(name), int(score), int(speed), int(level), int(lines)])
+        writer.writerow([timestamp, entry["name"], entry["score"], entry["speed"], entry["level"], entry["lines"]])
+    update_stats(path, [entry], size_before)
+
+
+def rating_key(name: str, is_cpu: bool, difficulty: str) -> str:
+    """CPU boards are rated per difficulty, people by name"""
+    if is_cpu and difficulty in DEFAULT_CPU_NAMES:
+        return DEFAULT_CPU_NAMES[difficulty]
+    return name
+
+
+def read_match_rows(path: str, file_index: int) -> Iterator[tuple]:
+    """Yields (timestamp, file_index, rating key, score) for each row of a match history file"""
+    if not os.path.exists(path):
+        return
+    with open(path, "r", newline="", encoding="utf-8") as file_handle:
+        reader = csv.reader(file_handle)
+        header = current_header(normalized_header(next(reader, [])))
+        column_count = len(header)
+        timestamp_column = header.index("timestamp") if "timestamp" in header else None
+        name_column = header.index("name") if "name" in header else None
+        score_column = header.index("score") if "score" in header else None
+        cpu_column = header.index("is_cpu") if "is_cpu" in header else None
+        difficulty_column = header.index("difficulty") if "difficulty" in header else None
+        for row in reader:
+            if len(row) < column_count:
+                row = row + [""] * (column_count - len(row))
+            name = safe_name(row[name_column]) if name_column is not None else "Player"
+            is_cpu = cpu_column is not None and row[cpu_column].strip() == "True"
+            difficulty = row[difficulty_column].strip() if difficulty_column is not None else ""
+            timestamp = row[timestamp_column].strip() if timestamp_column is not None else ""
+            score = parse_int(row[score_column]) if score_column is not None else 0
+            yield timestamp, file_index, rating_key(name, is_cpu, difficulty), score
+
+
+@traced("leaderboard.recompute_ratings")
+def recompute_ratings(history_paths: List[str] = None) -> RatingTable:
+    """Replays every rated match history in timestamp order and rewrites the rankings.
+
+    The files are merged as streams, so memory stays flat however long the
+    history is. Rows sharing a timestamp within one file form one match.
+    """
+    history_paths = list(history_paths or RATING_HISTORY_FILES)
+    table = RatingTable()
+    table.source_bytes = {history_path: history_size(history_path) for history_path in history_paths}
+    streams = [read_match_rows(history_path, file_index) for file_index, history_path in enumerate(history_paths)]
+    for _, match_rows in groupby(heapq.merge(*streams), key=lambda row: (row[0], row[1])):
+        table.apply_match([(key, score) for _, _, key, score in match_rows])
+    table.save(LEADERBOARD_RATINGS_STATE)
+    table.write_rankings(LEADERBOARD_RANKINGS_CSV)
+    return table
+
+
+def update_ratings(path: str, entries: List[tuple], size_before: int) -> None:
+    rated_paths = {os.path.abspath(history_path): history_path for history_path in RATING_HISTORY_FILES}
+    if os.path.abspath(path) not in rated_paths:
+        return
+
+    current_sizes = {history_path: history_size(history_path) for history_path in RATING_HISTORY_FILES}
+    expected_sizes = dict(current_sizes)
+    expected_sizes[rated_paths[os.path.abspath(path)]] = size_before
+
+    table = RatingTable.load(LEADERBOARD_RATINGS_STATE)
+    if table is None or table.source_bytes != expected_sizes:
+        recompute_ratings()
+        return
+
+    table.apply_match(entries)
+    table.source_bytes = current_sizes
+    table.save(LEADERBOARD_RATINGS_STATE)
+    table.write_rankings(LEADERBOARD_RANKINGS_CSV)
 
 
 def append_match_results(path: str, results: List[Dict]) -> None:
-    ensure_csv_header(path, ["timestamp", "name", "score", "is_cpu"])
+    """Queues a finished match for the background I/O worker; the timestamp is taken now"""
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    rows = []
+    for result in results:
+        is_cpu = bool(result.get("is_cpu", False))
+        difficulty = result.get("difficulty", "") if is_cpu else ""
+        rows.append([timestamp, safe_name(result.get("name", "Player")), int(result.get("score", 0)), is_cpu, difficulty])
+    get_io_worker().submit(f"saving match results to {path}", write_match_results, path, rows)
+
+
+@traced("leaderboard.write_match_results")
+def write_match_results(path: str, rows: List[list]) -> None:
+    ensure_csv_header(path, MATCH_HEADER)
+    size_before = history_size(path)
     with open(path, "a", newline="", encoding="utf-8") as file_handle:
+        csv.writer(file_handle).writerows(rows)
+    entries = [{"name": name, "score": score} for _, name, score, _, _ in rows]
+    rated_entries = [(rating_key(name, is_cpu, difficulty), score) for _, name, score, is_cpu, difficulty in rows]
+    update_stats(path, entries, size_before)
+    update_ratings(path, rated_entries, size_before)
+
+
+def read_header(path: str) -> List[str]:
+    with open(path, "r", newline="", encoding="utf-8") as file_handle:
+        return current_header(normalized_header(next(csv.reader(file_handle), [])))
+
+
+def merged_header(paths: List[str]) -> List[str]:
+    """Every column any of the files has, the standard solo or match columns first"""
+    source_headers = [read_header(path) for path in paths]
+    all_columns = [column for source_header in source_headers for column in source_header if column]
+    standard_header = SOLO_HEADER if any(column in all_columns for column in ("speed", "level", "lines")) else MATCH_HEADER
+    header = [column for column in standard_header if column in all_columns or column in ("timestamp", "name", "score")]
+    for column in all_columns:
+        if column not in header:
+            header.append(column)
+    return header
+
+
+def history_rows(path: str, header: List[str], file_index: int, counts: Dict) -> Iterator[tuple]:
+    """Yields (timestamp, file_index, row laid out under header) for each row of one history file"""
+    name_position = header.index("name")
+    timestamp_position = header.index("timestamp")
+    with open(path, "r", newline="", encoding="utf-8") as file_handle:
+        reader = csv.reader(file_handle)
+        source_header = current_header(normalized_header(next(reader, [])))
+        positions = [source_header.index(column) if column in source_header else None for column in header]
+        previous_timestamp = ""
+        for row in reader:
+            if not row:
+                continue
+            counts["rows_read"] += 1
+            cleaned_row = [row[position].strip() if position is not None and position < len(row) else "" for position in positions]
+            cleaned_row[name_position] = safe_name(cleaned_row[name_position])
+            timestamp = cleaned_row[timestamp_position]
+            if timestamp < previous_timestamp:
+                counts["out_of_order"] += 1
+            previous_timestamp = timestamp
+            yield timestamp, file_index, tuple(cleaned_row)
+
+
+@traced("leaderboard.merge_histories")
+def merge_histories(source_paths: List[str], output_path: str) -> Dict:
+    """Merges history files from several cabinets into one, in timestamp order, and returns row counts.
+
+    Each file is streamed and the streams are combined with a heap, so memory
+    holds one row per file plus the rows of the current timestamp, however
+    long the histories are. A row is dropped as a duplicate when another file
+    already gave it for the same timestamp (the same history copied between
+    cabinets); repeats within one file are kept, since two players can tie in
+    one match. Files are expected to be in timestamp order, as the game writes
+    them; rows that are not are counted and written where they fall.
+    """
+    source_paths = [path for path in source_paths if os.path.exists(path)]
+    header = merged_header(source_paths)
+    counts = {"files": len(source_paths), "rows_read": 0, "rows_written": 0, "duplicates": 0, "out_of_order": 0}
+    streams = [history_rows(path, header, file_index, counts) for file_index, path in enumerate(source_paths)]
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    temp_path = output_path + ".tmp"
+    with open(temp_path, "w", newline="", encoding="utf-8") as file_handle:
         writer = csv.writer(file_handle)
-        for result in results:
-            writer.writerow(
-                [
-                    timestamp,
-                    safe_name(result.get("name", "Player")),
-                    int(result.get("score", 0)),
-                    bool(result.get("is_cpu", False)),
-                ]
-            )
+        writer.writerow(header)
+        for _, timestamp_rows in groupby(heapq.merge(*streams, key=itemgetter(0)), key=itemgetter(0)):
+            # Most copies of a row seen in any one file so far, and how many each file has given
+            written_copies = {}
+            file_copies = {}
+            for _, file_index, row in timestamp_rows:
+                copies = file_copies[file_index, row] = file_copies.get((file_index, row), 0) + 1
+                if copies > written_copies.get(row, 0):
+                    written_copies[row] = copies
+                    writer.writerow(row)
+                    counts["rows_written"] += 1
+                else:
+                    counts["duplicates"] += 1
+    # The output can be one of the sources, so it is only replaced once every stream is finished
+    os.replace(temp_path, output_path)
+    return counts
 
 
+@traced("leaderboard.get_top_scores")
 def get_top_scores(path: str, top_n: int = 5) -> List[Dict]:
+    get_io_worker().flush()
     if not os.path.exists(path):
         return []
 
-    best_by_name: Dict[str, int] = {}
+    players = load_stats(path).players
+    sorted_rows = sorted(players.items(), key=lambda item: item[1].best_score, reverse=True)[:top_n]
+    return [
+        {
+            "rank": rank,
+            "name": name,
+            "score": player_stats.best_score,
+            "games": player_stats.games,
+            "average": round(player_stats.average_score),
+        }
+        for rank, (name, player_stats) in enumerate(sorted_rows, start=1)
+    ]
 
-    with open(path, "r", newline="", encoding="utf-8") as file_handle:
-        reader = csv.DictReader(file_handle)
-        for row in reader:
-            player_name = safe_name(row.get("name", "Player"))
-            try:
-                score_value = int(row.get("score", 0))
-            except ValueError:
-                score_value = 0
 
-            if player_name not in best_by_name or score_value > best_by_name[player_name]:
-                best_by_name[player_name] = score_value
+@traced("leaderboard.get_player_stats")
+def get_player_stats(path: str) -> Dict[str, Dict]:
+    """Summary stats for every player in a history file, read from the stored aggregates"""
+    get_io_worker().flush()
+    return {name: player_stats.summary() for name, player_stats in load_stats(path).players.items()}
+
+if __name__ == "__main__":
+    import argparse
+
+    from settings import LEADERBOARD_SOLO_CSV, LEADERBOARD_2P_CSV, LEADERBOARD_3P_CSV, LEADERBOARD_CPU_CSV
+
+    parser = argparse.ArgumentParser(description="Rebuild leaderboard statistics and ratings from the history files")
+    parser.add_argument("paths", nargs="*", default=[LEADERBOARD_SOLO_CSV, LEADERBOARD_2P_CSV, LEADERBOARD_3P_CSV, LEADERBOARD_CPU_CSV])
+    parser.add_argument("--merge", metavar="OUTPUT", help="merge the given history files (one kind, from many cabinets) into OUTPUT")
+    args = parser.parse_args()
+
+    if args.merge:
+        merge_counts = merge_histories(args.paths, args.merge)
+        print(
+            f"{args.merge}: {merge_counts['rows_written']} rows from {merge_counts['files']} files "
+            f"({merge_counts['duplicates']} duplicates dropped, {merge_counts['out_of_order']} rows out of order)"
+        )
+        args.paths = [args.merge]
+
+    for history_path in args.paths:
+        if not os.path.exists(history_path):
+            print(f"{history_path}: no history")
+            continue
+        rebuilt = rebuild_stats(history_path)
+        print(f"{history_path}: {len(rebuilt.players)} players -> {stats_path(history_path)}")
 
-    sorted_rows = sorted(best_by_name.items(), key=lambda item: item[1], reverse=True)[:top_n]
-    return [{"rank": rank, "name": name, "score": score} for rank, (name, score) in enumerate(sorted_rows, start=1)]
\ No newline at end of file
+    table = recompute_ratings()
+    print(f"ratings: {table.match_count} matches, {len(table.players)} players -> {LEADERBOARD_RANKINGS_CSV}")
\ No newline at end of file
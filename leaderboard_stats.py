@@ -0,0 +1,173 @@
+import json
+import math
+import os
+from typing import Dict, Optional
+
+from settings import LEADERBOARD_SKETCH_ACCURACY
+
+
+class ScoreSketch:
+    """Streaming quantile sketch over log-spaced buckets.
+
+    Any quantile it reports is within the relative accuracy of the true value,
+    and its size grows with the log of the score range rather than with the
+    number of games recorded.
+    """
+
+    def __init__(self, relative_accuracy: float = LEADERBOARD_SKETCH_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.zero_count = 0
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        if value <= 0:
+            self.zero_count += 1
+            return
+        bucket_index = math.ceil(math.log(value) / self.log_gamma)
+        self.buckets[bucket_index] = self.buckets.get(bucket_index, 0) + 1
+
+    def quantile(self, fraction: float) -> Optional[float]:
+        if self.count == 0:
+            return None
+        target_rank = fraction * (self.count - 1)
+        seen = self.zero_count
+        if target_rank < seen:
+            return 0.0
+        for bucket_index in sorted(self.buckets):
+            seen += self.buckets[bucket_index]
+            if target_rank < seen:
+                return 2 * self.gamma ** bucket_index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+    def to_dict(self) -> Dict:
+        return {
+            "accuracy": self.relative_accuracy,
+            "zero": self.zero_count,
+            "buckets": {str(bucket_index): count for bucket_index, count in self.buckets.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ScoreSketch":
+        sketch = cls(data.get("accuracy", LEADERBOARD_SKETCH_ACCURACY))
+        sketch.zero_count = int(data.get("zero", 0))
+        sketch.buckets = {int(bucket_index): int(count) for bucket_index, count in data.get("buckets", {}).items()}
+        sketch.count = sketch.zero_count + sum(sketch.buckets.values())
+        return sketch
+
+
+class PlayerStats:
+    def __init__(self):
+        self.games = 0
+        self.total_score = 0
+        self.best_score = 0
+        self.best_lines = 0
+        self.best_level = 0
+        self.best_by_speed: Dict[int, int] = {}
+        self.sketch = ScoreSketch()
+
+    @property
+    def average_score(self) -> float:
+        return self.total_score / self.games if self.games else 0.0
+
+    def add(self, entry: Dict) -> None:
+        score = entry["score"]
+        if self.games == 0 or score > self.best_score:
+            self.best_score = score
+        self.games += 1
+        self.total_score += score
+        self.sketch.add(score)
+
+        if entry.get("lines") is not None:
+            self.best_lines = max(self.best_lines, entry["lines"])
+        if entry.get("level") is not None:
+            self.best_level = max(self.best_level, entry["level"])
+        if entry.get("speed") is not None:
+            speed = entry["speed"]
+            self.best_by_speed[speed] = max(self.best_by_speed.get(speed, score), score)
+
+    def summary(self) -> Dict:
+        return {
+            "games": self.games,
+            "best": self.best_score,
+            "average": round(self.average_score, 1),
+            "median": self.sketch.quantile(0.5),
+            "p90": self.sketch.quantile(0.9),
+            "best_lines": self.best_lines,
+            "best_level": self.best_level,
+            "best_by_speed": dict(sorted(self.best_by_speed.items())),
+        }
+
+    def to_dict(self) -> Dict:
+        return {
+            "games": self.games,
+            "total": self.total_score,
+            "best": self.best_score,
+            "best_lines": self.best_lines,
+            "best_level": self.best_level,
+            "best_by_speed": {str(speed): best for speed, best in self.best_by_speed.items()},
+            "sketch": self.sketch.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "PlayerStats":
+        stats = cls()
+        stats.games = int(data.get("games", 0))
+        stats.total_score = int(data.get("total", 0))
+        stats.best_score = int(data.get("best", 0))
+        stats.best_lines = int(data.get("best_lines", 0))
+        stats.best_level = int(data.get("best_level", 0))
+        stats.best_by_speed = {int(speed): int(best) for speed, best in data.get("best_by_speed", {}).items()}
+        stats.sketch = ScoreSketch.from_dict(data.get("sketch", {}))
+        return stats
+
+
+class LeaderboardStats:
+    """Per-player aggregates for one leaderboard history file.
+
+    source_bytes records how much of the history CSV the aggregates cover, so a
+    file that was edited or appended to elsewhere is spotted and rebuilt.
+    """
+
+    def __init__(self, source_bytes: int = 0):
+        self.source_bytes = source_bytes
+        self.players: Dict[str, PlayerStats] = {}
+
+    def add(self, entry: Dict) -> None:
+        name = entry["name"]
+        if name not in self.players:
+            self.players[name] = PlayerStats()
+        self.players[name].add(entry)
+
+    def to_dict(self) -> Dict:
+        return {
+            "source_bytes": self.source_bytes,
+            "players": {name: stats.to_dict() for name, stats in self.players.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "LeaderboardStats":
+        leaderboard_stats = cls(int(data.get("source_bytes", 0)))
+        for name, player_data in data.get("players", {}).items():
+            leaderboard_stats.players[name] = PlayerStats.from_dict(player_data)
+        return leaderboard_stats
+
+    @classmethod
+    def load(cls, path: str) -> Optional["LeaderboardStats"]:
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as file_handle:
+                return cls.from_dict(json.load(file_handle))
+        except (OSError, ValueError) as error:
+            print(f"[Leaderboard] Ignoring unreadable stats file {path}: {error}")
+            return None
+
+    def save(self, path: str) -> None:
+        temp_path = path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file_handle:
+            json.dump(self.to_dict(), file_handle, separators=(",", ":"))
+        os.replace(temp_path, path)
@@ -0,0 +1,626 @@
+"""Networked 2-3 player matches with rollback netcode over UDP.
+
+Every client simulates all boards locally and only sends its own inputs, tagged
+with the frame they apply to. Remote inputs that have not arrived yet are
+predicted; when the real input turns out different the boards are rewound to
+that frame with Tetris.load_state() and re-simulated. Boards exchange periodic
+checksums, and a board that disagrees is resynced from its owner as row
+bitmasks plus piece ids.
+
+Play:      python netplay.py --players 2 --player 0 --bind 127.0.0.1:7000 --peers 127.0.0.1:7001
+Self-test: python netplay.py --selftest --players 3 --latency 80 --jitter 20 --loss 0.05
+"""
+import argparse
+import heapq
+import random
+import select
+import socket
+import struct
+import sys
+import threading
+import time
+import zlib
+
+import pygame as pg
+
+from settings import *
+from TetrisGame import Tetris, GameState
+from scenes import get_scene_manager
+
+
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_ROTATE = 4
+INPUT_DOWN_HELD = 8
+
+MSG_INPUT = 1
+MSG_CHECKSUM = 2
+MSG_RESYNC_REQUEST = 3
+MSG_BOARD_STATE = 4
+
+INPUT_HEADER = struct.Struct("!BBIB")
+INPUT_ACK = struct.Struct("!i")
+CHECKSUM_MESSAGE = struct.Struct("!BBII")
+RESYNC_REQUEST_MESSAGE = struct.Struct("!BBB")
+BOARD_STATE_HEADER = struct.Struct("!BBI")
+BOARD_HEADER = struct.Struct("!IIIHIBBbbB")
+ROW_BITS = struct.Struct("!H")
+RNG_STATE = struct.Struct("!625I")
+
+SHAPE_ORDER = list(TETROMINOES.keys())
+
+
+def parse_address(text):
+    host, port = text.rsplit(":", 1)
+    return host, int(port)
+
+
+def encode_board(state: GameState) -> bytes:
+    """Packs a board as changed rows (against an empty field) plus piece ids and counters"""
+    row_mask = 0
+    row_bytes = []
+    for row_index, row in enumerate(state.field_rows):
+        row_bits = 0
+        for column_index, cell in enumerate(row):
+            if cell:
+                row_bits |= 1 << column_index
+        if row_bits:
+            row_mask |= 1 << row_index
+            row_bytes.append(ROW_BITS.pack(row_bits))
+
+    shape, rotation, pivot_x, pivot_y, landing = state.piece
+    next_shape = state.next_piece[0]
+    flags = int(state.speed_up) | int(state.game_over_flag) << 1 | int(landing) << 2
+    header = BOARD_HEADER.pack(
+        row_mask,
+        state.score,
+        state.lines_cleared,
+        state.level,
+        state.pieces_locked,
+        flags,
+        SHAPE_ORDER.index(shape) << 2 | rotation,
+        pivot_x,
+        pivot_y,
+        SHAPE_ORDER.index(next_shape),
+    )
+    return header + b"".join(row_bytes) + RNG_STATE.pack(*state.rng_state[1])
+
+
+def decode_board(data: bytes, offset: int = 0) -> GameState:
+    (
+        row_mask,
+        score,
+        lines_cleared,
+        level,
+        pieces_locked,
+        flags,
+        piece_id,
+        pivot_x,
+        pivot_y,
+        next_shape_index,
+    ) = BOARD_HEADER.unpack_from(data, offset)
+    offset += BOARD_HEADER.size
+
+    field_rows = []
+    column_heights = [0] * FIELD_W
+    for row_index in range(FIELD_H):
+        row = [0] * FIELD_W
+        if row_mask >> row_index & 1:
+            (row_bits,) = ROW_BITS.unpack_from(data, offset)
+            offset += ROW_BITS.size
+            for column_index in range(FIELD_W):
+                if row_bits >> column_index & 1:
+                    row[column_index] = 1
+                    column_heights[column_index] = max(column_heights[column_index], FIELD_H - row_index)
+        field_rows.append(row)
+
+    rng_internal = RNG_STATE.unpack_from(data, offset)
+    next_shape = SHAPE_ORDER[next_shape_index]
+    return GameState(
+        field_rows,
+        column_heights,
+        (SHAPE_ORDER[piece_id >> 2], piece_id & 3, pivot_x, pivot_y, bool(flags & 4)),
+        (next_shape, 0, int(NEXT_TETROMINO_POS.x), int(NEXT_TETROMINO_POS.y), False),
+        score,
+        lines_cleared,
+        level,
+        pieces_locked,
+        bool(flags & 1),
+        bool(flags & 2),
+        (3, rng_internal, None),
+    )
+
+
+def board_checksum(state: GameState) -> int:
+    return zlib.crc32(encode_board(state))
+
+
+class UdpTransport:
+    def __init__(self, bind_address, peer_addresses):
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind(bind_address)
+        self.socket.setblocking(False)
+        self.peer_addresses = list(peer_addresses)
+
+    @property
+    def address(self):
+        return self.socket.getsockname()
+
+    def send(self, payload: bytes):
+        for peer_address in self.peer_addresses:
+            try:
+                self.socket.sendto(payload, peer_address)
+            except OSError:
+                pass
+
+    def receive(self):
+        while True:
+            try:
+                payload, _ = self.socket.recvfrom(65536)
+            except (BlockingIOError, ConnectionResetError):
+                return
+            yield payload
+
+    def close(self):
+        self.socket.close()
+
+
+class LatencyProxy:
+    """Relays UDP datagrams to a target after a simulated delay, with optional jitter and loss"""
+
+    def __init__(self, target_address, latency_ms=60, jitter_ms=0, loss=0.0, seed=None):
+        self.target_address = target_address
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.loss = loss
+        self.random_generator = random.Random(seed)
+
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind(("127.0.0.1", 0))
+        self.address = self.socket.getsockname()
+
+        self.queue = []
+        self.sequence = 0
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name="latency-proxy", daemon=True)
+        self.thread.start()
+
+    def run(self):
+        while self.running:
+            timeout_s = 0.005
+            if self.queue:
+                timeout_s = max(0.0, min(timeout_s, self.queue[0][0] - time.perf_counter()))
+            readable, _, _ = select.select([self.socket], [], [], timeout_s)
+            if readable:
+                try:
+                    payload, _ = self.socket.recvfrom(65536)
+                except OSError:
+                    continue
+                if self.random_generator.random() >= self.loss:
+                    delay_ms = self.latency_ms + self.random_generator.uniform(-self.jitter_ms, self.jitter_ms)
+                    self.sequence += 1
+                    heapq.heappush(self.queue, (time.perf_counter() + max(0.0, delay_ms) / 1000.0, self.sequence, payload))
+
+            now = time.perf_counter()
+            while self.queue and self.queue[0][0] <= now:
+                _, _, payload = heapq.heappop(self.queue)
+                try:
+                    self.socket.sendto(payload, self.target_address)
+                except OSError:
+                    pass
+
+    def close(self):
+        self.running = False
+        self.thread.join(1.0)
+        self.socket.close()
+
+
+class RollbackSession:
+    def __init__(self, player_index, player_count, transport, match_seed=0):
+        self.player_index = player_index
+        self.player_count = player_count
+        self.transport = transport
+        self.images = []
+
+        self.animation_trigger = False
+        self.fast_animation_trigger = False
+
+        self.games = [
+            Tetris(self, is_simulation=True, random_seed=match_seed * 16 + board_index)
+            for board_index in range(player_count)
+        ]
+
+        self.frame = 0
+        self.inputs = [dict() for _ in range(player_count)]
+        self.last_confirmed = [-1] * player_count
+        self.remote_acks = [-1] * player_count
+        self.predicted = {}
+        self.saved_states = {}
+        self.rollback_to = None
+
+        for delay_frame in range(NETPLAY_INPUT_DELAY_FRAMES):
+            self.inputs[player_index][delay_frame] = 0
+        self.update_confirmed(player_index)
+
+        self.board_checksums = {}
+        self.remote_checksums = []
+        self.last_checksum_frame = -1
+
+        self.rollback_count = 0
+        self.rollback_frames = 0
+        self.max_rollback_depth = 0
+        self.stall_count = 0
+        self.desync_count = 0
+        self.resync_count = 0
+
+    @property
+    def confirmed_through(self):
+        return min(self.last_confirmed)
+
+    @property
+    def match_finished(self):
+        return all(game.game_over_flag for game in self.games)
+
+    def update_confirmed(self, player):
+        player_inputs = self.inputs[player]
+        while self.last_confirmed[player] + 1 in player_inputs:
+            self.last_confirmed[player] += 1
+
+    def input_for(self, player, frame):
+        player_inputs = self.inputs[player]
+        if frame in player_inputs:
+            return player_inputs[frame]
+        predicted_bits = player_inputs.get(self.last_confirmed[player], 0) & INPUT_DOWN_HELD
+        self.predicted[(player, frame)] = predicted_bits
+        return predicted_bits
+
+    def simulate_frame(self, frame):
+        self.saved_states[frame] = [game.save_state() for game in self.games]
+
+        self.animation_trigger = frame % NETPLAY_GRAVITY_FRAMES == NETPLAY_GRAVITY_FRAMES - 1
+        self.fast_animation_trigger = frame % NETPLAY_FAST_GRAVITY_FRAMES == NETPLAY_FAST_GRAVITY_FRAMES - 1
+
+        for player, game in enumerate(self.games):
+            if game.game_over_flag:
+                continue
+            bits = self.input_for(player, frame)
+            if bits & INPUT_LEFT:
+                game.handle_action("left")
+            if bits & INPUT_RIGHT:
+                game.handle_action("right")
+            if bits & INPUT_ROTATE:
+                game.handle_action("rotate")
+            game.speed_up = bool(bits & INPUT_DOWN_HELD)
+            game.update()
+
+    def rollback(self):
+        rollback_frame = self.rollback_to
+        self.rollback_to = None
+        if rollback_frame is None or rollback_frame >= self.frame or rollback_frame not in self.saved_states:
+            return
+
+        for game, state in zip(self.games, self.saved_states[rollback_frame]):
+            game.load_state(state)
+        for frame in range(rollback_frame, self.frame):
+            self.simulate_frame(frame)
+
+        depth = self.frame - rollback_frame
+        self.rollback_count += 1
+        self.rollback_frames += depth
+        self.max_rollback_depth = max(self.max_rollback_depth, depth)
+
+    def send_inputs(self, last_frame=None):
+        """Sends every local input through last_frame a peer has not confirmed yet, plus what this client has confirmed"""
+        if last_frame is None:
+            last_frame = self.frame + NETPLAY_INPUT_DELAY_FRAMES - 1
+        acked_frame = min(ack for player, ack in enumerate(self.remote_acks) if player != self.player_index)
+        first_frame = max(0, acked_frame + 1, last_frame - NETPLAY_MAX_INPUT_RESEND + 1)
+        first_frame = min(first_frame, max(0, last_frame - NETPLAY_INPUT_REDUNDANCY + 1))
+        local_inputs = self.inputs[self.player_index]
+        frames = [frame for frame in range(first_frame, last_frame + 1) if frame in local_inputs]
+        if not frames:
+            return
+        payload = INPUT_HEADER.pack(MSG_INPUT, self.player_index, frames[0], len(frames))
+        acks = b"".join(INPUT_ACK.pack(confirmed) for confirmed in self.last_confirmed)
+        self.transport.send(payload + acks + bytes(local_inputs[frame] for frame in frames))
+
+    def receive_messages(self):
+        for payload in self.transport.receive():
+            if not payload:
+                continue
+            message_type = payload[0]
+            if message_type == MSG_INPUT:
+                self.receive_inputs(payload)
+            elif message_type == MSG_CHECKSUM:
+                _, sender, frame, checksum = CHECKSUM_MESSAGE.unpack_from(payload)
+                self.remote_checksums.append((sender, frame, checksum))
+            elif message_type == MSG_RESYNC_REQUEST:
+                _, sender, board_index = RESYNC_REQUEST_MESSAGE.unpack_from(payload)
+                if board_index == self.player_index:
+                    self.send_board_state()
+            elif message_type == MSG_BOARD_STATE:
+                self.receive_board_state(payload)
+
+    def receive_inputs(self, payload):
+        _, sender, first_frame, count = INPUT_HEADER.unpack_from(payload)
+        if sender == self.player_index or sender >= self.player_count:
+            return
+        offset = INPUT_HEADER.size
+        remote_confirmed = [INPUT_ACK.unpack_from(payload, offset + player * INPUT_ACK.size)[0] for player in range(self.player_count)]
+        self.remote_acks[sender] = max(self.remote_acks[sender], remote_confirmed[self.player_index])
+        offset += self.player_count * INPUT_ACK.size
+
+        player_inputs = self.inputs[sender]
+        for index in range(count):
+            frame = first_frame + index
+            if frame in player_inputs or frame <= self.last_confirmed[sender]:
+                continue
+            bits = payload[offset + index]
+            player_inputs[frame] = bits
+            predicted_bits = self.predicted.pop((sender, frame), None)
+            if predicted_bits is not None and predicted_bits != bits:
+                if self.rollback_to is None or frame < self.rollback_to:
+                    self.rollback_to = frame
+        self.update_confirmed(sender)
+
+    def send_board_state(self):
+        frame = self.confirmed_through + 1
+        if frame not in self.saved_states:
+            frame -= 1
+        if frame not in self.saved_states:
+            return
+        state = self.saved_states[frame][self.player_index]
+        self.transport.send(BOARD_STATE_HEADER.pack(MSG_BOARD_STATE, self.player_index, frame) + encode_board(state))
+
+    def receive_board_state(self, payload):
+        _, sender, frame = BOARD_STATE_HEADER.unpack_from(payload)
+        if sender >= self.player_count or frame not in self.saved_states:
+            return
+        self.saved_states[frame][sender] = decode_board(payload, BOARD_STATE_HEADER.size)
+        self.resync_count += 1
+        if self.rollback_to is None or frame < self.rollback_to:
+            self.rollback_to = frame
+
+    def exchange_checksums(self):
+        settled_frame = self.confirmed_through + 1
+        next_frame = self.last_checksum_frame + NETPLAY_CHECKSUM_INTERVAL
+        while next_frame <= min(settled_frame, self.frame - 1):
+            if next_frame in self.saved_states:
+                checksums = [board_checksum(state) for state in self.saved_states[next_frame]]
+                self.board_checksums[next_frame] = checksums
+                self.transport.send(
+                    CHECKSUM_MESSAGE.pack(MSG_CHECKSUM, self.player_index, next_frame, checksums[self.player_index])
+                )
+            self.last_checksum_frame = next_frame
+            next_frame += NETPLAY_CHECKSUM_INTERVAL
+
+        still_pending = []
+        for sender, frame, checksum in self.remote_checksums:
+            if frame not in self.board_checksums:
+                if frame > self.last_checksum_frame:
+                    still_pending.append((sender, frame, checksum))
+                continue
+            if sender < self.player_count and self.board_checksums[frame][sender] != checksum:
+                self.desync_count += 1
+                self.transport.send(RESYNC_REQUEST_MESSAGE.pack(MSG_RESYNC_REQUEST, self.player_index, sender))
+        self.remote_checksums = still_pending
+
+    def prune(self):
+        """Drops history older than the rollback window behind the confirmed frame"""
+        keep_from = self.confirmed_through - NETPLAY_MAX_ROLLBACK_FRAMES
+        for frame in [frame for frame in self.saved_states if frame < keep_from]:
+            del self.saved_states[frame]
+        for frame in [frame for frame in self.board_checksums if frame < keep_from - 10 * NETPLAY_CHECKSUM_INTERVAL]:
+            del self.board_checksums[frame]
+        for player, player_inputs in enumerate(self.inputs):
+            input_floor = keep_from
+            if player == self.player_index:
+                acked_frame = min(ack for other, ack in enumerate(self.remote_acks) if other != self.player_index)
+                input_floor = min(input_floor, acked_frame + 1)
+            for frame in [frame for frame in player_inputs if frame < input_floor]:
+                del player_inputs[frame]
+
+    def advance(self, local_bits):
+        """Runs one network tick; returns False when stalled waiting for remote inputs"""
+        self.receive_messages()
+        self.rollback()
+
+        if self.frame - (self.confirmed_through + 1) >= NETPLAY_MAX_ROLLBACK_FRAMES:
+            self.stall_count += 1
+            self.send_inputs()
+            return False
+
+        input_frame = self.frame + NETPLAY_INPUT_DELAY_FRAMES
+        self.inputs[self.player_index][input_frame] = local_bits
+        self.update_confirmed(self.player_index)
+        self.send_inputs(input_frame)
+
+        self.simulate_frame(self.frame)
+        self.frame += 1
+
+        self.exchange_checksums()
+        self.prune()
+        return True
+
+    def stats(self):
+        return {
+            "frame": self.frame,
+            "confirmed": self.confirmed_through,
+            "rollbacks": self.rollback_count,
+            "rollback_frames": self.rollback_frames,
+            "max_rollback_depth": self.max_rollback_depth,
+            "stalls": self.stall_count,
+            "desyncs": self.desync_count,
+            "resyncs": self.resync_count,
+        }
+
+
+class NetplayApp:
+    def __init__(self, session: RollbackSession, player_names=None):
+        from arena import BoardThumbnail
+
+        pg.init()
+
+        self.session = session
+        self.player_names = list(player_names or [])
+        while len(self.player_names) < session.player_count:
+            self.player_names.append(DEFAULT_PLAYER_NAMES.get(len(self.player_names) + 1, "Player"))
+
+        board_width = FIELD_W * NETPLAY_TILE_SIZE
+        board_height = FIELD_H * NETPLAY_TILE_SIZE
+        self.gap = 60
+        self.margin = 60
+        window_width = self.margin * 2 + session.player_count * board_width + (session.player_count - 1) * self.gap
+        scene_manager = get_scene_manager()
+        self.screen = scene_manager.show(
+            (window_width, board_height + 200), f"Tetris – Network Match (Player {session.player_index + 1})"
+        )
+        self.clock = scene_manager.clock
+
+        self.thumbnails = [BoardThumbnail(game, NETPLAY_TILE_SIZE) for game in session.games]
+        self.board_width = board_width
+        self.name_font = pg.font.Font(None, 36)
+        self.info_font = pg.font.Font(None, 24)
+
+        self.controls = PLAYER_CONTROLS[3]
+        self.pending_bits = 0
+        self.down_held = False
+
+    def check_events(self):
+        for event in pg.event.get():
+            if event.type == pg.QUIT or (event.type == pg.KEYDOWN and event.key == pg.K_ESCAPE):
+                return False
+            if event.type == pg.KEYDOWN:
+                if event.key == self.controls["left"]:
+                    self.pending_bits |= INPUT_LEFT
+                elif event.key == self.controls["right"]:
+                    self.pending_bits |= INPUT_RIGHT
+                elif event.key == self.controls["rotate"]:
+                    self.pending_bits |= INPUT_ROTATE
+                elif event.key == self.controls["down"]:
+                    self.down_held = True
+            if event.type == pg.KEYUP and event.key == self.controls["down"]:
+                self.down_held = False
+        return True
+
+    def update(self):
+        bits = self.pending_bits | (INPUT_DOWN_HELD if self.down_held else 0)
+        if self.session.advance(bits):
+            self.pending_bits = 0
+        self.clock.tick(FPS)
+
+    def draw(self):
+        self.screen.fill(BACKGROUND_COLOUR)
+        for board_index, thumbnail in enumerate(self.thumbnails):
+            thumbnail.refresh()
+            board_x = self.margin + board_index * (self.board_width + self.gap)
+            colour = (255, 255, 150) if board_index == self.session.player_index else (200, 200, 220)
+            game = self.session.games[board_index]
+            self.screen.blit(self.name_font.render(self.player_names[board_index], True, colour), (board_x, 20))
+            self.screen.blit(thumbnail.surface, (board_x, 60))
+            status = "GAME OVER" if game.game_over_flag else f"Score: {game.score}"
+            self.screen.blit(self.name_font.render(status, True, (150, 255, 150)), (board_x, 70 + FIELD_H * NETPLAY_TILE_SIZE))
+
+        stats = self.session.stats()
+        info = (
+            f"frame {stats['frame']}  rollbacks {stats['rollbacks']} (max {stats['max_rollback_depth']})  "
+            f"stalls {stats['stalls']}  resyncs {stats['resyncs']}"
+        )
+        self.screen.blit(self.info_font.render(info, True, (160, 170, 190)), (self.margin, self.screen.get_height() - 40))
+        pg.display.flip()
+
+    def run(self):
+        while self.check_events():
+            self.update()
+            self.draw()
+        self.session.transport.close()
+
+
+def run_selftest(player_count, frames, latency_ms, jitter_ms, loss, seed):
+    """Plays random inputs between local clients through latency proxies and checks they agree"""
+    transports = [UdpTransport(("127.0.0.1", 0), []) for _ in range(player_count)]
+    proxies = []
+    for sender_index, sender in enumerate(transports):
+        for receiver_index, receiver in enumerate(transports):
+            if sender_index == receiver_index:
+                continue
+            proxy = LatencyProxy(receiver.address, latency_ms, jitter_ms, loss, seed=seed * 100 + sender_index * 10 + receiver_index)
+            proxies.append(proxy)
+            sender.peer_addresses.append(proxy.address)
+
+    sessions = [RollbackSession(index, player_count, transports[index], match_seed=seed) for index in range(player_count)]
+    input_generators = [random.Random(seed * 1000 + index) for index in range(player_count)]
+    frame_interval_s = 1.0 / FPS
+
+    def random_bits(generator):
+        bits = 0
+        roll = generator.random()
+        if roll < 0.08:
+            bits |= INPUT_LEFT
+        elif roll < 0.16:
+            bits |= INPUT_RIGHT
+        elif roll < 0.22:
+            bits |= INPUT_ROTATE
+        if generator.random() < 0.2:
+            bits |= INPUT_DOWN_HELD
+        return bits
+
+    next_tick_s = time.perf_counter()
+    settle_deadline_s = None
+    while True:
+        for session, generator in zip(sessions, input_generators):
+            playing = session.frame < frames
+            session.advance(random_bits(generator) if playing else 0)
+        if all(session.frame >= frames for session in sessions):
+            if settle_deadline_s is None:
+                settle_deadline_s = time.perf_counter() + (latency_ms + jitter_ms) * 4 / 1000.0 + 0.5
+            if time.perf_counter() >= settle_deadline_s:
+                break
+        next_tick_s += frame_interval_s
+        time.sleep(max(0.0, next_tick_s - time.perf_counter()))
+
+    for proxy in proxies:
+        proxy.close()
+    for transport in transports:
+        transport.close()
+
+    shared_frames = set.intersection(*(set(session.board_checksums) for session in sessions))
+    mismatched_frames = [
+        frame for frame in sorted(shared_frames) if len({tuple(session.board_checksums[frame]) for session in sessions}) > 1
+    ]
+    for session in sessions:
+        print(f"player {session.player_index + 1}: {session.stats()}")
+    print(f"compared {len(shared_frames)} checkpoints, {len(mismatched_frames)} mismatched")
+    return 0 if shared_frames and not mismatched_frames else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rollback netcode multiplayer")
+    parser.add_argument("--players", type=int, default=2, choices=[2, 3])
+    parser.add_argument("--player", type=int, default=0, help="local player index, 0-based")
+    parser.add_argument("--bind", default="127.0.0.1:7000")
+    parser.add_argument("--peers", default="", help="comma separated host:port list")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--names", default="", help="comma separated player names")
+    parser.add_argument("--selftest", action="store_true")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--latency", type=float, default=60.0)
+    parser.add_argument("--jitter", type=float, default=10.0)
+    parser.add_argument("--loss", type=float, default=0.0)
+    parser.add_argument("--trace", nargs="?", const=TRACE_DEFAULT_PATH, help="write a Chrome trace to this path on exit")
+    args = parser.parse_args()
+
+    if args.selftest:
+        return run_selftest(args.players, args.frames, args.latency, args.jitter, args.loss, args.seed)
+
+    peers = [parse_address(peer) for peer in args.peers.split(",") if peer.strip()]
+    transport = UdpTransport(parse_address(args.bind), peers)
+    session = RollbackSession(args.player, args.players, transport, match_seed=args.seed)
+    names = [name.strip() for name in args.names.split(",") if name.strip()]
+    NetplayApp(session, names).run()
+    pg.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,273 @@
+"""Precomputed CPU placements for low-stack positions, looked up through mmap.
+
+The book is a sorted array of 64-bit position keys followed by one move byte
+per key. A key packs the current shape with the bottom OPENING_BOOK_ROWS rows
+of the board; a position only qualifies when nothing is stacked above those
+rows and the piece is still in its spawn column and rotation. Lookups are a
+binary search straight over the mapped file, so every process playing from the
+same book shares one copy of it in the page cache.
+
+The builder walks every position the medium CPU reaches from an empty board
+within --depth pieces, for all seven shapes, and stores the move its search
+picks, so a hit always plays exactly what the search would have played.
+
+Build:     python opening_book.py --build [--depth 6] [--jobs 4]
+Self-test: python opening_book.py --selftest
+"""
+
+import argparse
+import bisect
+import mmap
+import multiprocessing
+import os
+import random
+import struct
+import sys
+import time
+import zlib
+from array import array
+from typing import Optional
+
+from settings import FIELD_W, FIELD_H, FIELD_SIZE, INIT_POS_OFFSET, TETROMINOES, OPENING_BOOK_PATH, OPENING_BOOK_ROWS, OPENING_BOOK_DEPTH
+
+
+# Layout: header, then `count` little-endian uint64 keys in ascending order, then `count` move bytes
+BOOK_MAGIC = b"TBOK"
+BOOK_VERSION = 1
+BOOK_HEADER = struct.Struct("<4sBBHII")
+
+SHAPES = list(TETROMINOES.keys())
+SHAPE_CODES = {shape: index + 1 for index, shape in enumerate(SHAPES)}
+SPAWN_X, SPAWN_Y = int(INIT_POS_OFFSET.x), int(INIT_POS_OFFSET.y)
+
+
+def evaluation_fingerprint() -> int:
+    """Changes whenever the board or the medium CPU's weights change, which makes an old book stale"""
+    from ai_difficulty import HEURISTIC_WEIGHTS
+
+    return zlib.crc32(repr((sorted(HEURISTIC_WEIGHTS.items()), FIELD_W, FIELD_H, sorted(TETROMINOES.items()))).encode())
+
+
+def pack_rows(field_rows, stack_rows) -> int:
+    packed = 0
+    for row_offset in range(stack_rows):
+        row = field_rows[FIELD_H - 1 - row_offset]
+        packed |= sum(1 << grid_x for grid_x, cell in enumerate(row) if cell) << (FIELD_W * row_offset)
+    return packed
+
+
+def position_key(shape, packed_rows, stack_rows) -> int:
+    return SHAPE_CODES[shape] << (FIELD_W * stack_rows) | packed_rows
+
+
+def encode_move(move) -> int:
+    rotation_count, target_x = move
+    return rotation_count << 4 | target_x
+
+
+def decode_move(move_byte):
+    return move_byte >> 4, move_byte & 0x0F
+
+
+class OpeningBook:
+    def __init__(self, path: str = OPENING_BOOK_PATH):
+        self.path = path
+        with open(path, "rb") as file_handle:
+            self.mapping = mmap.mmap(file_handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.stack_rows, field_width, self.count, fingerprint = BOOK_HEADER.unpack_from(self.mapping, 0)
+        if magic != BOOK_MAGIC or version != BOOK_VERSION or field_width != FIELD_W:
+            raise ValueError("not a version %d opening book for a %d-wide board" % (BOOK_VERSION, FIELD_W))
+        if fingerprint != evaluation_fingerprint():
+            raise ValueError("built for different CPU weights or pieces, rebuild it")
+        if sys.byteorder != "little":
+            raise ValueError("books are read in place as little-endian keys")
+
+        keys_start = BOOK_HEADER.size
+        moves_start = keys_start + 8 * self.count
+        view = memoryview(self.mapping)
+        self.keys = view[keys_start:moves_start].cast("Q")
+        self.moves = view[moves_start:moves_start + self.count]
+
+    def lookup_key(self, key):
+        index = bisect.bisect_left(self.keys, key)
+        if index < self.count and self.keys[index] == key:
+            return decode_move(self.moves[index])
+        return None
+
+    def lookup(self, game):
+        """The stored placement for the game's current position, or None when the book does not cover it"""
+        if (game.field_w, game.field_h) != FIELD_SIZE or max(game.column_heights) > self.stack_rows:
+            return None
+        shape, rotation, pivot_x, pivot_y, _ = game.piece_state(game.tetromino)
+        # The book was searched from the spawn position; a piece that has fallen a little plans the same while the rows it sweeps are empty
+        if rotation != 0 or pivot_x != SPAWN_X or not game.rows_empty_through(max(pivot_y, SPAWN_Y) + 2):
+            return None
+        return self.lookup_key(position_key(shape, pack_rows(game.field_array, self.stack_rows), self.stack_rows))
+
+    def close(self):
+        self.keys.release()
+        self.moves.release()
+        self.mapping.close()
+
+
+_opening_book = None
+_opening_book_loaded = False
+
+
+def get_opening_book() -> Optional[OpeningBook]:
+    """Returns the shared book, or None when it has not been built"""
+    global _opening_book, _opening_book_loaded
+    if not _opening_book_loaded:
+        _opening_book_loaded = True
+        if os.path.exists(OPENING_BOOK_PATH):
+            try:
+                _opening_book = OpeningBook(OPENING_BOOK_PATH)
+            except (OSError, ValueError, struct.error) as error:
+                print(f"[Book] Ignoring opening book {OPENING_BOOK_PATH}: {error}")
+    return _opening_book
+
+
+def position_game(packed_rows, shape, stack_rows):
+    """A simulated game holding the packed rows, with the given shape at its spawn position"""
+    from TetrisGame import Tetris, SimulationApp
+
+    game = Tetris(SimulationApp([]), is_simulation=True, spawn_pieces=False, rng=random.Random(0))
+    for row_offset in range(stack_rows):
+        row_bits = packed_rows >> (FIELD_W * row_offset)
+        grid_y = FIELD_H - 1 - row_offset
+        for grid_x in range(FIELD_W):
+            if row_bits >> grid_x & 1:
+                game.field_array[grid_y][grid_x] = 1
+                game.column_heights[grid_x] = max(game.column_heights[grid_x], FIELD_H - grid_y)
+    piece = (shape, 0, SPAWN_X, SPAWN_Y, False)
+    game.tetromino = game.restore_piece(piece, is_current=True)
+    game.next_tetromino = game.restore_piece(piece, is_current=False)
+    return game
+
+
+def search_position(job):
+    """Runs the medium CPU's search on one position; returns (key, move byte, packed rows after the move or None)"""
+    from ai_difficulty import MediumAI
+
+    packed_rows, shape, stack_rows = job
+    game = position_game(packed_rows, shape, stack_rows)
+    agent = MediumAI()
+    agent.speculates = False
+    agent.uses_book = False
+    move = agent.choose_move(game)
+    if move is None:
+        return None
+
+    board, _, topped_out = game.simulate_placement(move)
+    next_rows = None
+    if not topped_out and not any(any(row) for row in board[:FIELD_H - stack_rows]):
+        next_rows = pack_rows(board, stack_rows)
+    return position_key(shape, packed_rows, stack_rows), encode_move(move), next_rows
+
+
+def build_book(path, depth, stack_rows, jobs):
+    if FIELD_W * stack_rows + 3 > 64:
+        raise ValueError("keys only have room for %d rows" % ((64 - 3) // FIELD_W))
+    entries = {}
+    seen_rows = {0}
+    frontier = [0]
+    start_s = time.perf_counter()
+    pool = multiprocessing.Pool(jobs) if jobs > 1 else None
+    try:
+        for level in range(depth + 1):
+            work = [(packed_rows, shape, stack_rows) for packed_rows in frontier for shape in SHAPES]
+            results = pool.map(search_position, work, chunksize=64) if pool else map(search_position, work)
+            frontier = []
+            for result in results:
+                if result is None:
+                    continue
+                key, move_byte, next_rows = result
+                entries[key] = move_byte
+                if next_rows is not None and next_rows not in seen_rows:
+                    seen_rows.add(next_rows)
+                    frontier.append(next_rows)
+            print(f"[Book] depth {level}: {len(entries)} positions, {time.perf_counter() - start_s:.0f}s")
+            if not frontier:
+                break
+    finally:
+        if pool:
+            pool.close()
+
+    keys = array("Q", sorted(entries))
+    moves = bytes(entries[key] for key in keys)
+    if sys.byteorder != "little":
+        keys.byteswap()
+    header = BOOK_HEADER.pack(BOOK_MAGIC, BOOK_VERSION, stack_rows, FIELD_W, len(keys), evaluation_fingerprint())
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file_handle:
+        file_handle.write(header)
+        file_handle.write(keys.tobytes())
+        file_handle.write(moves)
+    os.replace(temp_path, path)
+    print(f"[Book] Wrote {len(keys)} positions to {path} ({os.path.getsize(path) / 1024:.0f} KiB)")
+
+
+def run_selftest(path, game_count, piece_count):
+    """Plays seeded games with the medium CPU and checks every book hit against a full search"""
+    from TetrisGame import Tetris, SimulationApp
+    from ai_difficulty import MediumAI
+
+    book = OpeningBook(path)
+    searcher = MediumAI()
+    searcher.speculates = False
+    searcher.uses_book = False
+    decisions = 0
+    hits = 0
+    first_miss = []
+    mismatches = 0
+    lookup_s = 0.0
+    for game_index in range(game_count):
+        game = Tetris(SimulationApp([]), is_simulation=True, random_seed=game_index)
+        missed = False
+        for decision_index in range(piece_count):
+            if game.game_over_flag:
+                break
+            lookup_start_s = time.perf_counter()
+            book_move = book.lookup(game)
+            lookup_s += time.perf_counter() - lookup_start_s
+            searched_move = searcher.choose_move(game)
+            decisions += 1
+            if book_move is not None:
+                hits += 1
+                mismatches += book_move != searched_move
+            elif not missed:
+                missed = True
+                first_miss.append(decision_index)
+            game.apply_ai_move(searched_move)
+        if not missed:
+            first_miss.append(piece_count)
+
+    first_miss.sort()
+    print(f"{book.count} positions in {path}")
+    print(f"{hits}/{decisions} decisions answered by the book, {mismatches} differed from the search")
+    print(f"first miss at decision {first_miss[len(first_miss) // 2]} (median) over {game_count} games")
+    print(f"{lookup_s / decisions * 1e6:.1f} us per lookup")
+    book.close()
+    return 0 if mismatches == 0 else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or check the CPU opening book")
+    parser.add_argument("--path", default=OPENING_BOOK_PATH)
+    parser.add_argument("--build", action="store_true")
+    parser.add_argument("--depth", type=int, default=OPENING_BOOK_DEPTH, help="pieces to explore from the empty board")
+    parser.add_argument("--rows", type=int, default=OPENING_BOOK_ROWS, help="stack height the book covers")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--selftest", action="store_true")
+    parser.add_argument("--games", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.build:
+        build_book(args.path, args.depth, args.rows, args.jobs)
+    if args.selftest:
+        return run_selftest(args.path, args.games, 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+import json
+import math
+import os
+from typing import Dict, List, Optional, Tuple
+
+from settings import RATING_START, RATING_START_RD, RATING_MIN_RD, RATING_RD_GROWTH
+
+
+GLICKO_Q = math.log(10) / 400
+
+
+def glicko_g(rd: float) -> float:
+    return 1 / math.sqrt(1 + 3 * GLICKO_Q * GLICKO_Q * rd * rd / (math.pi * math.pi))
+
+
+class PlayerRating:
+    __slots__ = ("rating", "rd", "matches", "best_score")
+
+    def __init__(self, rating=RATING_START, rd=RATING_START_RD, matches=0, best_score=0):
+        self.rating = rating
+        self.rd = rd
+        self.matches = matches
+        self.best_score = best_score
+
+
+class RatingTable:
+    """Glicko ratings for every player and CPU difficulty, updated one match at a time.
+
+    A match with several boards is scored as a pairwise result between every
+    two boards (higher score wins, equal scores draw), and each player's update
+    uses all of their pairings at once, as one Glicko rating period.
+    """
+
+    def __init__(self):
+        self.players: Dict[str, PlayerRating] = {}
+        self.source_bytes: Dict[str, int] = {}
+        self.match_count = 0
+
+    def get(self, key: str) -> PlayerRating:
+        player = self.players.get(key)
+        if player is None:
+            player = self.players[key] = PlayerRating()
+        return player
+
+    def apply_match(self, entries: List[Tuple[str, int]]) -> None:
+        """entries is a list of (rating key, score), one per board"""
+        keys = {key for key, _ in entries}
+        if len(keys) < 2:
+            return
+
+        before = {}
+        for key in keys:
+            player = self.get(key)
+            rd = min(RATING_START_RD, math.sqrt(player.rd * player.rd + RATING_RD_GROWTH * RATING_RD_GROWTH))
+            before[key] = (player.rating, rd, glicko_g(rd))
+
+        for key in keys:
+            rating, rd, _ = before[key]
+            variance_inverse = 0.0
+            improvement = 0.0
+            for own_key, own_score in entries:
+                if own_key != key:
+                    continue
+                for other_key, other_score in entries:
+                    if other_key == key:
+                        continue
+                    other_rating, _, g_value = before[other_key]
+                    expected = 1 / (1 + 10 ** (g_value * (other_rating - rating) / 400))
+                    if own_score > other_score:
+                        outcome = 1.0
+                    elif own_score == other_score:
+                        outcome = 0.5
+                    else:
+                        outcome = 0.0
+                    variance_inverse += g_value * g_value * expected * (1 - expected)
+                    improvement += g_value * (outcome - expected)
+            variance_inverse *= GLICKO_Q * GLICKO_Q
+
+            precision = 1 / (rd * rd) + variance_inverse
+            player = self.players[key]
+            player.rating = rating + GLICKO_Q / precision * improvement
+            player.rd = max(RATING_MIN_RD, math.sqrt(1 / precision))
+            player.matches += 1
+
+        for key, score in entries:
+            player = self.players[key]
+            if score > player.best_score:
+                player.best_score = score
+        self.match_count += 1
+
+    def ranked(self) -> List[Tuple[str, PlayerRating]]:
+        return sorted(self.players.items(), key=lambda item: item[1].rating, reverse=True)
+
+    def to_dict(self) -> Dict:
+        return {
+            "source_bytes": self.source_bytes,
+            "matches": self.match_count,
+            "players": {
+                key: [round(player.rating, 4), round(player.rd, 4), player.matches, player.best_score]
+                for key, player in self.players.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "RatingTable":
+        table = cls()
+        table.source_bytes = {path: int(size) for path, size in data.get("source_bytes", {}).items()}
+        table.match_count = int(data.get("matches", 0))
+        for key, (rating, rd, matches, best_score) in data.get("players", {}).items():
+            table.players[key] = PlayerRating(float(rating), float(rd), int(matches), int(best_score))
+        return table
+
+    @classmethod
+    def load(cls, path: str) -> Optional["RatingTable"]:
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as file_handle:
+                return cls.from_dict(json.load(file_handle))
+        except (OSError, ValueError, TypeError) as error:
+            print(f"[Ratings] Ignoring unreadable ratings file {path}: {error}")
+            return None
+
+    def save(self, path: str) -> None:
+        temp_path = path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file_handle:
+            json.dump(self.to_dict(), file_handle, separators=(",", ":"))
+        os.replace(temp_path, path)
+
+    def write_rankings(self, path: str) -> None:
+        """Writes the rankings CSV to a temporary file and swaps it in, so readers never see half a file"""
+        temp_path = path + ".tmp"
+        with open(temp_path, "w", newline="", encoding="utf-8") as file_handle:
+            file_handle.write("rank,name,rating,rd,matches,best_score\n")
+            for rank, (key, player) in enumerate(self.ranked(), start=1):
+                file_handle.write(f"{rank},{key},{player.rating:.0f},{player.rd:.0f},{player.matches},{player.best_score}\n")
+        os.replace(temp_path, path)
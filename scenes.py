@@ -0,0 +1,169 @@
+"""One display surface, one clock and shared caches for every screen, with a stack of scenes on top.
+
+Each menu used to open its own window with set_display_mode(), which tore down
+and rebuilt the SDL renderer and framebuffer (and flashed the window) on every
+screen change. The SceneManager keeps the surface it was given and only asks
+for a new mode when a scene needs a different logical size, so moving between
+menus is a caption change and a redraw. Scenes are pushed when a screen opens
+and popped when it returns, and the scene underneath gets its size and caption
+back through resume(). Menus sleep in wait_for_events() and redraw only when
+menu_needs_redraw() says something changed.
+"""
+
+import functools
+import time
+
+import pygame as pg
+
+from settings import FONT_PATH, MENU_RES, MENU_IDLE_WAIT_MS
+from display import set_display_mode
+
+
+class Scene:
+    """A screen on the manager's stack, drawn at logical_size under caption"""
+
+    def __init__(self, caption: str, logical_size=MENU_RES):
+        self.caption = caption
+        self.logical_size = (int(logical_size[0]), int(logical_size[1]))
+
+    def enter(self, manager) -> None:
+        manager.show(self.logical_size, self.caption)
+
+    def resume(self, manager) -> None:
+        manager.show(self.logical_size, self.caption)
+
+    def exit(self, manager) -> None:
+        pass
+
+
+class SceneManager:
+    def __init__(self):
+        self.screen = None
+        self.logical_size = None
+        self.caption = None
+        self.clock = pg.time.Clock()
+        self.scenes = []
+
+        self.fonts = {}
+        self.font_warning_shown = False
+        self.backgrounds = {}
+
+        self.mode_changes = 0
+        self.transitions = 0
+        self.last_transition_ms = 0.0
+
+    def show(self, logical_size, caption: str = None):
+        """The display surface at logical_size; the mode is only set again when the size changes"""
+        logical_size = (int(logical_size[0]), int(logical_size[1]))
+        if self.screen is None or logical_size != self.logical_size or pg.display.get_surface() is not self.screen:
+            self.screen = set_display_mode(logical_size)
+            self.logical_size = logical_size
+            self.mode_changes += 1
+        if caption is not None and caption != self.caption:
+            pg.display.set_caption(caption)
+            self.caption = caption
+        return self.screen
+
+    def push(self, scene: Scene) -> Scene:
+        transition_start_s = time.perf_counter()
+        self.scenes.append(scene)
+        scene.enter(self)
+        self.finish_transition(transition_start_s)
+        return scene
+
+    def pop(self) -> Scene:
+        transition_start_s = time.perf_counter()
+        scene = self.scenes.pop()
+        scene.exit(self)
+        # A screen that quit pygame on its way out leaves nothing to resume onto
+        if self.scenes and pg.display.get_init():
+            self.scenes[-1].resume(self)
+        self.finish_transition(transition_start_s)
+        return scene
+
+    def finish_transition(self, transition_start_s: float) -> None:
+        self.transitions += 1
+        self.last_transition_ms = (time.perf_counter() - transition_start_s) * 1000.0
+        # The next scene's first tick should not count the previous screen's idle time
+        self.clock.tick()
+
+    def run(self, scene: Scene, body, *args, **kwargs):
+        """Runs body with scene on top of the stack and pops it however body returns"""
+        self.push(scene)
+        try:
+            return body(*args, **kwargs)
+        finally:
+            self.pop()
+
+    @property
+    def current(self):
+        return self.scenes[-1] if self.scenes else None
+
+    def font(self, font_size: int) -> pg.font.Font:
+        if font_size in self.fonts:
+            return self.fonts[font_size]
+        try:
+            font = pg.font.Font(FONT_PATH, font_size)
+        except FileNotFoundError:
+            if not self.font_warning_shown:
+                print("Warning: Custom font not found, using default pygame font")
+                self.font_warning_shown = True
+            font = pg.font.Font(None, font_size)
+        self.fonts[font_size] = font
+        return font
+
+    def background(self, width: int, height: int, top_colour, bottom_colour) -> pg.Surface:
+        """Vertical gradient, drawn once per size and colour pair"""
+        background_key = (width, height, tuple(top_colour), tuple(bottom_colour))
+        background_surface = self.backgrounds.get(background_key)
+        if background_surface is None:
+            background_surface = pg.Surface((width, height))
+            for y_pos in range(height):
+                blend_ratio = y_pos / height
+                red = int(top_colour[0] * (1 - blend_ratio) + bottom_colour[0] * blend_ratio)
+                green = int(top_colour[1] * (1 - blend_ratio) + bottom_colour[1] * blend_ratio)
+                blue = int(top_colour[2] * (1 - blend_ratio) + bottom_colour[2] * blend_ratio)
+                pg.draw.line(background_surface, (red, green, blue), (0, y_pos), (width, y_pos))
+            if pg.display.get_surface() is not None:
+                background_surface = background_surface.convert()
+            self.backgrounds[background_key] = background_surface
+        return background_surface
+
+
+_scene_manager = None
+
+
+def get_scene_manager() -> SceneManager:
+    global _scene_manager
+    if _scene_manager is None:
+        _scene_manager = SceneManager()
+    return _scene_manager
+
+
+def scene(caption: str, logical_size=MENU_RES):
+    """Decorator that runs a screen function as a scene; the function draws on get_scene_manager().screen"""
+
+    def decorate(screen_function):
+        @functools.wraps(screen_function)
+        def run_scene(*args, **kwargs):
+            return get_scene_manager().run(Scene(caption, logical_size), screen_function, *args, **kwargs)
+
+        return run_scene
+
+    return decorate
+
+
+def wait_for_events(timeout_ms=MENU_IDLE_WAIT_MS):
+    """Sleeps until an event arrives (or the timeout passes) instead of polling every frame"""
+    first_event = pg.event.wait(timeout_ms)
+    if first_event.type == pg.NOEVENT:
+        return []
+    return [first_event] + pg.event.get()
+
+
+def menu_needs_redraw(events, buttons, mouse_position):
+    """True when a button's hover state changed or anything other than plain mouse motion arrived"""
+    hover_changed = False
+    for button in buttons:
+        hover_changed = button.update(mouse_position) or hover_changed
+    return hover_changed or any(event.type != pg.MOUSEMOTION for event in events)
@@ -22,6 +22,8 @@ FIELD_SCALE_WIDTH, FIELD_SCALE_HEIGHT = 1.7, 1.0
 WIN_RES = WIN_W, WIN_H = FIELD_RES[0] * FIELD_SCALE_WIDTH, FIELD_RES[1] * FIELD_SCALE_HEIGHT
 
 SCREEN_RES = (1920, 1080)
+MENU_RES = (1280, 720)
+DISPLAY_FIT_FRACTION = 0.9
 
 WINDOW_RESOLUTION = WIN_RES
 WINDOW_WIDTH = WIN_W
@@ -103,6 +105,15 @@ def combined_fall_interval_ms(manual_speed: int, level: int) -> int:
 PAUSE_KEY_SOLO = pg.K_p
 PAUSE_KEY_MATCH = pg.K_p
 
+SOLO_CONTROLS = PLAYER_CONTROLS[3]
+# Held left/right repeat: delay before the first repeat, then the gap between repeats (at least 1 ms)
+REPEATING_ACTIONS = ("left", "right")
+DAS_MS = 150
+ARR_MS = 40
+
+MENU_IDLE_WAIT_MS = 250
+PAUSE_IDLE_WAIT_MS = 500
+
 LINE_CLEAR_PHRASES = {
     1: "SINGLE!",
     2: "DOUBLE!!",
@@ -114,10 +125,82 @@ LEADERBOARD_SOLO_CSV = "Leaderboard_Solo.csv"
 LEADERBOARD_2P_CSV = "Leaderboard_2P.csv"
 LEADERBOARD_3P_CSV = "Leaderboard_3P.csv"
 LEADERBOARD_CPU_CSV = "Leaderboard_CPU.csv"
+LEADERBOARD_SKETCH_ACCURACY = 0.02
+LEADERBOARD_RANKINGS_CSV = "Leaderboard_CPU_rankings.csv"
+LEADERBOARD_RATINGS_STATE = "Leaderboard_ratings.json"
+RATING_HISTORY_FILES = [LEADERBOARD_2P_CSV, LEADERBOARD_3P_CSV, LEADERBOARD_CPU_CSV]
 
-DEFAULT_PLAYER_NAMES = {1: "Player 1", 2: "Player 2", 3: "Player 3"}
-DEFAULT_CPU_NAMES = {"easy": "CPU Easy", "medium": "CPU Medium"}
+RATING_START = 1500.0
+RATING_START_RD = 350.0
+RATING_MIN_RD = 30.0
+RATING_RD_GROWTH = 20.0
+
+TELEMETRY_ENV_VAR = "TETRIS_TELEMETRY"
+TELEMETRY_DEFAULT_PATH = "telemetry.jsonl"
+
+TRACE_ENV_VAR = "TETRIS_TRACE"
+TRACE_DEFAULT_PATH = "trace.json"
+TRACE_BUFFER_EVENTS = 200000
+
+GC_ENV_VAR = "TETRIS_GC"
+GC_MODE_AUTOMATIC = "auto"
+GC_MODE_PIECES = "pieces"
 
-CPU_MOVE_DELAY_FRAMES = {"easy": 20, "medium": 10}
+IO_QUEUE_SIZE = 64
+IO_FLUSH_TIMEOUT_S = 5.0
 
-MATCH_WINDOW_RES = SCREEN_RES
\ No newline at end of file
+BOT_SERVER_PORT = 7300
+BOT_SERVER_MAX_GAMES = 4096
+BOT_SERVER_LINE_LIMIT = 64 * 1024
+BOT_SERVER_WRITE_BUFFER = 256 * 1024
+
+AUTOSAVE_PATH = "autosave.tsav"
+AUTOSAVE_INTERVAL_MS = 5000
+
+DEFAULT_PLAYER_NAMES = {1: "Player 1", 2: "Player 2", 3: "Player 3"}
+DEFAULT_CPU_NAMES = {"easy": "CPU Easy", "medium": "CPU Medium", "hard": "CPU Hard"}
+
+CPU_DIFFICULTY_BUDGETS = {
+    "easy": {"compute_ms": 0.5, "reaction_ms": 330},
+    "medium": {"compute_ms": 2.0, "reaction_ms": 170},
+    "hard": {"compute_ms": 2.0, "reaction_ms": 250},
+}
+AI_FRAME_BUDGET_MS = 4.0
+AI_SPECULATION_CANDIDATES = 3
+EXPECTIMAX_TIME_LIMIT_MS = 240
+EXPECTIMAX_ROOT_BEAM = 6
+EXPECTIMAX_NEXT_BEAM = 3
+EXPECTIMAX_WORKERS = None
+EXPECTIMAX_WORKER_NICENESS = 10
+OPENING_BOOK_PATH = "opening_book.tbk"
+OPENING_BOOK_ROWS = 6
+OPENING_BOOK_DEPTH = 6
+
+ARENA_MIN_BOARDS = 8
+ARENA_MAX_BOARDS = 64
+ARENA_DEFAULT_BOARDS = 16
+ARENA_WINDOW_RES = (1600, 900)
+ARENA_AI_FRAME_BUDGET_MS = 6.0
+ARENA_SECONDS_PER_LEVEL = 30
+
+NETPLAY_INPUT_DELAY_FRAMES = 2
+NETPLAY_MAX_ROLLBACK_FRAMES = 30
+NETPLAY_INPUT_REDUNDANCY = 8
+NETPLAY_MAX_INPUT_RESEND = 64
+NETPLAY_CHECKSUM_INTERVAL = 30
+NETPLAY_GRAVITY_FRAMES = ANIMATION_TIME_INTERVAL * FPS // 1000
+NETPLAY_FAST_GRAVITY_FRAMES = max(1, FAST_ANIMATION_TIME_INTERVAL * FPS // 1000)
+NETPLAY_TILE_SIZE = 30
+
+MATCH_WINDOW_RES = SCREEN_RES
+
+BOARD_PROCESSES_ENV_VAR = "TETRIS_BOARD_PROCESSES"
+BOARD_PROCESS_START_TIMEOUT_S = 60
+BOARD_PROCESS_READ_RETRIES = 64
+BOARD_PROCESS_SUMMARY_TIMEOUT_S = 5
+
+RENDERER_ENV_VAR = "TETRIS_RENDERER"
+RENDERER_SURFACE = "surface"
+RENDERER_TEXTURE = "texture"
+RENDERER_SOFTWARE = "software"
+TEXT_TEXTURE_CACHE_SIZE = 256
\ No newline at end of file
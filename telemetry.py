@@ -0,0 +1,147 @@
+import json
+import os
+import platform
+import time
+from array import array
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import pygame as pg
+
+from settings import TELEMETRY_ENV_VAR, TELEMETRY_DEFAULT_PATH
+from io_worker import get_io_worker
+
+
+LATENCY_BUCKETS_MS = [0.25, 0.5, 1, 2, 4, 8, 16, 33, 66]
+
+
+class LatencyHistogram:
+    def __init__(self, bucket_edges_ms: List[float] = None):
+        self.bucket_edges_ms = list(bucket_edges_ms or LATENCY_BUCKETS_MS)
+        self.counts = [0] * (len(self.bucket_edges_ms) + 1)
+        self.total_count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, value_ms: float) -> None:
+        bucket_index = 0
+        while bucket_index < len(self.bucket_edges_ms) and value_ms > self.bucket_edges_ms[bucket_index]:
+            bucket_index += 1
+        self.counts[bucket_index] += 1
+        self.total_count += 1
+        self.total_ms += value_ms
+        if value_ms > self.max_ms:
+            self.max_ms = value_ms
+
+    def to_dict(self) -> Dict:
+        labels = [f"<={edge}" for edge in self.bucket_edges_ms] + [f">{self.bucket_edges_ms[-1]}"]
+        return {
+            "count": self.total_count,
+            "mean_ms": round(self.total_ms / self.total_count, 4) if self.total_count else None,
+            "max_ms": round(self.max_ms, 4),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class FrameStats:
+    def __init__(self):
+        self.frame_times_ms = array("f")
+        self.active_ms = 0
+
+    def add(self, frame_ms: float) -> None:
+        self.frame_times_ms.append(frame_ms)
+        self.active_ms += frame_ms
+
+    def percentiles(self, count_label: str = "frames") -> Dict:
+        if not self.frame_times_ms:
+            return {}
+        ordered = sorted(self.frame_times_ms)
+        last_index = len(ordered) - 1
+        result = {}
+        for percentile in (50, 90, 99):
+            result[f"p{percentile}_ms"] = round(ordered[min(last_index, int(last_index * percentile / 100))], 3)
+        result["max_ms"] = round(ordered[-1], 3)
+        result[count_label] = len(ordered)
+        return result
+
+
+class TelemetryWriter:
+    """Appends JSON lines to a file on the shared background I/O worker"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.session_id = datetime.now().strftime("%Y%m%d-%H%M%S") + f"-{os.getpid()}"
+        self.io = get_io_worker()
+
+    def write(self, record: Dict) -> None:
+        record = dict(record)
+        record.setdefault("timestamp", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        record.setdefault("session", self.session_id)
+        self.io.submit(f"telemetry to {self.path}", self.append_line, json.dumps(record, separators=(",", ":")))
+
+    def append_line(self, line: str) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as file_handle:
+            file_handle.write(line + "\n")
+
+
+_telemetry_writer = None
+
+
+def get_telemetry() -> Optional[TelemetryWriter]:
+    """Returns the shared writer, or None unless telemetry was opted into"""
+    global _telemetry_writer
+
+    if _telemetry_writer is not None:
+        return _telemetry_writer
+
+    configured_path = os.environ.get(TELEMETRY_ENV_VAR, "").strip()
+    if not configured_path or configured_path == "0":
+        return None
+    if configured_path == "1":
+        configured_path = TELEMETRY_DEFAULT_PATH
+
+    _telemetry_writer = TelemetryWriter(configured_path)
+    return _telemetry_writer
+
+
+def machine_info() -> Dict:
+    return {
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "pygame": pg.version.ver,
+        "sdl": ".".join(str(part) for part in pg.get_sdl_version()),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def game_summary(tetris, active_ms: float) -> Dict:
+    active_seconds = active_ms / 1000.0
+    return {
+        "score": tetris.score,
+        "lines": tetris.lines_cleared,
+        "level": tetris.level,
+        "pieces": tetris.pieces_locked,
+        "pieces_per_second": round(tetris.pieces_locked / active_seconds, 3) if active_seconds > 0 else 0.0,
+        "active_seconds": round(active_seconds, 2),
+    }
+
+
+def agent_summary(agent, latency_histogram: LatencyHistogram) -> Dict:
+    cache_lookups = getattr(agent, "cache_lookups", 0)
+    cache_hits = getattr(agent, "cache_hits", 0)
+    book_lookups = getattr(agent, "book_lookups", 0)
+    book_hits = getattr(agent, "book_hits", 0)
+    return {
+        "agent": type(agent).__name__,
+        "decisions": latency_histogram.total_count,
+        "decision_latency": latency_histogram.to_dict(),
+        "candidates_evaluated": getattr(agent, "candidates_evaluated", 0),
+        "cache_hit_rate": round(cache_hits / cache_lookups, 4) if cache_lookups else None,
+        "speculative_evaluations": getattr(agent, "speculative_evaluations", 0),
+        "book_hit_rate": round(book_hits / book_lookups, 4) if book_lookups else None,
+    }
+
+
+def perf_ms() -> float:
+    return time.perf_counter() * 1000.0
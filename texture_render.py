@@ -0,0 +1,182 @@
+"""Optional board drawing through pygame._sdl2.video textures instead of Surface blits.
+
+TETRIS_RENDERER=texture opens the game in its own SDL window with a Renderer.
+The tiles are uploaded once as a single atlas texture, along with one board
+grid texture, so a frame is a list of texture copies. Text is rendered to a
+texture the first time it is drawn and reused until it changes.
+TETRIS_RENDERER=software does the same on SDL's software renderer, which
+works on machines without a GPU (and under the dummy video driver). The
+default, surface, keeps drawing onto the display surface as before. Only
+the solo game and versus matches use this backend; the menus, the arena and
+netplay always draw with Surfaces.
+"""
+
+import os
+
+import pygame as pg
+
+from settings import (
+    FIELD_SIZE,
+    TILE_SIZE,
+    RENDERER_ENV_VAR,
+    RENDERER_SURFACE,
+    RENDERER_TEXTURE,
+    RENDERER_SOFTWARE,
+    TEXT_TEXTURE_CACHE_SIZE,
+)
+from display import window_scale
+
+
+GRID_COLOUR = (50, 70, 110)
+GHOST_COLOUR = (200, 200, 220)
+
+
+def renderer_backend_from(environ) -> str:
+    configured_backend = environ.get(RENDERER_ENV_VAR, "").strip().lower()
+    if not configured_backend or configured_backend == RENDERER_SURFACE:
+        return RENDERER_SURFACE
+    if configured_backend in (RENDERER_TEXTURE, RENDERER_SOFTWARE):
+        return configured_backend
+    print(f"[Render] Unknown {RENDERER_ENV_VAR} backend {configured_backend!r}, drawing with Surfaces")
+    return RENDERER_SURFACE
+
+
+class TextureRenderer:
+    def __init__(self, logical_size, caption: str, images, software: bool = False):
+        from pygame._sdl2.video import Window, Renderer, Texture
+
+        self.texture_type = Texture
+        self.logical_size = (int(logical_size[0]), int(logical_size[1]))
+        scale = window_scale(self.logical_size)
+        os.environ["SDL_RENDER_SCALE_QUALITY"] = "nearest" if scale >= 1 else "linear"
+
+        # The display module's window stays open underneath for pg.display calls; keep it out of sight
+        self.display_window = None
+        if pg.display.get_surface() is not None:
+            self.display_window = Window.from_display_module()
+            self.display_window.hide()
+
+        self.window = Window(caption, size=(int(self.logical_size[0] * scale), int(self.logical_size[1] * scale)))
+        self.window.resizable = True
+        self.renderer = None
+        self.software = software
+        if not software:
+            try:
+                self.renderer = Renderer(self.window, accelerated=1)
+            except RuntimeError as error:
+                print(f"[Render] No accelerated renderer ({error}), using SDL's software renderer")
+                self.software = True
+        if self.renderer is None:
+            self.renderer = Renderer(self.window, accelerated=0)
+        self.renderer.logical_size = self.logical_size
+        self.backend = RENDERER_SOFTWARE if self.software else RENDERER_TEXTURE
+
+        self.tile_rects = {}
+        self.atlas = self.make_atlas(images)
+        self.grids = {FIELD_SIZE: Texture.from_surface(self.renderer, self.make_grid_surface(FIELD_SIZE))}
+        self.loose_tiles = {}
+        self.text_textures = {}
+        self.surface_textures = {}
+        self.uploads = 2
+
+    def make_atlas(self, images):
+        """One texture holding every tile side by side, plus the ghost outline as the last tile"""
+        atlas_surface = pg.Surface((TILE_SIZE * (len(images) + 1), TILE_SIZE), pg.SRCALPHA)
+        for tile_index, tile_image in enumerate(images):
+            atlas_surface.blit(tile_image, (tile_index * TILE_SIZE, 0))
+            self.tile_rects[id(tile_image)] = pg.Rect(tile_index * TILE_SIZE, 0, TILE_SIZE, TILE_SIZE)
+        self.ghost_rect = pg.Rect(len(images) * TILE_SIZE, 0, TILE_SIZE, TILE_SIZE)
+        pg.draw.rect(atlas_surface, GHOST_COLOUR, self.ghost_rect, 2)
+        return self.texture_type.from_surface(self.renderer, atlas_surface)
+
+    def make_grid_surface(self, field_size):
+        field_w, field_h = field_size
+        grid_surface = pg.Surface((field_w * TILE_SIZE, field_h * TILE_SIZE), pg.SRCALPHA)
+        for grid_x in range(field_w):
+            for grid_y in range(field_h):
+                pg.draw.rect(grid_surface, GRID_COLOUR, (grid_x * TILE_SIZE, grid_y * TILE_SIZE, TILE_SIZE, TILE_SIZE), 1)
+        return grid_surface
+
+    def clear(self, colour=(0, 0, 0)) -> None:
+        self.renderer.draw_color = (colour[0], colour[1], colour[2], 255)
+        self.renderer.clear()
+
+    def present(self) -> None:
+        self.renderer.present()
+
+    def draw_grid(self, offset_tiles, field_size=FIELD_SIZE) -> None:
+        grid = self.grids.get(field_size)
+        if grid is None:
+            grid = self.grids[field_size] = self.texture_type.from_surface(self.renderer, self.make_grid_surface(field_size))
+            self.uploads += 1
+        grid.draw(dstrect=(offset_tiles.x * TILE_SIZE, offset_tiles.y * TILE_SIZE))
+
+    def draw_ghost_cell(self, pixel_x, pixel_y) -> None:
+        self.atlas.draw(srcrect=self.ghost_rect, dstrect=(pixel_x, pixel_y, TILE_SIZE, TILE_SIZE))
+
+    def draw_tile(self, tile_image, pixel_x, pixel_y) -> None:
+        tile_rect = self.tile_rects.get(id(tile_image))
+        if tile_rect is not None:
+            self.atlas.draw(srcrect=tile_rect, dstrect=(pixel_x, pixel_y, TILE_SIZE, TILE_SIZE))
+            return
+        # Tiles made after start-up (the per-shape fallbacks) get a texture of their own
+        tile_texture = self.loose_tiles.get(id(tile_image))
+        if tile_texture is None:
+            tile_texture = self.loose_tiles[id(tile_image)] = self.texture_type.from_surface(self.renderer, tile_image)
+            self.uploads += 1
+        tile_texture.draw(dstrect=(pixel_x, pixel_y, TILE_SIZE, TILE_SIZE))
+
+    def text_texture(self, font, text: str, colour, size=None):
+        """Texture for text in font; size is only given for pygame.freetype fonts"""
+        text_key = (id(font), text, colour, size)
+        texture = self.text_textures.get(text_key)
+        if texture is None:
+            if len(self.text_textures) >= TEXT_TEXTURE_CACHE_SIZE:
+                self.text_textures.clear()
+            if size is None:
+                text_surface = font.render(text, True, colour)
+            else:
+                text_surface, _ = font.render(text, fgcolor=colour, size=size)
+            texture = self.text_textures[text_key] = self.texture_type.from_surface(self.renderer, text_surface)
+            self.uploads += 1
+        return texture
+
+    def draw_text(self, font, text: str, colour, size=None, alpha: int = 255, **anchor) -> None:
+        """Draws text placed by get_rect keywords such as topleft= or center="""
+        texture = self.text_texture(font, text, colour, size)
+        texture.alpha = alpha
+        texture.draw(dstrect=texture.get_rect(**anchor))
+
+    def draw_surface(self, surface, position=(0, 0)) -> None:
+        """Draws a surface that does not change once made (backgrounds, overlays), uploading it once"""
+        cached = self.surface_textures.get(id(surface))
+        if cached is None:
+            # The surface is kept alongside its texture so its id cannot be reused by another surface
+            cached = self.surface_textures[id(surface)] = (surface, self.texture_type.from_surface(self.renderer, surface))
+            self.uploads += 1
+        cached[1].draw(dstrect=(position[0], position[1]))
+
+    def close(self) -> None:
+        # Textures and the renderer have to go before the window they were made for
+        self.text_textures.clear()
+        self.surface_textures.clear()
+        self.loose_tiles.clear()
+        self.grids.clear()
+        self.atlas = None
+        self.renderer = None
+        self.window.destroy()
+        if self.display_window is not None:
+            self.display_window.show()
+
+
+def open_texture_renderer(environ, logical_size, caption: str, images):
+    """A TextureRenderer when the environment asks for one, otherwise None (draw with Surfaces)"""
+    backend = renderer_backend_from(environ)
+    if backend == RENDERER_SURFACE:
+        return None
+    try:
+        return TextureRenderer(logical_size, caption, images, software=backend == RENDERER_SOFTWARE)
+    # pygame._sdl2 raises its own error type; it and pygame.error are both RuntimeErrors
+    except (ImportError, RuntimeError) as error:
+        print(f"[Render] Texture backend unavailable ({error}), drawing with Surfaces")
+        return None
@@ -0,0 +1,109 @@
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+from settings import TRACE_ENV_VAR, TRACE_DEFAULT_PATH, TRACE_BUFFER_EVENTS
+
+
+def trace_path_from(argv, environ) -> Optional[str]:
+    """Output path from a --trace[=PATH] argument or the TETRIS_TRACE variable, or None when tracing is off"""
+    for index, argument in enumerate(argv):
+        if argument.startswith("--trace="):
+            return argument.split("=", 1)[1] or TRACE_DEFAULT_PATH
+        if argument == "--trace":
+            if index + 1 < len(argv) and not argv[index + 1].startswith("-"):
+                return argv[index + 1]
+            return TRACE_DEFAULT_PATH
+
+    configured_path = environ.get(TRACE_ENV_VAR, "").strip()
+    if not configured_path or configured_path == "0":
+        return None
+    if configured_path == "1":
+        return TRACE_DEFAULT_PATH
+    return configured_path
+
+
+class Tracer:
+    """Keeps the most recent spans in a ring buffer and writes them out as a Chrome trace.
+
+    Each span is stored as one complete ("X") event when it ends, so a span costs a
+    single deque append. The file opens in chrome://tracing or ui.perfetto.dev.
+    """
+
+    def __init__(self, path: str, capacity: int = TRACE_BUFFER_EVENTS):
+        self.path = path
+        self.events = deque(maxlen=capacity)
+        self.start_ns = time.perf_counter_ns()
+        self.thread_names: Dict[int, str] = {}
+
+    def now_us(self) -> float:
+        return (time.perf_counter_ns() - self.start_ns) / 1000.0
+
+    def record(self, name: str, start_us: float, end_us: float, args: Optional[Dict] = None) -> None:
+        thread = threading.current_thread()
+        if thread.ident not in self.thread_names:
+            self.thread_names[thread.ident] = thread.name
+        self.events.append((name, start_us, end_us - start_us, thread.ident, args))
+
+    def to_chrome_trace(self) -> Dict:
+        process_id = os.getpid()
+        trace_events = [
+            {"name": "thread_name", "ph": "M", "pid": process_id, "tid": thread_id, "args": {"name": thread_name}}
+            for thread_id, thread_name in self.thread_names.items()
+        ]
+        for name, start_us, duration_us, thread_id, args in list(self.events):
+            event = {
+                "name": name,
+                "ph": "X",
+                "ts": round(start_us, 3),
+                "dur": round(duration_us, 3),
+                "pid": process_id,
+                "tid": thread_id,
+            }
+            if args:
+                event["args"] = args
+            trace_events.append(event)
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def export(self, path: Optional[str] = None) -> None:
+        path = path or self.path
+        try:
+            with open(path, "w", encoding="utf-8") as file_handle:
+                json.dump(self.to_chrome_trace(), file_handle, separators=(",", ":"))
+            print(f"[Trace] Wrote {len(self.events)} spans to {path}")
+        except OSError as error:
+            print(f"[Trace] Could not write {path}: {error}")
+
+
+_trace_path = trace_path_from(sys.argv[1:], os.environ)
+tracer = Tracer(_trace_path) if _trace_path else None
+if tracer is not None:
+    atexit.register(tracer.export)
+
+
+def traced(name: str, describe: Callable = None):
+    """Wraps a function in a span when tracing is on; with tracing off the function is returned untouched.
+
+    describe, if given, is called with the function's arguments and returns the span's args.
+    """
+    def decorator(function):
+        if tracer is None:
+            return function
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start_us = tracer.now_us()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                tracer.record(name, start_us, tracer.now_us(), describe(*args, **kwargs) if describe else None)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,450 @@
+"""Steps many seeded headless games in lockstep for training and evaluating agents.
+
+Each step takes one placement per game, given as (rotations, target column) like
+Tetris.apply_ai_move, and fills preallocated NumPy arrays in place:
+
+  boards   uint8  (games, FIELD_H, FIELD_W)  locked cells
+  pieces   int8   (games, 2)                 current and next shape, as indices into SHAPES
+  heights  uint8  (games, FIELD_W)           column heights
+  rewards  float32 (games,)                  points scored by the placement
+  dones    bool   (games,)                   the placement topped out; that game has already been reset
+
+The same arrays are returned every step, so copy them to keep a history. With
+workers > 0 the games are split across processes that write straight into the
+arrays through shared memory.
+
+Benchmark: python vector_env.py --games 1024 --steps 200 [--workers 4]
+Self-test: python vector_env.py --selftest
+"""
+
+import argparse
+import multiprocessing
+import random
+import sys
+import time
+from array import array
+from collections import namedtuple
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from settings import FIELD_W, FIELD_H, INIT_POS_OFFSET, TETROMINOES
+from Tetromino import ROTATION_STATES, BOTTOM_PROFILES
+
+
+SHAPES = list(TETROMINOES.keys())
+SHAPE_INDICES = list(range(len(SHAPES)))
+SPAWN_X, SPAWN_Y = int(INIT_POS_OFFSET.x), int(INIT_POS_OFFSET.y)
+FULL_ROW = (1 << FIELD_W) - 1
+# Same table as Tetris.points_per_line
+LINE_CLEAR_POINTS = (0, 100, 300, 700, 1500)
+
+
+def build_piece_tables():
+    """Per shape and rotation: bounds, row masks for collisions and locking, and the bottom and top profiles"""
+    tables = []
+    for shape in SHAPES:
+        shape_tables = []
+        for rotation, offsets in enumerate(ROTATION_STATES[shape]):
+            min_dx = min(offset_x for offset_x, _ in offsets)
+            max_dx = max(offset_x for offset_x, _ in offsets)
+            min_dy = min(offset_y for _, offset_y in offsets)
+            max_dy = max(offset_y for _, offset_y in offsets)
+            row_masks = {}
+            top_by_column = {}
+            for offset_x, offset_y in offsets:
+                row_masks[offset_y] = row_masks.get(offset_y, 0) | 1 << (offset_x - min_dx)
+                top_by_column[offset_x] = min(top_by_column.get(offset_x, offset_y), offset_y)
+            shape_tables.append((
+                (min_dx, max_dx, min_dy, max_dy),
+                tuple(sorted(row_masks.items())),
+                BOTTOM_PROFILES[shape][rotation],
+                tuple(sorted(top_by_column.items())),
+            ))
+        tables.append(tuple(shape_tables))
+    return tuple(tables)
+
+
+PIECE_TABLES = build_piece_tables()
+
+
+class PlacementGame:
+    """One game reduced to placements, with its rows, heights and pieces kept in a slice of the shared arrays.
+
+    Rows are bitmasks with bit n set when column n is filled. The rules, scoring
+    and piece sequence match a simulated Tetris with the same seed.
+    """
+
+    __slots__ = ("rows", "heights", "pieces", "rng", "shape", "next_shape", "score", "pieces_locked")
+
+    def __init__(self, rows, heights, pieces, seed):
+        self.rows = rows
+        self.heights = heights
+        self.pieces = pieces
+        self.reset(seed)
+
+    def reset(self, seed):
+        self.rng = random.Random(seed)
+        self.shape = self.rng.choice(SHAPE_INDICES)
+        self.next_shape = self.rng.choice(SHAPE_INDICES)
+        self.score = 0
+        self.pieces_locked = 0
+        self.rows[:] = array("H", bytes(2 * FIELD_H))
+        self.heights[:] = array("B", bytes(FIELD_W))
+        self.pieces[0] = self.shape
+        self.pieces[1] = self.next_shape
+
+    def collides(self, rotation, pivot_x, pivot_y):
+        (min_dx, max_dx, _, max_dy), row_masks, _, _ = PIECE_TABLES[self.shape][rotation]
+        if pivot_x + min_dx < 0 or pivot_x + max_dx >= FIELD_W or pivot_y + max_dy >= FIELD_H:
+            return True
+        shift = pivot_x + min_dx
+        rows = self.rows
+        for offset_y, mask in row_masks:
+            grid_y = pivot_y + offset_y
+            if grid_y >= 0 and rows[grid_y] & (mask << shift):
+                return True
+        return False
+
+    def place(self, rotation_count, target_x):
+        """Plays one placement; returns (points, topped_out)"""
+        rotation, pivot_x, pivot_y = 0, SPAWN_X, SPAWN_Y
+        for _ in range(rotation_count):
+            if self.collides((rotation + 1) % 4, pivot_x, pivot_y):
+                break
+            rotation = (rotation + 1) % 4
+
+        step = 1 if target_x > pivot_x else -1
+        while pivot_x != target_x and not self.collides(rotation, pivot_x + step, pivot_y):
+            pivot_x += step
+
+        (min_dx, _, min_dy, _), row_masks, bottom_profile, top_profile = PIECE_TABLES[self.shape][rotation]
+        heights = self.heights
+        landing_y = FIELD_H
+        for offset_x, lowest_offset_y in bottom_profile:
+            resting_y = FIELD_H - heights[pivot_x + offset_x] - 1 - lowest_offset_y
+            if resting_y < landing_y:
+                landing_y = resting_y
+        if landing_y < pivot_y:
+            # Tucked under an overhang, so the surface does not bound it
+            landing_y = pivot_y
+            while not self.collides(rotation, pivot_x, landing_y + 1):
+                landing_y += 1
+
+        rows = self.rows
+        shift = pivot_x + min_dx
+        for offset_y, mask in row_masks:
+            grid_y = landing_y + offset_y
+            if grid_y >= 0:
+                rows[grid_y] |= mask << shift
+        for offset_x, top_offset_y in top_profile:
+            height = FIELD_H - landing_y - top_offset_y
+            if height > heights[pivot_x + offset_x]:
+                heights[pivot_x + offset_x] = min(height, FIELD_H)
+        self.pieces_locked += 1
+
+        # The piece always covers the pivot row, so this matches Tetris.check_game_over
+        if landing_y + min_dy <= 1:
+            return 0, True
+
+        full_rows = 0
+        for offset_y, _ in row_masks:
+            if rows[landing_y + offset_y] == FULL_ROW:
+                full_rows += 1
+        points = 0
+        if full_rows:
+            kept_rows = [row for row in rows if row != FULL_ROW]
+            rows[:] = array("H", [0] * full_rows + kept_rows)
+            for column_x in range(FIELD_W):
+                height = heights[column_x] - full_rows
+                column_bit = 1 << column_x
+                while height > 0 and not rows[FIELD_H - height] & column_bit:
+                    height -= 1
+                heights[column_x] = max(height, 0)
+            points = LINE_CLEAR_POINTS[full_rows]
+            self.score += points
+
+        self.shape = self.next_shape
+        self.next_shape = self.rng.choice(SHAPE_INDICES)
+        self.pieces[0] = self.shape
+        self.pieces[1] = self.next_shape
+        return points, False
+
+
+def buffer_layout(num_games):
+    """(name, shape, dtype, byte offset) of every array in the shared buffer, and its total size"""
+    fields = [
+        ("rows", (num_games, FIELD_H), np.uint16),
+        ("heights", (num_games, FIELD_W), np.uint8),
+        ("pieces", (num_games, 2), np.int8),
+        ("boards", (num_games, FIELD_H, FIELD_W), np.uint8),
+        ("board_scratch", (num_games, FIELD_H, FIELD_W), np.uint16),
+        ("actions", (num_games, 2), np.int16),
+        ("rewards", (num_games,), np.float32),
+        ("dones", (num_games,), np.bool_),
+        ("final_scores", (num_games,), np.int64),
+    ]
+    layout = []
+    offset = 0
+    for name, shape, dtype in fields:
+        layout.append((name, shape, dtype, offset))
+        offset += int(np.prod(shape)) * np.dtype(dtype).itemsize
+        offset = (offset + 7) & ~7
+    return layout, offset
+
+
+def map_arrays(buffer, num_games):
+    layout, _ = buffer_layout(num_games)
+    return {
+        name: np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset) for name, shape, dtype, offset in layout
+    }
+
+
+COLUMN_BITS = np.array([1 << column_x for column_x in range(FIELD_W)], dtype=np.uint16)
+
+
+class GameSlice:
+    """Steps games [start, stop) of the shared arrays; used in-process or inside one worker"""
+
+    def __init__(self, arrays, start, stop, seed):
+        self.arrays = arrays
+        self.start = start
+        self.stop = stop
+        self.num_games = len(arrays["rows"])
+        self.seed = seed
+        self.episodes = [0] * (stop - start)
+        self.games = [
+            PlacementGame(
+                memoryview(arrays["rows"][index]),
+                memoryview(arrays["heights"][index]),
+                memoryview(arrays["pieces"][index]),
+                self.episode_seed(index, 0),
+            )
+            for index in range(start, stop)
+        ]
+        self.render_boards()
+
+    def episode_seed(self, index, episode):
+        return self.seed + index + episode * self.num_games
+
+    def reset(self, seed):
+        self.seed = seed
+        self.episodes = [0] * (self.stop - self.start)
+        for index, game in enumerate(self.games, start=self.start):
+            game.reset(self.episode_seed(index, 0))
+        self.render_boards()
+
+    def step(self):
+        arrays = self.arrays
+        actions = arrays["actions"][self.start:self.stop].tolist()
+        rewards = []
+        dones = []
+        for local_index, game in enumerate(self.games):
+            rotation_count, target_x = actions[local_index]
+            points, topped_out = game.place(rotation_count, target_x)
+            if topped_out:
+                arrays["final_scores"][self.start + local_index] = game.score
+                self.episodes[local_index] += 1
+                game.reset(self.episode_seed(self.start + local_index, self.episodes[local_index]))
+            rewards.append(points)
+            dones.append(topped_out)
+        arrays["rewards"][self.start:self.stop] = rewards
+        arrays["dones"][self.start:self.stop] = dones
+        self.render_boards()
+
+    def render_boards(self):
+        rows = self.arrays["rows"][self.start:self.stop]
+        scratch = self.arrays["board_scratch"][self.start:self.stop]
+        np.bitwise_and(rows[:, :, None], COLUMN_BITS, out=scratch)
+        np.minimum(scratch, 1, out=self.arrays["boards"][self.start:self.stop], casting="unsafe")
+
+
+def run_worker(memory_name, num_games, start, stop, seed, connection):
+    memory = shared_memory.SharedMemory(name=memory_name)
+    try:
+        game_slice = GameSlice(map_arrays(memory.buf, num_games), start, stop, seed)
+        connection.send("ready")
+        while True:
+            command, argument = connection.recv()
+            if command == "step":
+                game_slice.step()
+            elif command == "reset":
+                game_slice.reset(argument)
+            elif command == "close":
+                break
+            connection.send(command)
+    finally:
+        game_slice = None
+        memory.close()
+
+
+Observation = namedtuple("Observation", ["boards", "pieces", "heights"])
+
+
+class VectorTetris:
+    """N independent seeded games stepped together, one placement each per step"""
+
+    def __init__(self, num_games, seed=0, workers=0):
+        self.num_games = num_games
+        self.seed = seed
+        self.workers = max(0, min(int(workers), num_games))
+        self.memory = None
+        self.connections = []
+        self.processes = []
+
+        _, buffer_size = buffer_layout(num_games)
+        if self.workers:
+            self.memory = shared_memory.SharedMemory(create=True, size=buffer_size)
+            buffer = self.memory.buf
+        else:
+            buffer = bytearray(buffer_size)
+        self.arrays = map_arrays(buffer, num_games)
+        self.observation = Observation(self.arrays["boards"], self.arrays["pieces"], self.arrays["heights"])
+        self.rewards = self.arrays["rewards"]
+        self.dones = self.arrays["dones"]
+        self.final_scores = self.arrays["final_scores"]
+
+        if not self.workers:
+            self.local_slice = GameSlice(self.arrays, 0, num_games, seed)
+            return
+
+        bounds = np.linspace(0, num_games, self.workers + 1).astype(int)
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            parent_connection, child_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=run_worker,
+                args=(self.memory.name, num_games, int(start), int(stop), seed, child_connection),
+                daemon=True,
+            )
+            process.start()
+            self.connections.append(parent_connection)
+            self.processes.append(process)
+        for connection in self.connections:
+            connection.recv()
+
+    def broadcast(self, command, argument=None):
+        for connection in self.connections:
+            connection.send((command, argument))
+        for connection in self.connections:
+            connection.recv()
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.seed = seed
+        if self.workers:
+            self.broadcast("reset", self.seed)
+        else:
+            self.local_slice.reset(self.seed)
+        return self.observation
+
+    def step(self, actions):
+        """actions is (num_games, 2) of (rotations, target column); returns (observation, rewards, dones)"""
+        self.arrays["actions"][:] = actions
+        if self.workers:
+            self.broadcast("step")
+        else:
+            self.local_slice.step()
+        return self.observation, self.rewards, self.dones
+
+    def close(self):
+        for connection in self.connections:
+            connection.send(("close", None))
+        for process in self.processes:
+            process.join()
+        self.connections = []
+        self.processes = []
+        if self.memory is not None:
+            self.arrays = None
+            self.observation = self.rewards = self.dones = self.final_scores = None
+            self.memory.close()
+            self.memory.unlink()
+            self.memory = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def run_selftest(game_count, placement_count, seed):
+    """Plays random placements through the vector env and real simulated Tetris games side by side"""
+    from TetrisGame import Tetris, SimulationApp
+
+    env = VectorTetris(game_count, seed=seed)
+    chooser = np.random.default_rng(seed)
+    references = [
+        Tetris(SimulationApp([]), is_simulation=True, random_seed=seed + index) for index in range(game_count)
+    ]
+    episodes = [0] * game_count
+    mismatches = 0
+    lines_scored = 0
+    for _ in range(placement_count):
+        # Half the games aim at their lowest column so that lines actually get cleared
+        target_columns = chooser.integers(0, FIELD_W, game_count)
+        target_columns[::2] = env.observation.heights[::2].argmin(axis=1)
+        actions = np.stack([chooser.integers(0, 4, game_count), target_columns], axis=1)
+        _, rewards, dones = env.step(actions)
+        lines_scored += int(np.count_nonzero(rewards))
+        for index, reference in enumerate(references):
+            score_before = reference.score
+            reference.apply_ai_move(tuple(int(value) for value in actions[index]))
+            if reference.game_over_flag != bool(dones[index]) or reference.score - score_before != rewards[index]:
+                mismatches += 1
+            if reference.game_over_flag:
+                if reference.score != env.final_scores[index]:
+                    mismatches += 1
+                episodes[index] += 1
+                references[index] = reference = Tetris(
+                    SimulationApp([]), is_simulation=True, random_seed=seed + index + episodes[index] * game_count
+                )
+            board = [[1 if cell else 0 for cell in row] for row in reference.field_array]
+            shapes = [SHAPES.index(reference.tetromino.shape), SHAPES.index(reference.next_tetromino.shape)]
+            if (
+                env.observation.boards[index].tolist() != board
+                or env.observation.heights[index].tolist() != reference.column_heights
+                or env.observation.pieces[index].tolist() != shapes
+            ):
+                mismatches += 1
+    print(f"{placement_count * game_count} placements over {game_count} games, {sum(episodes)} resets, "
+          f"{lines_scored} scoring placements, {mismatches} mismatches")
+    return 0 if mismatches == 0 else 1
+
+
+def run_benchmark(game_count, step_count, workers, seed):
+    chooser = np.random.default_rng(seed)
+    action_batches = [
+        np.stack([chooser.integers(0, 4, game_count), chooser.integers(0, FIELD_W, game_count)], axis=1)
+        for _ in range(min(step_count, 64))
+    ]
+    with VectorTetris(game_count, seed=seed, workers=workers) as env:
+        resets = 0
+        start_s = time.perf_counter()
+        for step_index in range(step_count):
+            _, _, dones = env.step(action_batches[step_index % len(action_batches)])
+            resets += int(dones.sum())
+        elapsed_s = time.perf_counter() - start_s
+    placements = game_count * step_count
+    print(
+        f"{placements} placements over {game_count} games with {workers} workers in {elapsed_s:.2f}s "
+        f"({placements / elapsed_s:,.0f}/s, {resets} resets)"
+    )
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vectorized headless Tetris environment")
+    parser.add_argument("--games", type=int, default=1024)
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=0, help="worker processes sharing the arrays (0 runs in-process)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--selftest", action="store_true")
+    args = parser.parse_args()
+
+    if args.selftest:
+        return run_selftest(32, 300, args.seed)
+    return run_benchmark(args.games, args.steps, args.workers, args.seed)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
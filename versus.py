@@ -1,15 +1,26 @@
 import pygame as pg
-import pathlib
 
 from settings import *
 from TetrisGame import Tetris
 from ai_difficulty import get_ai_by_difficulty
 from leaderboard_manager import append_match_results
+from ai_scheduler import AIScheduler
+from telemetry import get_telemetry, FrameStats, LatencyHistogram, machine_info, game_summary, agent_summary
+from autosave import get_autosave, take_snapshot, MODE_MATCH
+from tracing import traced
+from display import load_tile_images
+from scenes import get_scene_manager, wait_for_events
+from frame_memory import start_frame_memory, stop_frame_memory
+from texture_render import open_texture_renderer
+from board_processes import BoardProcesses, board_processes_from
+from controls import KeyDispatch
+
+import os
+import time
 
 class MatchApp:
-    def __init__(self, total_players=2, cpu_opponents=1, cpu_difficulty="medium", player_names=None):
+    def __init__(self, total_players=2, cpu_opponents=1, cpu_difficulty="medium", player_names=None, board_processes=None):
         pg.init()
-        pg.display.set_caption("Tetris – Versus")
 
         self.total_players = max(2, min(3, int(total_players)))
         self.cpu_opponents = max(0, min(2, int(cpu_opponents)))
@@ -17,7 +28,7 @@ class MatchApp:
             self.cpu_opponents = 1
 
         self.cpu_difficulty = str(cpu_difficulty).lower().strip()
-        if self.cpu_difficulty not in ("easy", "medium"):
+        if self.cpu_difficulty not in ("easy", "medium", "hard"):
             self.cpu_difficulty = "medium"
 
         self.human_players = self.total_players - self.cpu_opponents
@@ -58,8 +69,9 @@ class MatchApp:
             margin_left = max(20, (max_width - total_boards_width) // 2)
             window_width = min(max_width, margin_left * 2 + total_boards_width)
 
-        self.screen = pg.display.set_mode((int(window_width), int(window_height)))
-        self.clock = pg.time.Clock()
+        scene_manager = get_scene_manager()
+        self.screen = scene_manager.show((window_width, window_height), "Tetris – Versus")
+        self.clock = scene_manager.clock
 
         self.margin_left = int(margin_left)
         self.margin_top = int(margin_top)
@@ -68,18 +80,24 @@ class MatchApp:
         self.board_height = board_height
 
         self.images = self.load_sprites()
+        self.texture_renderer = open_texture_renderer(os.environ, (window_width, window_height), "Tetris – Versus", self.images)
+        self.background = None
 
         self.normal_tick_event = pg.USEREVENT + 0
         self.fast_tick_event = pg.USEREVENT + 1
+        self.autosave_event = pg.USEREVENT + 2
         self.animation_trigger = False
         self.fast_animation_trigger = False
-        pg.time.set_timer(self.normal_tick_event, ANIMATION_TIME_INTERVAL)
-        pg.time.set_timer(self.fast_tick_event, FAST_ANIMATION_TIME_INTERVAL)
+        self.set_timers()
 
         self.games = []
+        self.ai_scheduler = AIScheduler()
         self.is_cpu_board = []
         self.cpu_agents = []
         self.board_positions = []
+        if board_processes is None:
+            board_processes = board_processes_from(os.environ)
+        board_specs = []
 
         for board_index in range(self.total_players):
             board_x = self.margin_left + board_index * (board_width + self.gap)
@@ -89,38 +107,57 @@ class MatchApp:
 
             self.board_positions.append((board_x, board_y))
 
+            is_cpu = board_index >= self.human_players
+            self.is_cpu_board.append(is_cpu)
+            if board_processes:
+                # The board and its CPU live in a worker; see board_processes.py
+                board_specs.append((vec(offset_x_tiles, offset_y_tiles), is_cpu, not is_cpu))
+                self.cpu_agents.append(None)
+                continue
+
             game = Tetris(self, offset_tiles=vec(offset_x_tiles, offset_y_tiles), is_simulation=False, solo_mode=False)
             self.games.append(game)
 
-            is_cpu = board_index >= self.human_players
-            self.is_cpu_board.append(is_cpu)
+            game.show_ghost = not is_cpu
             self.cpu_agents.append(get_ai_by_difficulty(self.cpu_difficulty) if is_cpu else None)
+            if is_cpu:
+                self.ai_scheduler.add_agent(board_index, game, self.cpu_agents[board_index], self.cpu_difficulty)
 
-        self.cpu_move_delay = 20
-        self.cpu_move_timers = [0] * self.total_players
+        self.board_workers = None
+        if board_specs:
+            self.board_workers = BoardProcesses(self, board_specs, self.cpu_difficulty)
+            self.games = self.board_workers.views
 
-        self.human_controls = [
-            {"left": pg.K_a, "right": pg.K_d, "rotate": pg.K_w, "down": pg.K_s},
-            {"left": pg.K_j, "right": pg.K_l, "rotate": pg.K_i, "down": pg.K_k},
-            {"left": pg.K_LEFT, "right": pg.K_RIGHT, "rotate": pg.K_UP, "down": pg.K_DOWN},
-        ]
+        self.human_controls = [PLAYER_CONTROLS[player_number] for player_number in sorted(PLAYER_CONTROLS)]
+        # Worker boards only show an input once the worker publishes it, so their latency comes from the workers instead
+        self.key_dispatch = KeyDispatch(
+            self.human_controls[:self.human_players], self.apply_action, measure_latency=self.board_workers is None
+        )
 
         self.match_finished = False
         self.results_saved = False
 
+        self.autosave = get_autosave()
+        self.checkpoint_cleared = False
+
         self.paused = False
         self.pause_font = pg.font.Font(None, 96)
+        self.pause_overlay = None
+        self.pause_drawn = False
+
+        self.heading_font = pg.font.Font(None, 42)
+        self.score_font = pg.font.Font(None, 36)
+        self.status_font = pg.font.Font(None, 28)
+        self.finish_font = pg.font.Font(None, 64)
+
+        self.telemetry = get_telemetry()
+        self.frame_stats = FrameStats()
+        self.cpu_latency = [LatencyHistogram() for _ in range(self.total_players)]
+        self.board_active_ms = [0] * self.total_players
+        self.frame_memory, self.gc_schedule = start_frame_memory(os.environ)
 
     def load_sprites(self):
-        sprite_dir = pathlib.Path(SPRITE_DIRECTORY_PATH)
-        if not sprite_dir.exists():
-            return self.make_fallback_sprites()
-        sprite_files = [f for f in sprite_dir.rglob("*.png") if f.is_file()]
-        if not sprite_files:
-            return self.make_fallback_sprites()
-        images = [pg.image.load(f).convert_alpha() for f in sprite_files]
-        scaled = [pg.transform.scale(img, (TILE_SIZE, TILE_SIZE)) for img in images]
-        return scaled
+        return load_tile_images(TILE_SIZE) or self.make_fallback_sprites()
 
     def make_fallback_sprites(self):
         colours = [
@@ -140,16 +177,73 @@ class MatchApp:
             sprites.append(surface)
         return sprites
 
+    def set_timers(self):
+        pg.time.set_timer(self.normal_tick_event, ANIMATION_TIME_INTERVAL)
+        pg.time.set_timer(self.fast_tick_event, FAST_ANIMATION_TIME_INTERVAL)
+        pg.time.set_timer(self.autosave_event, AUTOSAVE_INTERVAL_MS)
+
     def toggle_pause(self):
         self.paused = not self.paused
+        self.pause_drawn = False
         if self.paused:
             for game in self.games:
                 game.speed_up = False
+            self.key_dispatch.release_all()
+            pg.time.set_timer(self.normal_tick_event, 0)
+            pg.time.set_timer(self.fast_tick_event, 0)
+            pg.time.set_timer(self.autosave_event, 0)
+            self.save_checkpoint()
+        else:
+            self.set_timers()
+            self.clock.tick()
+        if self.board_workers is not None:
+            self.board_workers.set_paused(self.paused)
+
+    def get_events(self):
+        """Blocks while paused so an idle pause screen does not spin the CPU"""
+        if self.paused:
+            return wait_for_events(PAUSE_IDLE_WAIT_MS)
+        return pg.event.get()
+
+    def save_checkpoint(self):
+        """Hands a copy of the match to the autosave thread, which does the encoding and file writing"""
+        if self.match_finished or self.board_workers is not None:
+            return
+        self.autosave.save(
+            take_snapshot(
+                MODE_MATCH,
+                self.games,
+                self.images,
+                [self.cpu_difficulty] + self.player_names,
+                self.cpu_opponents,
+            )
+        )
+
+    def restore_checkpoint(self, checkpoint):
+        for game, board in zip(self.games, checkpoint.boards):
+            game.load_checkpoint(board.state, board.cell_images, board.piece_images)
+        self.match_finished = all(game.game_over_flag for game in self.games)
+        self.toggle_pause()
+
+    def stop_frame_memory(self):
+        stop_frame_memory(self.frame_memory, self.gc_schedule)
+        self.gc_schedule = None
+
+    def quit_game(self):
+        self.save_checkpoint()
+        self.autosave.flush()
+        self.stop_frame_memory()
+        if self.board_workers is not None:
+            self.board_workers.close()
+        pg.quit()
+        raise SystemExit
 
     def handle_input(self, game, action):
         if game.game_over_flag:
             return
-        if action == "left":
+        if self.board_workers is not None:
+            game.send_input(action)
+        elif action == "left":
             game.tetromino.move(direction="left")
         elif action == "right":
             game.tetromino.move(direction="right")
@@ -157,24 +251,17 @@ class MatchApp:
             game.tetromino.rotate()
         elif action == "down":
             game.speed_up = True
+        elif action == "release":
+            game.speed_up = False
+
+    def apply_action(self, board_index, action):
+        self.handle_input(self.games[board_index], action)
 
     def update_cpu(self):
-        for board_index in range(self.total_players):
-            if not self.is_cpu_board[board_index]:
-                continue
-            game = self.games[board_index]
-            if game.game_over_flag:
-                continue
-            self.cpu_move_timers[board_index] += 1
-            if self.cpu_move_timers[board_index] < self.cpu_move_delay:
-                continue
-            self.cpu_move_timers[board_index] = 0
-            agent = self.cpu_agents[board_index]
-            if agent is None:
-                continue
-            chosen_move = agent.choose_move(game)
+        for slot, chosen_move in self.ai_scheduler.update(self.clock.get_time()):
+            self.cpu_latency[slot.board_index].add(slot.spent_ms)
             if chosen_move:
-                game.apply_ai_move(chosen_move)
+                slot.game.apply_ai_move(chosen_move)
 
     def save_results(self):
         if not self.match_finished or self.results_saved:
@@ -193,59 +280,86 @@ class MatchApp:
                     "name": self.player_names[board_index],
                     "score": self.games[board_index].score,
                     "is_cpu": self.is_cpu_board[board_index],
+                    "difficulty": self.cpu_difficulty,
                 }
             )
 
         append_match_results(history_file, results)
         self.results_saved = True
+        self.write_telemetry()
 
+    def write_telemetry(self):
+        self.stop_frame_memory()
+        if self.telemetry is None:
+            return
+        boards = []
+        for board_index in range(self.total_players):
+            board = {"is_cpu": self.is_cpu_board[board_index]}
+            if self.board_workers is not None:
+                board.update(self.games[board_index].finished_summary or {})
+                boards.append(board)
+                continue
+            board.update(game_summary(self.games[board_index], self.board_active_ms[board_index]))
+            agent = self.cpu_agents[board_index]
+            if agent is not None:
+                board.update(agent_summary(agent, self.cpu_latency[board_index]))
+            boards.append(board)
+        self.telemetry.write(
+            {
+                "kind": "match",
+                "board_processes": self.board_workers is not None,
+                "players": self.total_players,
+                "cpu_opponents": self.cpu_opponents,
+                "cpu_difficulty": self.cpu_difficulty,
+                "boards": boards,
+                "frame_times": self.frame_stats.percentiles(),
+                "memory": self.frame_memory.to_dict([] if self.board_workers else self.games),
+                "input_latency": self.board_workers.input_latency() if self.board_workers else None,
+                "input": self.key_dispatch.summary(),
+                "renderer": self.texture_renderer.backend if self.texture_renderer else RENDERER_SURFACE,
+                "machine": machine_info(),
+            }
+        )
+
+    @traced("MatchApp.check_events")
     def check_events(self):
         self.animation_trigger = False
         self.fast_animation_trigger = False
 
-        for event in pg.event.get():
+        stamp_s = time.perf_counter()
+        for event in self.key_dispatch.take_events(self.get_events()):
             if event.type == pg.QUIT:
-                pg.quit()
-                raise SystemExit
+                self.quit_game()
             if event.type == pg.KEYDOWN and event.key == pg.K_ESCAPE:
-                pg.quit()
-                raise SystemExit
+                self.quit_game()
+
+            if event.type == self.autosave_event:
+                self.save_checkpoint()
+                continue
 
             if event.type == pg.KEYDOWN and event.key == PAUSE_KEY_MATCH:
                 self.toggle_pause()
 
             if self.paused:
+                if event.type == pg.WINDOWEXPOSED:
+                    self.pause_drawn = False
                 continue
 
-            if event.type == pg.KEYDOWN:
-                for human_index in range(self.human_players):
-                    game = self.games[human_index]
-                    if game.game_over_flag:
-                        continue
-                    mapping = self.human_controls[human_index]
-                    if event.key == mapping["left"]:
-                        self.handle_input(game, "left")
-                    elif event.key == mapping["right"]:
-                        self.handle_input(game, "right")
-                    elif event.key == mapping["rotate"]:
-                        self.handle_input(game, "rotate")
-                    elif event.key == mapping["down"]:
-                        self.handle_input(game, "down")
-
-            if event.type == pg.KEYUP:
-                for human_index in range(self.human_players):
-                    mapping = self.human_controls[human_index]
-                    if event.key == mapping["down"]:
-                        self.games[human_index].speed_up = False
+            if self.key_dispatch.handle(event, stamp_s):
+                continue
 
             if event.type == self.normal_tick_event:
                 self.animation_trigger = True
             if event.type == self.fast_tick_event:
                 self.fast_animation_trigger = True
 
+    def pieces_locked(self):
+        return sum(game.pieces_locked for game in self.games)
+
     def update(self):
         if self.paused:
-            self.clock.tick(FPS)
+            if self.gc_schedule:
+                self.gc_schedule.after_frame(self.pieces_locked(), idle=True)
             return
 
         self.update_cpu()
@@ -254,30 +368,53 @@ class MatchApp:
 
         self.match_finished = all(game.game_over_flag for game in self.games)
         self.save_results()
-        self.clock.tick(FPS)
-
-    def draw_pause_overlay(self):
+        if self.match_finished and not self.checkpoint_cleared:
+            self.autosave.clear()
+            self.checkpoint_cleared = True
+        frame_ms = self.key_dispatch.wait_for_frame(self.clock, FPS)
+        if not self.match_finished:
+            self.frame_stats.add(frame_ms)
+            self.frame_memory.frame_done()
+            for board_index, game in enumerate(self.games):
+                if not game.game_over_flag:
+                    self.board_active_ms[board_index] += frame_ms
+        if self.gc_schedule:
+            self.gc_schedule.after_frame(self.pieces_locked(), idle=self.match_finished)
+
+    def make_pause_overlay(self):
         screen_width, screen_height = self.screen.get_size()
         overlay = pg.Surface((screen_width, screen_height), pg.SRCALPHA)
         overlay.fill((0, 0, 0, 140))
-        self.screen.blit(overlay, (0, 0))
 
         paused_text = self.pause_font.render("PAUSED", True, (255, 255, 255))
         paused_rect = paused_text.get_rect(center=(screen_width // 2, screen_height // 2))
-        self.screen.blit(paused_text, paused_rect)
+        overlay.blit(paused_text, paused_rect)
 
         hint_text = pg.font.Font(None, 36).render("Press P to resume", True, (220, 220, 220))
         hint_rect = hint_text.get_rect(center=(screen_width // 2, screen_height // 2 + 70))
-        self.screen.blit(hint_text, hint_rect)
+        overlay.blit(hint_text, hint_rect)
+        return overlay
 
+    def draw_pause_overlay(self):
+        if self.pause_overlay is None:
+            self.pause_overlay = self.make_pause_overlay()
+        self.screen.blit(self.pause_overlay, (0, 0))
+
+    @traced("MatchApp.draw")
     def draw(self):
-        window_width, window_height = self.screen.get_size()
-        for y in range(window_height):
-            blend = y / window_height
-            red = int(25 * (1 - blend) + 40 * blend)
-            green = int(30 * (1 - blend) + 20 * blend)
-            blue = int(50 * (1 - blend) + 60 * blend)
-            pg.draw.line(self.screen, (red, green, blue), (0, y), (window_width, y))
+        if self.paused:
+            if self.pause_drawn:
+                return
+            self.pause_drawn = True
+
+        if self.background is None:
+            self.background = self.make_background()
+
+        if self.texture_renderer:
+            self.draw_textures()
+            return
+
+        self.screen.blit(self.background, (0, 0))
 
         for game in self.games:
             game.draw()
@@ -288,37 +425,68 @@ class MatchApp:
             self.draw_pause_overlay()
 
         pg.display.flip()
+        self.key_dispatch.presented()
 
-    def draw_labels(self):
-        heading_font = pg.font.Font(None, 42)
-        score_font = pg.font.Font(None, 36)
-        status_font = pg.font.Font(None, 28)
+    def draw_textures(self):
+        renderer = self.texture_renderer
+        renderer.draw_surface(self.background)
 
+        for game in self.games:
+            game.draw_textures(renderer)
+
+        for font, text, colour, anchor in self.labels():
+            renderer.draw_text(font, text, colour, **anchor)
+
+        if self.paused:
+            if self.pause_overlay is None:
+                self.pause_overlay = self.make_pause_overlay()
+            renderer.draw_surface(self.pause_overlay)
+
+        renderer.present()
+        self.key_dispatch.presented()
+
+    def make_background(self):
+        window_width, window_height = self.screen.get_size()
+        background = pg.Surface((window_width, window_height))
+        for y in range(window_height):
+            blend = y / window_height
+            red = int(25 * (1 - blend) + 40 * blend)
+            green = int(30 * (1 - blend) + 20 * blend)
+            blue = int(50 * (1 - blend) + 60 * blend)
+            pg.draw.line(background, (red, green, blue), (0, y), (window_width, y))
+        return background
+
+    def labels(self):
+        """(font, text, colour, get_rect placement) for the names, scores and match status"""
+        match_labels = []
         for board_index in range(self.total_players):
-            name = self.player_names[board_index]
             game = self.games[board_index]
             board_x, board_y = self.board_positions[board_index]
-
-            name_text = heading_font.render(name, True, (255, 255, 150))
-            name_rect = name_text.get_rect(centerx=board_x + self.board_width // 2, bottom=board_y - 10)
-            self.screen.blit(name_text, name_rect)
-
+            board_centre_x = board_x + self.board_width // 2
             board_bottom = board_y + self.board_height
-            score_text = score_font.render(f"Score: {game.score}", True, (150, 255, 150))
-            score_rect = score_text.get_rect(centerx=board_x + self.board_width // 2, top=board_bottom + 10)
-            self.screen.blit(score_text, score_rect)
 
+            match_labels.append(
+                (self.heading_font, self.player_names[board_index], (255, 255, 150), {"centerx": board_centre_x, "bottom": board_y - 10})
+            )
+            match_labels.append(
+                (self.score_font, f"Score: {game.score}", (150, 255, 150), {"centerx": board_centre_x, "top": board_bottom + 10})
+            )
             if game.game_over_flag:
-                status_text = status_font.render("GAME OVER", True, (255, 100, 100))
-                status_rect = status_text.get_rect(centerx=board_x + self.board_width // 2, top=board_bottom + 50)
-                self.screen.blit(status_text, status_rect)
+                match_labels.append(
+                    (self.status_font, "GAME OVER", (255, 100, 100), {"centerx": board_centre_x, "top": board_bottom + 50})
+                )
 
         if self.match_finished:
             screen_width, screen_height = self.screen.get_size()
-            big_font = pg.font.Font(None, 64)
-            finish_text = big_font.render("MATCH COMPLETE!", True, (255, 255, 100))
-            finish_rect = finish_text.get_rect(center=(screen_width // 2, screen_height - 60))
-            self.screen.blit(finish_text, finish_rect)
+            match_labels.append(
+                (self.finish_font, "MATCH COMPLETE!", (255, 255, 100), {"center": (screen_width // 2, screen_height - 60)})
+            )
+        return match_labels
+
+    def draw_labels(self):
+        for font, text, colour, anchor in self.labels():
+            text_surface = font.render(text, True, colour)
+            self.screen.blit(text_surface, text_surface.get_rect(**anchor))
 
     def run(self):
         while True:
@@ -3,39 +3,15 @@ from settings import *
 import pygame as pg
 import sys
 import versus
-
-
-_font_cache = {}
-_font_warning_shown = False
+from scenes import get_scene_manager, scene, wait_for_events, menu_needs_redraw
 
 
 def get_font(font_size):
-    global _font_cache, _font_warning_shown
-    if font_size in _font_cache:
-        return _font_cache[font_size]
-
-    try:
-        font = pg.font.Font(FONT_PATH, font_size)
-        _font_cache[font_size] = font
-        return font
-    except FileNotFoundError:
-        if not _font_warning_shown:
-            print("Warning: Custom font not found, using default")
-            _font_warning_shown = True
-        font = pg.font.Font(None, font_size)
-        _font_cache[font_size] = font
-        return font
+    return get_scene_manager().font(font_size)
 
 
 def make_background(width, height, top_colour, bottom_colour):
-    surface = pg.Surface((width, height))
-    for y in range(height):
-        blend_ratio = y / height
-        red = int(top_colour[0] * (1 - blend_ratio) + bottom_colour[0] * blend_ratio)
-        green = int(top_colour[1] * (1 - blend_ratio) + bottom_colour[1] * blend_ratio)
-        blue = int(top_colour[2] * (1 - blend_ratio) + bottom_colour[2] * blend_ratio)
-        pg.draw.line(surface, (red, green, blue), (0, y), (width, y))
-    return surface
+    return get_scene_manager().background(width, height, top_colour, bottom_colour)
 
 
 def draw_button(surface, rect, text, font, is_hovering, is_selected=False):
@@ -66,7 +42,9 @@ class Button:
         self.is_selected = False
 
     def update(self, mouse_pos):
+        was_hovering = self.is_hovering
         self.is_hovering = self.rect.collidepoint(mouse_pos)
+        return self.is_hovering != was_hovering
 
     def draw(self, surface):
         draw_button(surface, self.rect, self.text, self.font, self.is_hovering, self.is_selected)
@@ -125,12 +103,10 @@ def draw_header(surface, text, x, y, font):
     return text_rect.bottom + 12
 
 
+@scene("Match Setup")
 def versus_menu():
-    pg.init()
-    screen_width = 1280
-    screen_height = 720
-    screen = pg.display.set_mode((screen_width, screen_height))
-    pg.display.set_caption("Match Setup")
+    screen_width, screen_height = MENU_RES
+    screen = get_scene_manager().screen
 
     background = make_background(screen_width, screen_height, (20, 25, 40), (35, 20, 50))
 
@@ -154,6 +130,7 @@ def versus_menu():
 
     easy_button = Button((right_column_x - button_width // 2, 240, button_width, button_height), "EASY", get_font(30))
     medium_button = Button((right_column_x - button_width // 2, 240 + button_spacing, button_width, button_height), "MEDIUM", get_font(30))
+    hard_button = Button((right_column_x - button_width // 2, 240 + button_spacing * 2, button_width, button_height), "HARD", get_font(30))
 
     player1_box = TextInput((centre_x, 480), label="PLAYER 1 NAME")
     player2_box = TextInput((centre_x, 545), label="PLAYER 2 NAME")
@@ -170,36 +147,18 @@ def versus_menu():
         cpu2_button,
         easy_button,
         medium_button,
+        hard_button,
         start_button,
         back_button,
     ]
 
-    clock = pg.time.Clock()
+    clock = get_scene_manager().clock
 
-    while True:
-        mouse_pos = pg.mouse.get_pos()
-        screen.blit(background, (0, 0))
-
-        title_font = get_font(60)
-        title_surface = title_font.render("MATCH SETUP", True, (255, 215, 120))
-        title_rect = title_surface.get_rect(center=(centre_x, 45))
-        screen.blit(title_surface, title_rect)
-
-        header_font = get_font(24)
-        draw_header(screen, "NUMBER OF BOARDS", centre_x, 85, header_font)
-        draw_header(screen, "CPU OPPONENTS", left_column_x, 200, header_font)
-        if cpu_opponents > 0:
-            draw_header(screen, "CPU DIFFICULTY", right_column_x, 200, header_font)
-        draw_header(screen, "PLAYER NAMES", centre_x, 430, header_font)
-
-        board2_button.is_selected = (total_players == 2)
-        board3_button.is_selected = (total_players == 3)
-        cpu0_button.is_selected = (cpu_opponents == 0)
-        cpu1_button.is_selected = (cpu_opponents == 1)
-        cpu2_button.is_selected = (cpu_opponents == 2)
-        easy_button.is_selected = (cpu_difficulty == "easy")
-        medium_button.is_selected = (cpu_difficulty == "medium")
+    mouse_pos = pg.mouse.get_pos()
+    menu_needs_redraw([], all_buttons, mouse_pos)
+    needs_redraw = True
 
+    while True:
         max_cpu_allowed = total_players - 1
         if cpu_opponents > max_cpu_allowed:
             cpu_opponents = max_cpu_allowed
@@ -208,24 +167,54 @@ def versus_menu():
 
         human_players = total_players - cpu_opponents
 
-        for button in all_buttons:
-            button.update(mouse_pos)
-            button.draw(screen)
-
-        if human_players >= 1:
-            player1_box.draw(screen)
-        if human_players >= 2:
-            player2_box.draw(screen)
-        if human_players >= 3:
-            player3_box.draw(screen)
-
-        info_font = get_font(18)
-        info_text = "Controls: P1=WASD | P2=IJKL | P3=Arrows(Up,Down,Left,Right)"
-        info_surface = info_font.render(info_text, True, (120, 130, 150))
-        info_rect = info_surface.get_rect(center=(centre_x, 645))
-        screen.blit(info_surface, info_rect)
+        if needs_redraw:
+            screen.blit(background, (0, 0))
+
+            title_font = get_font(60)
+            title_surface = title_font.render("MATCH SETUP", True, (255, 215, 120))
+            title_rect = title_surface.get_rect(center=(centre_x, 45))
+            screen.blit(title_surface, title_rect)
+
+            header_font = get_font(24)
+            draw_header(screen, "NUMBER OF BOARDS", centre_x, 85, header_font)
+            draw_header(screen, "CPU OPPONENTS", left_column_x, 200, header_font)
+            if cpu_opponents > 0:
+                draw_header(screen, "CPU DIFFICULTY", right_column_x, 200, header_font)
+            draw_header(screen, "PLAYER NAMES", centre_x, 430, header_font)
+
+            board2_button.is_selected = (total_players == 2)
+            board3_button.is_selected = (total_players == 3)
+            cpu0_button.is_selected = (cpu_opponents == 0)
+            cpu1_button.is_selected = (cpu_opponents == 1)
+            cpu2_button.is_selected = (cpu_opponents == 2)
+            easy_button.is_selected = (cpu_difficulty == "easy")
+            medium_button.is_selected = (cpu_difficulty == "medium")
+            hard_button.is_selected = (cpu_difficulty == "hard")
+
+            for button in all_buttons:
+                button.draw(screen)
+
+            if human_players >= 1:
+                player1_box.draw(screen)
+            if human_players >= 2:
+                player2_box.draw(screen)
+            if human_players >= 3:
+                player3_box.draw(screen)
+
+            info_font = get_font(18)
+            info_text = "Controls: P1=WASD | P2=IJKL | P3=Arrows(Up,Down,Left,Right)"
+            info_surface = info_font.render(info_text, True, (120, 130, 150))
+            info_rect = info_surface.get_rect(center=(centre_x, 645))
+            screen.blit(info_surface, info_rect)
+
+            pg.display.flip()
+            clock.tick(60)
+
+        events = wait_for_events()
+        mouse_pos = pg.mouse.get_pos()
+        needs_redraw = menu_needs_redraw(events, all_buttons, mouse_pos)
 
-        for event in pg.event.get():
+        for event in events:
             if event.type == pg.QUIT:
                 pg.quit()
                 sys.exit()
@@ -252,6 +241,8 @@ def versus_menu():
                     cpu_difficulty = "easy"
                 elif medium_button.is_clicked(mouse_pos) and cpu_opponents > 0:
                     cpu_difficulty = "medium"
+                elif hard_button.is_clicked(mouse_pos) and cpu_opponents > 0:
+                    cpu_difficulty = "hard"
                 elif start_button.is_clicked(mouse_pos):
                     p1 = player1_box.text.strip() or "Player 1"
                     p2 = player2_box.text.strip() or "Player 2"
@@ -274,7 +265,4 @@ def versus_menu():
                         player_names=names,
                     ).run()
                 elif back_button.is_clicked(mouse_pos):
-                    return
-
-        pg.display.flip()
-        clock.tick(60)
\ No newline at end of file
+                    return
\ No newline at end of file